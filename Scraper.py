@@ -1,16 +1,42 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
 import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+from urllib3.util.retry import Retry
+try:
+    from urllib3.exceptions import NameResolutionError
+except ImportError:
+    # urllib3 1.x: los fallos de DNS llegan como NewConnectionError
+    NameResolutionError = None
 from bs4 import BeautifulSoup
+import soupsieve
+import copy
 import csv
+import hashlib
+import io
+import json
+import math
+import sqlite3
 import time
 import random
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from collections.abc import Mapping
 import re
-from datetime import datetime
-from urllib.parse import urljoin
-import webbrowser
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from itertools import islice
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
 import os
-from PIL import Image, ImageTk  
 
 # --- Configuración scraper Nike ---
 NIKE_CONFIG = {
@@ -25,118 +51,1559 @@ NIKE_CONFIG = {
     "size_param": "size",
     "product_selector": ".product-card",
     "title_selector": ".product-card__title",
+    "subtitle_selector": ".product-card__subtitle",
     "price_selector": ".product-price",
     "img_selector": ".product-card__hero-image",
     "link_selector": ".product-card__link-overlay",
     "size_selector": ".product-card__available-sizes .size",
-    "next_page_selector": ".pagination__next"
+    "next_page_selector": ".pagination__next",
+    # Ficha de producto (solo para el enriquecimiento, ver enrich.py)
+    "pdp_size_selector": '[data-testid="pdp-grid-selector-item"]',
+    "pdp_style_selector": '[data-testid="product-description-style-color"]',
+    "pdp_color_selector": '[data-testid="product-description-color-description"]',
+    "pdp_price_selector": '[data-testid="currentPrice-container"]',
+    "pdp_full_price_selector": '[data-testid="initialPrice-container"]',
+    "pdp_discount_selector": '[data-testid="OfferPercentage"]',
+    "currency": "EUR",
+    "size_system": "EU",
+    "accept_language": "es-ES,es;q=0.9"
 }
 
-# Colores
-COLORS = {
-    "primary": "#f25c05",       # Naranja Nike
-    "primary_hover": "#d95204", # Naranja oscuro
-    "secondary": "#212121",     # Negro Nike
-    "light_bg": "#f7f7f7",      # Fondo claro
-    "white": "#ffffff",         # Blanco
-    "text": "#212121",          # Texto principal
-    "text_light": "#757575",    # Texto secundario
-    "success": "#43a047",       # Verde éxito
-    "error": "#e53935",         # Rojo error
-    "input_bg": "#ffffff",      # Fondo de inputs
-    "border": "#e0e0e0"         # Bordes
+
+PRICE_JUNK = re.compile(r'[^\d,.]')
+
+
+@lru_cache(maxsize=8192)
+def _parse_price_text(price_str):
+    # Los mismos textos de precio ("119,99 €") se repiten en todas las páginas: se parsean una vez
+    price_text = PRICE_JUNK.sub('', price_str).replace(',', '.')
+    if price_text.count('.') > 1:
+        integer, _, decimals = price_text.rpartition('.')
+        price_text = integer.replace('.', '') + '.' + decimals
+    try:
+        return float(price_text)
+    except ValueError:
+        return None
+
+
+def parse_price(price_str):
+    if not price_str:
+        return None
+    return _parse_price_text(price_str)
+
+
+# --- Caché de respuestas HTTP ---
+class CachedResponse:
+    # Imita lo que el scraper usa de requests.Response
+    def __init__(self, status_code, content, headers=None, url="", encoding="utf-8", from_cache=False):
+        self.status_code = status_code
+        self.content = content
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.url = url
+        self.encoding = encoding
+        self.from_cache = from_cache
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+
+class ResponseCache:
+    def __init__(self, path="nike_cache.sqlite", ttl=3600, max_bytes=200 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT,
+                status INTEGER,
+                headers TEXT,
+                encoding TEXT,
+                body BLOB,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL,
+                accessed_at REAL,
+                size INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed_at);
+        """)
+
+    @staticmethod
+    def make_key(url, params=None):
+        # Misma clave para la misma petición aunque cambie el orden o el formato de los parámetros
+        parts = urlsplit(url)
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        if params:
+            query.extend((str(k), str(v)) for k, v in params.items() if v is not None)
+        normalized = urlunsplit((
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path.rstrip("/") or "/",
+            urlencode(sorted(query)),
+            ""
+        ))
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def lookup(self, key):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT url, status, headers, encoding, body, etag, last_modified, stored_at "
+                "FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+        url, status, headers, encoding, body, etag, last_modified, stored_at = row
+        return {
+            "response": CachedResponse(status, body, json.loads(headers), url, encoding, from_cache=True),
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": stored_at
+        }
+
+    def is_fresh(self, entry):
+        return time.time() - entry["stored_at"] < self.ttl
+
+    def store(self, key, url, response):
+        body = response.content
+        encoding = getattr(response, "encoding", None) or "utf-8"
+        now = time.time()
+        headers = dict(response.headers)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, response.status_code, json.dumps(headers), encoding, body,
+                 headers.get("ETag"), headers.get("Last-Modified"), now, now, len(body))
+            )
+            self._evict()
+            self._db.commit()
+
+    def refresh(self, key):
+        # 304 Not Modified: lo guardado sigue valiendo, se reinicia el TTL
+        now = time.time()
+        with self._lock:
+            self._db.execute("UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+            self._db.commit()
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # LRU: se borran las menos usadas recientemente hasta volver al límite
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def total_bytes(self):
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+# --- Checkpoints de búsquedas ---
+class CrawlJournal:
+    # Diario JSON Lines de las búsquedas largas: una línea por página terminada, con sus
+    # productos, y otra al llegar al final. Si la búsqueda se corta (error HTTP, excepción,
+    # proceso muerto), iter_search(..., checkpoint=journal, resume=True) devuelve lo ya
+    # guardado sin volver a pedirlo y sigue desde la última página buena.
+    # Cada línea se escribe al momento, pero fsync (lo caro) se hace cada sync_pages
+    # páginas o sync_seconds segundos, y siempre al terminar una búsqueda o al cerrar.
+    def __init__(self, path="nike_checkpoint.jsonl", sync_pages=8, sync_seconds=2.0):
+        self.path = path
+        self.sync_pages = sync_pages
+        self.sync_seconds = sync_seconds
+        self._lock = threading.Lock()
+        self._states = self._load()
+        self._compact()
+        self._file = open(path, "a", encoding="utf-8")
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+
+    @staticmethod
+    def make_key(store, query, max_price=None, sizes=None, filters=None):
+        # Misma búsqueda (tienda, consulta y filtros) -> misma clave, para no mezclar progresos
+        parts = [store, query, max_price, sorted(sizes or ())]
+        if filters is not None:
+            parts += [filters.min_price, filters.max_price, sorted(filters.sizes), sorted(filters.gender),
+                      filters.category]
+        return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()[:32]
+
+    def _load(self):
+        states = {}
+        if not os.path.exists(self.path):
+            return states
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # última línea a medias: el proceso murió mientras escribía
+                key = entry["key"]
+                if entry["type"] == "start":
+                    states[key] = {"query": entry["query"], "pages": {}, "finished": False}
+                elif key in states:
+                    if entry["type"] == "page":
+                        states[key]["pages"][entry["page"]] = entry["products"]
+                    elif entry["type"] == "end":
+                        states[key]["finished"] = True
+        return states
+
+    def _compact(self):
+        # Al abrir se reescribe el diario solo con las búsquedas sin terminar
+        pending = {key: state for key, state in self._states.items() if not state["finished"]}
+        if not os.path.exists(self.path):
+            return
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for key, state in pending.items():
+                f.write(json.dumps({"type": "start", "key": key, "query": state["query"]}, ensure_ascii=False) + "\n")
+                for page, products in sorted(state["pages"].items()):
+                    f.write(json.dumps({"type": "page", "key": key, "page": page, "products": products},
+                                       ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._states = pending
+
+    def resume_point(self, key):
+        # (productos de las páginas seguidas ya hechas, siguiente página a pedir); None si no hay nada
+        state = self._states.get(key)
+        if state is None or state["finished"]:
+            return None
+        products = []
+        page = 1
+        while page in state["pages"]:
+            products.extend(state["pages"][page])
+            page += 1
+        return products, page
+
+    def _write(self, entry, sync=False):
+        with self._lock:
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._file.flush()
+            self._unsynced += 1
+            now = time.monotonic()
+            if sync or self._unsynced >= self.sync_pages or now - self._synced_at >= self.sync_seconds:
+                os.fsync(self._file.fileno())
+                self._unsynced = 0
+                self._synced_at = now
+
+    def start(self, key, query):
+        self._states[key] = {"query": query, "pages": {}, "finished": False}
+        self._write({"type": "start", "key": key, "query": query})
+
+    def page_done(self, key, page, products):
+        self._states[key]["pages"][page] = products
+        self._write({"type": "page", "key": key, "page": page, "products": products})
+
+    def finish(self, key):
+        self._states[key]["finished"] = True
+        self._write({"type": "end", "key": key}, sync=True)
+
+    def sync(self):
+        with self._lock:
+            if self._unsynced:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._unsynced = 0
+                self._synced_at = time.monotonic()
+
+    def close(self):
+        self.sync()
+        with self._lock:
+            self._file.close()
+
+
+# --- Tiempos de conexión ---
+# Cada hilo apunta aquí los tiempos de DNS, TCP y TLS de la conexión que abre; si la
+# petición reutiliza una conexión del pool no se apunta nada (y valen 0)
+_connection_timings = threading.local()
+
+
+def _note_connection(key, seconds):
+    timings = getattr(_connection_timings, "current", None)
+    if timings is not None:
+        timings[key] = timings.get(key, 0.0) + seconds
+
+
+class _TimedConnectionMixin:
+    def _name_error(self, e):
+        if NameResolutionError is not None:
+            return NameResolutionError(self.host, self, e)
+        return NewConnectionError(self, f"Failed to resolve '{self.host}' ({e})")
+
+    def _new_conn(self):
+        # Se resuelve aparte para separar el DNS del connect; después se prueba cada
+        # dirección como haría urllib3
+        start = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(self._dns_host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise self._name_error(e) from e
+        _note_connection("dns", time.perf_counter() - start)
+        if not addresses:
+            raise self._name_error(socket.gaierror("getaddrinfo returns an empty list"))
+
+        host = self._dns_host
+        error = None
+        for *_, sockaddr in addresses:
+            self._dns_host = sockaddr[0]
+            start = time.perf_counter()
+            try:
+                return super()._new_conn()
+            except NewConnectionError as e:
+                error = e
+            finally:
+                self._dns_host = host
+                _note_connection("connect", time.perf_counter() - start)
+        raise error
+
+    def connect(self):
+        # En HTTPS, lo que no es _new_conn es el handshake TLS
+        timings = getattr(_connection_timings, "current", None)
+        before = sum(timings.get(key, 0.0) for key in ("dns", "connect")) if timings is not None else 0.0
+        start = time.perf_counter()
+        super().connect()
+        if isinstance(self, HTTPSConnection) and timings is not None:
+            new_conn = sum(timings.get(key, 0.0) for key in ("dns", "connect")) - before
+            _note_connection("tls", max(time.perf_counter() - start - new_conn, 0.0))
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": TimedHTTPConnectionPool, "https": TimedHTTPSConnectionPool}
+
+
+# --- Motores de parseo ---
+# Claves de NIKE_CONFIG que son selectores CSS de la tarjeta de producto
+CARD_SELECTORS = ("title_selector", "subtitle_selector", "price_selector", "img_selector", "link_selector",
+                  "size_selector")
+
+
+class SoupEngine:
+    # Motor original: BeautifulSoup + html.parser, con los selectores compilados por soupsieve
+    name = "bs4"
+
+    def __init__(self, config):
+        self.product = soupsieve.compile(config["product_selector"])
+        self.selectors = {key: soupsieve.compile(config[key]) for key in CARD_SELECTORS if config.get(key)}
+
+    def cards(self, html):
+        soup = BeautifulSoup(html, 'html.parser')
+        return self.product.select(soup)
+
+    def extract(self, html):
+        cards = self.cards(html)
+        if not cards:
+            return None
+        return [self.extract_card(card) for card in cards]
+
+    def _text(self, key, card):
+        selector = self.selectors.get(key)
+        elem = selector.select_one(card) if selector else None
+        return elem.get_text(strip=True) if elem is not None else None
+
+    def _attr(self, key, card, attr):
+        selector = self.selectors.get(key)
+        elem = selector.select_one(card) if selector else None
+        return elem.get(attr) if elem is not None else None
+
+    def card_link(self, card):
+        return self._attr("link_selector", card, "href")
+
+    def extract_card(self, card):
+        size_selector = self.selectors.get("size_selector")
+        return {
+            "title": self._text("title_selector", card),
+            "subtitle": self._text("subtitle_selector", card),
+            "price": self._text("price_selector", card),
+            "sizes": [s.get_text(strip=True) for s in size_selector.select(card)] if size_selector else [],
+            "image": self._attr("img_selector", card, "src"),
+            "link": self._attr("link_selector", card, "href")
+        }
+
+
+@lru_cache(maxsize=None)
+def _lxml():
+    # lxml es opcional y solo lo usa el motor 'lxml': se importa al crear el primero
+    try:
+        import lxml.html
+        from lxml.cssselect import CSSSelector
+    except ImportError:
+        return None
+    return lxml.html, CSSSelector
+
+
+class LxmlEngine:
+    # Árbol de libxml2 y selectores traducidos a XPath una sola vez
+    name = "lxml"
+
+    def __init__(self, config):
+        if _lxml() is None:
+            raise RuntimeError("El motor 'lxml' necesita los paquetes lxml y cssselect")
+        self.html, selector = _lxml()
+        self.product = selector(config["product_selector"])
+        self.selectors = {key: selector(config[key]) for key in CARD_SELECTORS if config.get(key)}
+        self.parser = self.html.HTMLParser(encoding="utf-8")
+
+    def cards(self, html):
+        if isinstance(html, str):
+            html = html.encode("utf-8")
+        if not html.strip():
+            return []
+        root = self.html.document_fromstring(html, parser=self.parser)
+        return self.product(root)
+
+    def extract(self, html):
+        cards = self.cards(html)
+        if not cards:
+            return None
+        return [self.extract_card(card) for card in cards]
+
+    @staticmethod
+    def _get_text(elem):
+        # Igual que get_text(strip=True) de BeautifulSoup
+        return "".join(piece.strip() for piece in elem.itertext())
+
+    def _first(self, key, card):
+        selector = self.selectors.get(key)
+        if selector is None:
+            return None
+        found = selector(card)
+        return found[0] if found else None
+
+    def card_link(self, card):
+        link = self._first("link_selector", card)
+        return link.get("href") if link is not None else None
+
+    def extract_card(self, card):
+        title = self._first("title_selector", card)
+        subtitle = self._first("subtitle_selector", card)
+        price = self._first("price_selector", card)
+        image = self._first("img_selector", card)
+        link = self._first("link_selector", card)
+        size_selector = self.selectors.get("size_selector")
+        return {
+            "title": self._get_text(title) if title is not None else None,
+            "subtitle": self._get_text(subtitle) if subtitle is not None else None,
+            "price": self._get_text(price) if price is not None else None,
+            "sizes": [self._get_text(s) for s in size_selector(card)] if size_selector is not None else [],
+            "image": image.get("src") if image is not None else None,
+            "link": link.get("href") if link is not None else None
+        }
+
+
+class NextDataEngine:
+    # Lee los productos del JSON que nike.com incrusta en la página (__NEXT_DATA__) sin
+    # construir el árbol HTML. Si la página no lo trae, usa el motor de selectores.
+    name = "json"
+    PAYLOAD_PATTERNS = (
+        re.compile(r'<script[^>]*\bid=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>', re.DOTALL),
+        re.compile(r'window\.INITIAL_REDUX_STATE\s*=\s*(\{.*?\});?\s*</script>', re.DOTALL)
+    )
+    CURRENCY_SYMBOLS = {"EUR": "€", "GBP": "£", "USD": "$"}
+
+    def __init__(self, config, fallback="auto"):
+        self.fallback = get_parser_engine(fallback, config)
+        # orjson es opcional; sin él se usa json de la biblioteca estándar
+        try:
+            from orjson import loads
+        except ImportError:
+            from json import loads
+        self.loads = loads
+
+    def payload(self, html):
+        if isinstance(html, bytes):
+            html = html.decode("utf-8", errors="replace")
+        for pattern in self.PAYLOAD_PATTERNS:
+            match = pattern.search(html)
+            if match:
+                try:
+                    return self.loads(match.group(1))
+                except ValueError:
+                    continue
+        return None
+
+    @staticmethod
+    def _get(data, *path):
+        for key in path:
+            if not isinstance(data, dict):
+                return None
+            data = data.get(key)
+        return data
+
+    def _as_card(self, item):
+        # Admite el formato actual (copy/prices/pdpUrl) y el antiguo (title/price/url)
+        title = self._get(item, "copy", "title") or item.get("title")
+        prices = item.get("prices") or item.get("price")
+        url = self._get(item, "pdpUrl", "url") or (item.get("url") if isinstance(item.get("url"), str) else None)
+        if not isinstance(title, str) or not isinstance(prices, dict) or not url:
+            return None
+        current = prices.get("currentPrice")
+        if current is None:
+            return None
+        images = item.get("colorwayImages") or item.get("images") or {}
+        sizes = item.get("availableSizes") or item.get("sizes") or []
+        subtitle = self._get(item, "copy", "subTitle") or item.get("subtitle")
+        return {
+            "title": title,
+            "subtitle": subtitle if isinstance(subtitle, str) else None,
+            "price": self.format_price(current, prices.get("currency")),
+            "sizes": [s.get("localizedSize", s.get("size")) if isinstance(s, dict) else str(s) for s in sizes],
+            "image": images.get("portraitURL") or images.get("squarishURL"),
+            "link": url
+        }
+
+    def format_price(self, value, currency):
+        # Mismo texto que muestra la tarjeta, para que parse_price y los exportadores no cambien
+        currency = (currency or "EUR").upper()
+        if currency == "EUR":
+            return f"{float(value):.2f}".replace(".", ",") + "\xa0€"
+        return f"{self.CURRENCY_SYMBOLS.get(currency, currency + ' ')}{float(value):.2f}"
+
+    def _walk(self, data, found, seen):
+        if isinstance(data, dict):
+            card = self._as_card(data)
+            if card is not None:
+                if card["link"] not in seen:
+                    seen.add(card["link"])
+                    found.append(card)
+                return
+            for value in data.values():
+                self._walk(value, found, seen)
+        elif isinstance(data, list):
+            for value in data:
+                self._walk(value, found, seen)
+
+    def cards(self, html):
+        data = self.payload(html)
+        if data is not None:
+            found = []
+            self._walk(data, found, set())
+            if found:
+                return found
+        return self.fallback.cards(html)
+
+    def extract(self, html):
+        cards = self.cards(html)
+        if not cards:
+            return None
+        return [self.extract_card(card) for card in cards]
+
+    def card_link(self, card):
+        if isinstance(card, dict):
+            return card["link"]
+        return self.fallback.card_link(card)
+
+    def extract_card(self, card):
+        # Las tarjetas del JSON ya vienen como dict; las demás son nodos del motor de respaldo
+        if isinstance(card, dict):
+            return card
+        return self.fallback.extract_card(card)
+
+
+PARSER_ENGINES = {
+    "bs4": SoupEngine,
+    "lxml": LxmlEngine,
+    "json": NextDataEngine
 }
 
+_engine_cache = {}
+_engine_lock = threading.RLock()  # NextDataEngine crea su motor de respaldo desde dentro
+
+
+def get_parser_engine(name, config):
+    # Un motor (y sus selectores compilados) por combinación de motor + configuración
+    if name == "auto":
+        name = "lxml" if _lxml() is not None else "bs4"
+    if name not in PARSER_ENGINES:
+        raise ValueError(f"Motor de parseo desconocido: {name}")
+    key = (name,) + tuple(config.get(k) for k in ("product_selector",) + CARD_SELECTORS)
+    with _engine_lock:
+        engine = _engine_cache.get(key)
+        if engine is None:
+            engine = _engine_cache[key] = PARSER_ENGINES[name](config)
+    return engine
+
+
+class AdaptiveRateLimiter:
+    # Token bucket cuyo ritmo se ajusta solo (AIMD): sube poco a poco mientras el servidor
+    # responde bien y se reduce a la mitad, con una pausa, ante un 429 o un 5xx
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, rate=1.0, min_rate=0.1, max_rate=4.0, burst=1, increase=0.1, decrease=0.5,
+                 backoff=1.0, max_backoff=60.0, window=30.0):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.decrease = decrease
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.window = window
+        self.tokens = burst
+        self.failures = 0
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._sent = deque()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        # Devuelve los segundos que ha tenido que esperar
+        slept = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self.blocked_until - now
+                if wait <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        self._sent.append(now)
+                        return slept
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            slept += wait
+
+    @staticmethod
+    def parse_retry_after(value):
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+    def record(self, status_code, retry_after=None):
+        with self._lock:
+            if status_code in self.RETRY_STATUSES:
+                self.failures += 1
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                delay = self.parse_retry_after(retry_after)
+                if delay is None:
+                    delay = min(self.max_backoff, self.backoff * 2 ** (self.failures - 1))
+                # Jitter para que varios hilos no vuelvan a la vez
+                delay *= random.uniform(1.0, 1.5)
+                self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+                self.tokens = 0
+            elif status_code < 400:
+                self.failures = 0
+                self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def effective_rate(self):
+        # Peticiones por segundo realmente enviadas en la última ventana
+        with self._lock:
+            now = time.monotonic()
+            while self._sent and now - self._sent[0] > self.window:
+                self._sent.popleft()
+            if not self._sent:
+                return 0.0
+            return len(self._sent) / max(min(now - self._sent[0], self.window), 1.0)
+
+
+# --- Almacén compacto de resultados ---
+RESULT_FIELDS = ("title", "price", "image_url", "product_url", "store", "available_sizes", "subtitle")
+
+
+class ProductRow(Mapping):
+    # Vista tipo dict de una fila de ResultStore; no copia nada
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store, index):
+        self._store = store
+        self._index = index
+
+    def __getitem__(self, key):
+        return self._store.value(self._index, key)
+
+    def __setitem__(self, key, value):
+        self._store.set_value(self._index, key, value)
+
+    def __iter__(self):
+        return iter(self._store.fields(self._index))
+
+    def __len__(self):
+        return len(self._store.fields(self._index))
+
+    @property
+    def price_value(self):
+        return self._store.price_value(self._index)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class ResultStore:
+    # Resultados por columnas: los textos repetidos (tienda, tallas, precios, prefijos
+    # de URL...) se guardan una sola vez y cada fila solo lleva su índice
+    def __init__(self, parse_price=None):
+        self.parse_price = parse_price
+        self._strings = []
+        self._string_ids = {}
+        self._title = array("I")
+        self._price = array("I")
+        self._price_value = array("d")
+        self._image_prefix = array("I")
+        self._image_tail = []
+        self._url_prefix = array("I")
+        self._url_tail = []
+        self._store = array("I")
+        self._sizes = array("I")
+        self._subtitle = array("I")
+        self._extra = {}
+
+    def _intern(self, text):
+        text = text or ""
+        string_id = self._string_ids.get(text)
+        if string_id is None:
+            string_id = self._string_ids[text] = len(self._strings)
+            self._strings.append(text)
+        return string_id
+
+    @staticmethod
+    def _split_url(url):
+        # "https://www.nike.com/es/t/" se repite en todas las filas; el resto no
+        parts = (url or "").split("/", 5)
+        if len(parts) < 6:
+            return "", url or ""
+        return "/".join(parts[:5]) + "/", parts[5]
+
+    def append(self, product):
+        price = product.get("price")
+        price_value = self.parse_price(price) if self.parse_price else None
+        image_prefix, image_tail = self._split_url(product.get("image_url"))
+        url_prefix, url_tail = self._split_url(product.get("product_url"))
+
+        self._title.append(self._intern(product.get("title")))
+        self._price.append(self._intern(price))
+        self._price_value.append(math.nan if price_value is None else price_value)
+        self._image_prefix.append(self._intern(image_prefix))
+        self._image_tail.append(image_tail)
+        self._url_prefix.append(self._intern(url_prefix))
+        self._url_tail.append(url_tail)
+        self._store.append(self._intern(product.get("store")))
+        self._sizes.append(self._intern(product.get("available_sizes")))
+        self._subtitle.append(self._intern(product.get("subtitle")))
+
+        index = len(self._title) - 1
+        for key, value in product.items():
+            if key not in RESULT_FIELDS:
+                self._extra.setdefault(key, {})[index] = value
+        return ProductRow(self, index)
+
+    def extend(self, products):
+        for product in products:
+            self.append(product)
+
+    def clear(self):
+        self.__init__(self.parse_price)
+
+    def value(self, index, key):
+        if key == "title":
+            return self._strings[self._title[index]]
+        if key == "price":
+            return self._strings[self._price[index]]
+        if key == "image_url":
+            return self._strings[self._image_prefix[index]] + self._image_tail[index]
+        if key == "product_url":
+            return self._strings[self._url_prefix[index]] + self._url_tail[index]
+        if key == "store":
+            return self._strings[self._store[index]]
+        if key == "available_sizes":
+            return self._strings[self._sizes[index]]
+        if key == "subtitle":
+            return self._strings[self._subtitle[index]]
+        column = self._extra.get(key)
+        if column is None or index not in column:
+            raise KeyError(key)
+        return column[index]
+
+    def set_value(self, index, key, value):
+        if key == "title":
+            self._title[index] = self._intern(value)
+        elif key == "price":
+            self._price[index] = self._intern(value)
+            price_value = self.parse_price(value) if self.parse_price else None
+            self._price_value[index] = math.nan if price_value is None else price_value
+        elif key == "image_url":
+            prefix, self._image_tail[index] = self._split_url(value)
+            self._image_prefix[index] = self._intern(prefix)
+        elif key == "product_url":
+            prefix, self._url_tail[index] = self._split_url(value)
+            self._url_prefix[index] = self._intern(prefix)
+        elif key == "store":
+            self._store[index] = self._intern(value)
+        elif key == "available_sizes":
+            self._sizes[index] = self._intern(value)
+        elif key == "subtitle":
+            self._subtitle[index] = self._intern(value)
+        else:
+            self._extra.setdefault(key, {})[index] = value
+
+    def fields(self, index):
+        return RESULT_FIELDS + tuple(key for key, column in self._extra.items() if index in column)
+
+    def price_value(self, index):
+        value = self._price_value[index]
+        return None if math.isnan(value) else value
+
+    def price_values(self):
+        # Columna numérica de precios (NaN donde no se pudo leer el precio)
+        return self._price_value
+
+    def string_column(self, key):
+        # (ids por fila, textos) de una columna internada: filas con el mismo texto comparten id
+        columns = {"title": self._title, "price": self._price, "store": self._store,
+                   "available_sizes": self._sizes, "subtitle": self._subtitle}
+        return columns[key], self._strings
+
+    def __len__(self):
+        return len(self._title)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [ProductRow(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("índice de resultado fuera de rango")
+        return ProductRow(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield ProductRow(self, index)
+
+
+# --- Consultas locales sobre los resultados ---
+class ResultIndex:
+    # Filtra y ordena un ResultStore en memoria, sin volver a buscar: índice invertido de
+    # palabras del título (cada palabra escrita vale como prefijo, para buscar según se
+    # teclea), tallas -> filas, columna de precios y órdenes por columna que se calculan
+    # una vez. update() solo indexa las filas añadidas desde la última vez.
+    WORDS = re.compile(r"\w+")
+    NO_SIZES = ("", "No especificado", "Agotado")
+
+    def __init__(self, store):
+        self.store = store
+        self.clear()
+
+    def clear(self):
+        self.indexed = 0
+        self.words = {}
+        self.size_rows = {}
+        self._vocabulary = []
+        self._vocabulary_stale = False
+        self._title_words = {}
+        self._sizes = {}
+        self._orders = {}
+
+    @classmethod
+    def tokenize(cls, text):
+        # Sin mayúsculas ni tildes: "Niño" y "nino" son la misma palabra
+        text = unicodedata.normalize("NFKD", text.casefold())
+        return cls.WORDS.findall("".join(c for c in text if not unicodedata.combining(c)))
+
+    def update(self):
+        store = self.store
+        total = len(store)
+        if total < self.indexed:
+            self.clear()  # el almacén se ha vaciado (nueva búsqueda)
+        if total == self.indexed:
+            return
+        title_ids, strings = store.string_column("title")
+        size_ids, _ = store.string_column("available_sizes")
+        for index in range(self.indexed, total):
+            # Los títulos y las tallas están internados: cada texto se trocea una sola vez
+            words = self._title_words.get(title_ids[index])
+            if words is None:
+                words = self._title_words[title_ids[index]] = set(self.tokenize(strings[title_ids[index]]))
+            for word in words:
+                rows = self.words.get(word)
+                if rows is None:
+                    rows = self.words[word] = array("I")
+                    self._vocabulary_stale = True
+                rows.append(index)
+            sizes = self._sizes.get(size_ids[index])
+            if sizes is None:
+                text = strings[size_ids[index]]
+                sizes = self._sizes[size_ids[index]] = (
+                    frozenset() if text in self.NO_SIZES else _size_set(tuple(text.split(", ")))
+                )
+            for size in sizes:
+                rows = self.size_rows.get(size)
+                if rows is None:
+                    rows = self.size_rows[size] = array("I")
+                rows.append(index)
+        self.indexed = total
+        self._orders.clear()
+
+    def _prefix_rows(self, prefix):
+        # Filas con alguna palabra que empiece por prefix (búsqueda binaria en el vocabulario)
+        if self._vocabulary_stale:
+            self._vocabulary = sorted(self.words)
+            self._vocabulary_stale = False
+        vocabulary = self._vocabulary
+        rows = set()
+        start = bisect_left(vocabulary, prefix)
+        for word in islice(vocabulary, start, None):
+            if not word.startswith(prefix):
+                break
+            rows.update(self.words[word])
+        return rows
+
+    def _price_rows(self, candidates, min_price, max_price):
+        # Un precio que no se puede leer no descarta la fila, igual que en ProductFilter
+        prices = self.store.price_values()
+        low = -math.inf if min_price is None else min_price
+        high = math.inf if max_price is None else max_price
+        np = _numpy() if self.indexed >= ProductFilter.NUMPY_MIN_ROWS else None
+        if np is not None:
+            values = np.frombuffer(prices, dtype=float, count=self.indexed)
+            rows = np.flatnonzero(~((values < low) | (values > high)))
+            return set(rows.tolist()) if candidates is None else candidates.intersection(rows.tolist())
+        candidates = range(self.indexed) if candidates is None else candidates
+        return {index for index in candidates if not (prices[index] < low or prices[index] > high)}
+
+    def order(self, key, descending=False):
+        # Todas las filas ordenadas por una columna; se recalcula solo si llegan filas nuevas
+        self.update()
+        cached = self._orders.get((key, descending))
+        if cached is not None:
+            return cached
+        total = self.indexed
+        if key == "price":
+            # Sin precio (NaN), siempre al final
+            prices = self.store.price_values()
+            np = _numpy() if total >= ProductFilter.NUMPY_MIN_ROWS else None
+            if np is not None:
+                values = np.frombuffer(prices, dtype=float, count=total)
+                order = np.argsort(-values if descending else values, kind="stable").tolist()
+            else:
+                priced = [index for index in range(total) if prices[index] == prices[index]]
+                order = sorted(priced, key=prices.__getitem__, reverse=descending)
+                order += [index for index in range(total) if prices[index] != prices[index]]
+        else:
+            if key == "product_url":
+                values = [self.store.value(index, key).casefold() for index in range(total)]
+            else:
+                ids, strings = self.store.string_column(key)
+                # Se ordenan los textos distintos y cada fila se ordena por la posición del suyo
+                unique = sorted(set(ids[:total]), key=lambda string_id: strings[string_id].casefold())
+                rank = {string_id: position for position, string_id in enumerate(unique)}
+                values = [rank[string_id] for string_id in ids[:total]]
+            order = sorted(range(total), key=values.__getitem__, reverse=descending)
+        self._orders[(key, descending)] = order
+        return order
+
+    def query(self, text="", min_price=None, max_price=None, sizes=None, sort=None, descending=False):
+        # Índices (en el ResultStore) de las filas que cumplen todos los filtros, ya ordenados
+        self.update()
+        rows = None
+        for word in self.tokenize(text or ""):
+            matches = self._prefix_rows(word)
+            rows = matches if rows is None else rows & matches
+            if not rows:
+                return []
+        if sizes:
+            matches = set()
+            for size in _size_set(tuple(sizes)):
+                matches.update(self.size_rows.get(size, ()))
+            rows = matches if rows is None else rows & matches
+        if min_price is not None or max_price is not None:
+            rows = self._price_rows(rows, min_price, max_price)
+        if sort is None:
+            return list(range(self.indexed)) if rows is None else sorted(rows)
+        order = self.order(sort, descending)
+        if rows is None:
+            return list(order)
+        return [index for index in order if index in rows]
+
+
+# --- Filtros ---
+def normalize_size(size):
+    return str(size).strip().casefold().replace(",", ".")
+
+
+@lru_cache(maxsize=4096)
+def _size_set(sizes):
+    return frozenset(normalize_size(size) for size in sizes)
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    # numpy es opcional y tarda en importarse: solo se carga la primera vez que hay que
+    # filtrar u ordenar un lote grande. Sin él los filtros se aplican fila a fila
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class ProductFilter:
+    # Filtros de una página entera a la vez: el precio se comprueba sobre la columna de
+    # precios (con NumPy si está instalado y el lote es grande) y las tallas con frozensets.
+    # Un precio que no se puede leer no descarta el producto.
+    GENDERS = (
+        ("hombre", "men", "men's", "homme", "herren", "uomo"),
+        ("mujer", "women", "women's", "femme", "damen", "donna"),
+        ("niño/a", "niño", "niña", "niños", "kids", "enfant", "kinder", "bambini"),
+        ("unisex",)
+    )
+    NUMPY_MIN_ROWS = 256  # con menos filas, crear el array cuesta más que el bucle
+    WORDS = re.compile(r"[\w/']+")
+
+    def __init__(self, max_price=None, sizes=None, min_price=None, gender=None, category=None):
+        self.min_price = min_price or None
+        self.max_price = max_price or None
+        self.sizes = _size_set(tuple(sizes)) if sizes else frozenset()
+        self.gender = self.gender_terms(gender) if gender else frozenset()
+        self.category = category.casefold().strip() if category else None
+
+    @classmethod
+    def gender_terms(cls, gender):
+        gender = gender.casefold().strip()
+        for terms in cls.GENDERS:
+            if gender in terms:
+                return frozenset(terms)
+        return frozenset([gender])
+
+    def __bool__(self):
+        return bool(self.min_price or self.max_price or self.sizes or self.gender or self.category)
+
+    def price_ok(self, price):
+        if not price:
+            return True
+        if self.max_price and price > self.max_price:
+            return False
+        if self.min_price and price < self.min_price:
+            return False
+        return True
+
+    def price_mask(self, prices):
+        if not (self.min_price or self.max_price):
+            return [True] * len(prices)
+        np = _numpy() if len(prices) >= self.NUMPY_MIN_ROWS else None
+        if np is None:
+            return [self.price_ok(price) for price in prices]
+        values = np.fromiter((price or math.nan for price in prices), dtype=float, count=len(prices))
+        keep = np.ones(len(prices), dtype=bool)
+        # NaN (sin precio) da False en las comparaciones, así que no se descarta
+        if self.max_price:
+            keep &= ~(values > self.max_price)
+        if self.min_price:
+            keep &= ~(values < self.min_price)
+        return keep.tolist()
+
+    def mask(self, rows, prices):
+        keep = self.price_mask(prices)
+        if self.sizes:
+            wanted = self.sizes
+            keep = [kept and not wanted.isdisjoint(_size_set(tuple(row["sizes"]))) for kept, row in zip(keep, rows)]
+        if self.gender or self.category:
+            keep = [kept and self.subtitle_ok(row.get("subtitle")) for kept, row in zip(keep, rows)]
+        return keep
+
+    def subtitle_ok(self, subtitle):
+        # Género y categoría salen del subtítulo de la tarjeta ("Zapatillas de running - Mujer")
+        subtitle = (subtitle or "").casefold()
+        if self.gender and self.gender.isdisjoint(self.WORDS.findall(subtitle)):
+            return False
+        if self.category and self.category not in subtitle:
+            return False
+        return True
+
+    def localized(self, rate=1.0, convert_size=None):
+        # Copia para otra tienda: precios en su moneda (rate = € por unidad local) y tallas en su numeración
+        local = copy.copy(self)
+        if self.max_price:
+            local.max_price = round(self.max_price / rate, 2)
+        if self.min_price:
+            local.min_price = round(self.min_price / rate, 2)
+        if convert_size is not None and self.sizes:
+            local.sizes = _size_set(tuple(convert_size(size) for size in self.sizes))
+        return local
+
 
 class ZapatillasScraper:
-    def __init__(self, config):
-        self.results = []
+    def __init__(self, config, http=None, rate=1.0, max_rate=4.0, pool_size=10, retries=3, backoff=0.5,
+                 cache=None, offline=False, parser="bs4", metrics=None):
+        self.results = ResultStore(self.parse_price)
         self.config = config
+        # Cualquier objeto con record_request() y record_page() (ver metrics.SearchMetrics)
+        self.metrics = metrics
+        self.parser = get_parser_engine(parser, config)
+        # Un limitador por servidor, compartido por todas las peticiones a ese host;
+        # rate=None desactiva la limitación (útil contra un stub local)
+        self.rate = rate
+        self.max_rate = max_rate
+        self.retries = retries
+        self.limiters = {}
+        self._limiters_lock = threading.Lock()
+        # Con offline=True solo se sirven páginas ya guardadas en la caché, sin tocar la red
+        self.cache = cache
+        self.offline = offline
         self.default_headers = {
             "User-Agent": "Mozilla/5.0",
-            "Accept-Language": "es-ES,es;q=0.9"
+            "Accept-Language": config.get("accept_language", "es-ES,es;q=0.9")
         }
+        # Cualquier objeto con .get(url, headers=..., params=...) sirve (una Session o un stub);
+        # si no se pasa ninguno, el scraper mantiene su propia Session con keep-alive
+        self.session = None
+        if http is None:
+            http = self.session = self.create_session(pool_size, retries, backoff)
+        self.http = http
 
-    def parse_price(self, price_str):
-        if not price_str:
+    def create_session(self, pool_size=10, retries=3, backoff=0.5):
+        session = requests.Session()
+        session.headers.update(self.default_headers)
+        # Solo errores de conexión; los 429/5xx (y su Retry-After) los gestiona el limitador
+        # adaptativo en _send, que es quien cuenta las esperas en timings["sleep"]
+        retry = Retry(
+            total=retries,
+            status=0,
+            backoff_factor=backoff,
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            respect_retry_after_header=False,
+            raise_on_status=False
+        )
+        adapter = TimedHTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def limiter_for(self, url):
+        if self.rate is None:
             return None
-        price_text = re.sub(r'[^\d,.]', '', price_str).replace(',', '.')
-        if price_text.count('.') > 1:
-            parts = price_text.split('.')
-            price_text = ''.join(parts[:-1]) + '.' + parts[-1]
+        host = urlsplit(url).netloc.lower()
+        with self._limiters_lock:
+            limiter = self.limiters.get(host)
+            if limiter is None:
+                limiter = self.limiters[host] = AdaptiveRateLimiter(self.rate, max_rate=self.max_rate)
+        return limiter
+
+    def effective_rate(self, url=None):
+        if url is not None:
+            limiter = self.limiter_for(url)
+            return limiter.effective_rate() if limiter else 0.0
+        return sum(limiter.effective_rate() for limiter in list(self.limiters.values()))
+
+    def _send(self, url, params, headers, timings, **kwargs):
+        limiter = self.limiter_for(url)
+        attempt = 0
+        while True:
+            if limiter:
+                timings["sleep"] += limiter.acquire()
+            connection = _connection_timings.current = {}
+            start = time.perf_counter()
+            try:
+                response = self.http.get(url, params=params, headers=headers, **kwargs)
+            finally:
+                _connection_timings.current = None
+            total = time.perf_counter() - start
+            # elapsed (requests) va del envío a tener las cabeceras, conexión incluida
+            elapsed = response.elapsed.total_seconds() if getattr(response, "elapsed", None) else total
+            connect = sum(connection.get(key, 0.0) for key in ("dns", "connect", "tls"))
+            for key in ("dns", "connect", "tls"):
+                timings[key] += connection.get(key, 0.0)
+            timings["ttfb"] += max(elapsed - connect, 0.0)
+            timings["download"] += max(total - elapsed, 0.0)
+            timings["bytes"] += len(getattr(response, "content", None) or b"")
+            if limiter is None:
+                return response
+            limiter.record(response.status_code, response.headers.get("Retry-After"))
+            if response.status_code not in limiter.RETRY_STATUSES or attempt >= self.retries:
+                return response
+            attempt += 1
+            timings["retries"] = attempt
+
+    def get(self, url, params=None, cache=None, **kwargs):
+        # Todas las peticiones del scraper (búsquedas, imágenes...) pasan por aquí. Los
+        # tiempos de la petición quedan en response.timings (en segundos). cache sustituye
+        # a la caché del scraper para esta petición (p. ej. fichas de producto con otro TTL);
+        # cache=False la salta
+        timings = dict.fromkeys(("dns", "connect", "tls", "ttfb", "download", "sleep"), 0.0)
+        timings.update(retries=0, bytes=0, cache=None)
+        response = self._get(url, params, timings, self.cache if cache is None else cache or None, **kwargs)
+        timings["status"] = response.status_code
         try:
-            return float(price_text)
-        except ValueError:
-            return None
+            response.timings = timings
+        except AttributeError:
+            pass
+        if self.metrics is not None:
+            self.metrics.record_request(self.config["name"], url, timings)
+        return response
+
+    def fetch_asset(self, url, limiter=None, **kwargs):
+        # Recursos estáticos (imágenes del CDN): fuera de la caché de respuestas, de las
+        # métricas y del limitador de los listados; quien llama trae su propio limitador
+        headers = dict(kwargs.pop("headers", None) or {})
+        if self.http is not self.session:
+            headers = {**self.default_headers, **headers}
+        if limiter is not None:
+            limiter.acquire()
+        response = self.http.get(url, headers=headers, **kwargs)
+        if limiter is not None:
+            limiter.record(response.status_code, response.headers.get("Retry-After"))
+        return response
+
+    def _get(self, url, params, timings, cache, **kwargs):
+        headers = dict(kwargs.pop("headers", None) or {})
+        if self.http is not self.session:
+            headers = {**self.default_headers, **headers}
+
+        if cache is None:
+            if self.offline:
+                # Sin caché no hay nada que servir sin red
+                timings["cache"] = "offline_miss"
+                return CachedResponse(504, b"", url=url)
+            return self._send(url, params, headers, timings, **kwargs)
+
+        key = cache.make_key(url, params)
+        entry = cache.lookup(key)
+        if entry and (self.offline or cache.is_fresh(entry)):
+            cache.hits += 1
+            timings["cache"] = "hit"
+            return entry["response"]
+        if self.offline:
+            cache.misses += 1
+            timings["cache"] = "offline_miss"
+            return CachedResponse(504, b"", url=url)
+
+        # Caducada: se revalida con ETag / Last-Modified en lugar de descargarla entera
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self._send(url, params, headers, timings, **kwargs)
+        if response.status_code == 304 and entry:
+            cache.revalidated += 1
+            cache.refresh(key)
+            timings["cache"] = "revalidated"
+            return entry["response"]
 
-    def search(self, query, max_pages=1, max_price=None, sizes=None, status_callback=None):
+        cache.misses += 1
+        timings["cache"] = "miss"
+        if response.status_code == 200:
+            cache.store(key, url, response)
+        return response
+
+    def pool_stats(self):
+        stats = {"pools": 0, "requests": 0, "new_connections": 0, "reused": 0, "open_connections": 0}
+        if self.session is None:
+            return stats
+
+        for adapter in {id(a): a for a in self.session.adapters.values()}.values():
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                stats["pools"] += 1
+                stats["requests"] += pool.num_requests
+                stats["new_connections"] += pool.num_connections
+                idle = list(pool.pool.queue) if pool.pool is not None else []
+                stats["open_connections"] += sum(1 for conn in idle if conn is not None and conn.sock is not None)
+
+        stats["reused"] = max(stats["requests"] - stats["new_connections"], 0)
+        return stats
+
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+
+    def parse_price(self, price_str):
+        return parse_price(price_str)
+
+    def build_params(self, query, page, max_price=None, sizes=None):
         cfg = self.config
-        base_url = cfg['base_url']
-        self.results = []
+        params = {
+            cfg['query_param']: query,
+            cfg['page_param']: page
+        }
 
-        for page in range(1, max_pages + 1):
-            params = {
-                cfg['query_param']: query,
-                cfg['page_param']: page
-            }
+        if cfg.get('max_price_param') and max_price is not None:
+            params[cfg['max_price_param']] = max_price
+        if cfg.get('size_param') and sizes:
+            params[cfg['size_param']] = ','.join(sizes)
+        return params
 
-            if cfg.get('max_price_param') and max_price is not None:
-                params[cfg['max_price_param']] = max_price
-            if cfg.get('size_param') and sizes:
-                params[cfg['size_param']] = ','.join(sizes)
+    def fetch_page(self, query, page, max_price=None, sizes=None):
+        params = self.build_params(query, page, max_price, sizes)
+        return self.get(self.config['search_url'], params=params)
 
-            if status_callback:
-                status_callback(f"🔍 Buscando en página {page}...")
+    def iter_pages(self, query, max_pages=1, max_price=None, sizes=None, status_callback=None, concurrency=1,
+                   start_page=1):
+        # Devuelve (página, respuesta) en orden de página. Con concurrency > 1 se piden
+        # varias páginas a la vez, pero nunca más de `concurrency` por delante de la actual.
+        pages = range(start_page, max_pages + 1)
 
-            response = requests.get(cfg['search_url'], headers=self.default_headers, params=params)
-            if response.status_code != 200:
+        if concurrency <= 1:
+            for page in pages:
                 if status_callback:
-                    status_callback(f"⚠️ Error {response.status_code} en página {page}")
-                break
+                    status_callback(f"🔍 Buscando en página {page}...")
+                yield page, self.fetch_page(query, page, max_price, sizes)
+            return
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-            products = soup.select(cfg['product_selector'])
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        pending = {}
+        try:
+            for page in pages[:concurrency]:
+                pending[page] = executor.submit(self.fetch_page, query, page, max_price, sizes)
+            for page in pages:
+                if status_callback:
+                    status_callback(f"🔍 Buscando en página {page}...")
+                response = pending.pop(page).result()
+                ahead = page + concurrency
+                if ahead <= max_pages:
+                    pending[ahead] = executor.submit(self.fetch_page, query, ahead, max_price, sizes)
+                yield page, response
+        finally:
+            # Si el consumidor corta (página vacía o error) se descartan las que quedan
+            for future in pending.values():
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
 
-            if not products:
-                break
+    def make_filter(self, max_price=None, sizes=None, **filters):
+        # Si la tienda ya filtra las tallas en el servidor no se vuelven a comprobar aquí
+        # (las tarjetas del listado casi nunca traen tallas). filters: min_price, gender, category
+        return ProductFilter(max_price=max_price, sizes=None if self.config.get('size_param') else sizes, **filters)
+
+    def build_product(self, card):
+        # card es el dict de extract_card (título, precio, tallas, imagen y enlace en bruto)
+        base_url = self.config['base_url']
+        img_url = card["image"] or ""
+        if img_url and not img_url.startswith("http"):
+            img_url = urljoin(base_url, img_url)
+
+        return {
+            "title": card["title"],
+            "price": card["price"],
+            "image_url": img_url,
+            "product_url": urljoin(base_url, card["link"]) if card["link"] is not None else "",
+            "store": self.config['name'],
+            "available_sizes": ', '.join(card["sizes"]) or "No especificado",
+            "subtitle": card.get("subtitle") or ""
+        }
+
+    def extract_cards(self, cards, skip=None, counters=None):
+        # Campos en bruto de todas las tarjetas de la página; las saltadas, las que no
+        # tienen título o precio y las que fallan al extraerse se quedan fuera
+        base_url = self.config['base_url']
+        rows = []
+        for card in cards:
+            outcome = None
+            try:
+                if skip is not None:
+                    link = self.parser.card_link(card)
+                    if link is not None and skip(urljoin(base_url, link)):
+                        outcome = "skipped"
+                if outcome is None:
+                    card = self.parser.extract_card(card)
+                    if card["title"] is None or card["price"] is None:
+                        outcome = "incomplete"
+                    else:
+                        rows.append(card)
+            except Exception:
+                outcome = "dropped"
+            if outcome is not None and counters is not None:
+                counters[outcome] = counters.get(outcome, 0) + 1
+        return rows
 
-            for product in products:
+    def iter_products(self, cards, max_price=None, sizes=None, skip=None, counters=None, filters=None):
+        # Por lotes: primero se extrae la página entera, después se parsean los precios y
+        # se aplican los filtros sobre las columnas, y al final se arman los productos.
+        # Con counters (un dict) se cuentan las tarjetas saltadas, incompletas, filtradas y
+        # las que fallan al extraerse, y el tiempo de extracción
+        started = time.perf_counter()
+        if filters is None:
+            filters = self.make_filter(max_price, sizes)
+        rows = self.extract_cards(cards, skip, counters)
+        keep = filters.mask(rows, [self.parse_price(row["price"]) for row in rows])
+
+        products = []
+        for row, kept in zip(rows, keep):
+            if not kept:
+                outcome = "filtered"
+            else:
                 try:
-                    title = product.select_one(cfg['title_selector']).get_text(strip=True)
-                    price_text = product.select_one(cfg['price_selector']).get_text(strip=True)
-                    price = self.parse_price(price_text)
-                    if max_price and price and price > max_price:
-                        continue
-
-                    sizes_available = []
-                    if cfg.get('size_selector'):
-                        sizes_available = [s.get_text(strip=True) for s in product.select(cfg['size_selector'])]
-
-                    if sizes and not cfg.get('size_param'):
-                        if not any(s.lower() in [sa.lower() for sa in sizes_available] for s in sizes):
-                            continue
-
-                    image_elem = product.select_one(cfg['img_selector'])
-                    img_url = image_elem.get("src") if image_elem else ""
-                    if img_url and not img_url.startswith("http"):
-                        img_url = urljoin(base_url, img_url)
-
-                    link_elem = product.select_one(cfg['link_selector'])
-                    product_url = urljoin(base_url, link_elem.get("href")) if link_elem else ""
-
-                    self.results.append({
-                        "title": title,
-                        "price": price_text,
-                        "image_url": img_url,
-                        "product_url": product_url,
-                        "store": cfg['name'],
-                        "available_sizes": ', '.join(sizes_available) or "No especificado"
-                    })
+                    products.append(self.build_product(row))
+                    outcome = "products"
                 except Exception:
-                    continue
+                    outcome = "dropped"
+            if counters is not None:
+                counters[outcome] = counters.get(outcome, 0) + 1
+        if counters is not None:
+            counters["extract_s"] = counters.get("extract_s", 0.0) + time.perf_counter() - started
+        yield from products
+
+    def parse_products(self, html, max_price=None, sizes=None, filters=None):
+        cards = self.parser.cards(html)
+        if not cards:
+            # Página sin tarjetas de producto: fin de resultados
+            return None
+        return list(self.iter_products(cards, max_price, sizes, filters=filters))
 
-            time.sleep(random.uniform(1.0, 2.0))
+    def iter_search(self, query, max_pages=1, max_price=None, sizes=None, status_callback=None, concurrency=1,
+                    cancel_event=None, skip=None, page_callback=None, filters=None, checkpoint=None, resume=False):
+        # Devuelve los productos de cada página en cuanto se parsea. Solo se piden páginas
+        # a medida que el consumidor avanza (como mucho `concurrency` por delante), y
+        # se puede cortar con cancel_event.set() o cerrando el generador.
+        # filters (un ProductFilter) sustituye al filtro local de max_price / sizes, que
+        # se siguen enviando a la tienda para que filtre en el servidor.
+        # Con checkpoint (un CrawlJournal) cada página terminada queda en el diario; con
+        # resume=True se devuelven primero los productos guardados de una búsqueda cortada
+        # y se sigue desde la primera página que faltaba.
+        start_page = 1
+        key = None
+        if checkpoint is not None:
+            key = checkpoint.make_key(self.config["name"], query, max_price, sizes, filters)
+            saved = checkpoint.resume_point(key) if resume else None
+            if saved is None:
+                checkpoint.start(key, query)
+            else:
+                products, start_page = saved
+                if status_callback:
+                    status_callback(f"↩️ Retomando desde la página {start_page} ({len(products)} productos guardados)")
+                for product in products:
+                    yield product
+                    if cancel_event is not None and cancel_event.is_set():
+                        return
+        pages = self.iter_pages(query, max_pages, max_price, sizes, status_callback, concurrency, start_page)
+        try:
+            for page, response in pages:
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                record = self._page_record(query, page, response) if self.metrics is not None else None
+                if response.status_code != 200:
+                    if record is not None:
+                        self.metrics.record_page(record)
+                    if status_callback:
+                        status_callback(f"⚠️ Error {response.status_code} en página {page}")
+                    return
 
+                started = time.perf_counter()
+                cards = self.parser.cards(response.text)
+                if record is not None:
+                    record["parse"] = time.perf_counter() - started
+                    record["cards"] = len(cards)
+                if page_callback:
+                    page_callback(page, response, len(cards))
+                if not cards:
+                    if record is not None:
+                        self.metrics.record_page(record)
+                    if key is not None:
+                        checkpoint.finish(key)
+                    return
+
+                # Copia de cada producto para el diario: el consumidor puede modificar el suyo
+                done = [] if key is not None else None
+                try:
+                    for product in self.iter_products(cards, max_price, sizes, skip, record, filters):
+                        if done is not None:
+                            done.append(dict(product))
+                        yield product
+                        if cancel_event is not None and cancel_event.is_set():
+                            return
+                finally:
+                    if record is not None:
+                        record["parse"] += record.pop("extract_s", 0.0)
+                        self.metrics.record_page(record)
+                if key is not None:
+                    checkpoint.page_done(key, page, done)
+            else:
+                if key is not None:
+                    checkpoint.finish(key)
+        finally:
+            pages.close()
+            if checkpoint is not None:
+                checkpoint.sync()
+
+    def _page_record(self, query, page, response):
+        # Una fila por página para las métricas: red (de response.timings), parseo y tarjetas
+        record = {"store": self.config["name"], "query": query, "page": page}
+        record.update(getattr(response, "timings", None) or {"status": response.status_code})
+        record.update(parse=0.0, cards=0, products=0, skipped=0, incomplete=0, filtered=0, dropped=0)
+        return record
+
+    async def aiter_search(self, query, max_pages=1, max_price=None, sizes=None, status_callback=None,
+                           concurrency=1, cancel_event=None, filters=None, checkpoint=None, resume=False):
+        # Versión asíncrona de iter_search: el generador corre en un hilo propio y
+        # solo se le pide el siguiente producto cuando el consumidor lo espera
+        cancel_event = cancel_event or threading.Event()
+        products = self.iter_search(query, max_pages, max_price, sizes, status_callback, concurrency, cancel_event,
+                                    filters=filters, checkpoint=checkpoint, resume=resume)
+        import asyncio  # solo lo necesita esta versión asíncrona
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        loop = asyncio.get_running_loop()
+        done = object()
+        try:
+            while True:
+                product = await loop.run_in_executor(executor, next, products, done)
+                if product is done:
+                    break
+                yield product
+        finally:
+            cancel_event.set()
+            executor.submit(products.close)
+            executor.shutdown(wait=False)
+
+    def search(self, query, max_pages=1, max_price=None, sizes=None, status_callback=None, concurrency=1,
+               cancel_event=None, filters=None, checkpoint=None, resume=False):
+        self.results = ResultStore(self.parse_price)
+        for product in self.iter_search(query, max_pages, max_price, sizes, status_callback, concurrency,
+                                        cancel_event, filters=filters, checkpoint=checkpoint, resume=resume):
+            self.results.append(product)
         return self.results
 
     def export_to_csv(self, filename):
@@ -146,551 +1613,252 @@ class ZapatillasScraper:
         with open(filename, "w", newline="", encoding="utf-8") as f:
             writer = csv.DictWriter(f, fieldnames=[
                 "title", "price", "available_sizes", "product_url", "image_url", "store"
-            ])
+            ], extrasaction="ignore")
             writer.writeheader()
             for result in self.results:
                 writer.writerow(result)
         return True
 
 
-# --- Custom widgets ---
-class CustomEntry(ttk.Entry):
-    def __init__(self, parent, placeholder="", **kwargs):
-        super().__init__(parent, **kwargs)
-        self.placeholder = placeholder
-        self.placeholder_color = COLORS["text_light"]
-        self.default_fg_color = COLORS["text"]
-        
-        self.bind("<FocusIn>", self._focus_in)
-        self.bind("<FocusOut>", self._focus_out)
-        
-        self.put_placeholder()
-    
-    def put_placeholder(self):
-        self.insert(0, self.placeholder)
-        self['foreground'] = self.placeholder_color
-            
-    def _focus_in(self, *args):
-        if self.get() == self.placeholder:
-            self.delete(0, 'end')
-            self['foreground'] = self.default_fg_color
-            
-    def _focus_out(self, *args):
-        if not self.get():
-            self.put_placeholder()
-            
-    def get_value(self):
-        if self.get() == self.placeholder:
-            return ""
-        return self.get()
-
-
-class HoverButton(tk.Button):
-    def __init__(self, master, background=COLORS["primary"], activebackground=COLORS["primary_hover"], **kwargs):
-        tk.Button.__init__(self, master, background=background, activebackground=activebackground, **kwargs)
-        self.default_bg = background
-        self.hover_bg = activebackground
-        self.bind("<Enter>", self._on_enter)
-        self.bind("<Leave>", self._on_leave)
-
-    def _on_enter(self, e):
-        self.config(background=self.hover_bg)
-
-    def _on_leave(self, e):
-        self.config(background=self.default_bg)
-
-
-class LoadingAnimation:
-    def __init__(self, parent, text="Cargando"):
-        self.parent = parent
-        self.text = text
-        self.count = 0
-        self.running = False
-        self.label = tk.Label(parent, text=text, font=("Segoe UI", 10), fg=COLORS["primary"], bg=COLORS["light_bg"])
-        
-    def start(self):
-        self.running = True
-        self.count = 0
-        self.label.pack(pady=5)
-        self.update()
-        
-    def update(self):
-        if not self.running:
-            return
-        
-        dots = "." * (self.count % 4)
-        self.label.config(text=f"{self.text}{dots}")
-        self.count += 1
-        self.parent.after(300, self.update)
-        
-    def stop(self):
-        self.running = False
-        self.label.pack_forget()
-
-
-class StatusBar(tk.Frame):
-    def __init__(self, parent, **kwargs):
-        tk.Frame.__init__(self, parent, **kwargs)
-        self.config(bg=COLORS["light_bg"], height=30)
-        
-        self.label = tk.Label(self, text="", font=("Segoe UI", 9), 
-                              fg=COLORS["text_light"], bg=COLORS["light_bg"], anchor="w")
-        self.label.pack(side=tk.LEFT, padx=10)
-        
-    def set_message(self, message, is_error=False):
-        color = COLORS["error"] if is_error else COLORS["text_light"]
-        self.label.config(text=message, fg=color)
-
-
-class CustomTree(ttk.Treeview):
-    def __init__(self, parent, **kwargs):
-        super().__init__(parent, **kwargs)
-        # Configurar la barra de desplazamiento vertical
-        self.vsb = ttk.Scrollbar(parent, orient="vertical", command=self.yview)
-        self.configure(yscrollcommand=self.vsb.set)
-        self.vsb.pack(side='right', fill='y')
-        
-        # Configurar los colores alternos de las filas
-        self.tag_configure('oddrow', background=COLORS["light_bg"])
-        self.tag_configure('evenrow', background=COLORS["white"])
-
-
-# --- App GUI ---
-class App:
-    def __init__(self, root):
-        self.scraper = ZapatillasScraper(NIKE_CONFIG)
-        self.root = root
-        root.title("NIKE Scraper by Aran :)")
-        root.geometry("950x700")
-        root.configure(bg=COLORS["light_bg"])
-        root.resizable(True, True)
-        
-        # Configura el estilo
-        self.setup_styles()
-        
-        # Frame principal
-        self.main_frame = tk.Frame(root, bg=COLORS["light_bg"])
-        self.main_frame.pack(fill=tk.BOTH, expand=True)
-        
-        # Header con logo
-        self.create_header()
-        
-        # Panel de búsqueda
-        self.create_search_panel()
-        
-        # Resultados
-        self.create_results_panel()
-        
-        # Panel de estado
-        self.status_bar = StatusBar(root)
-        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
-        
-        # Animación de carga
-        self.loading = LoadingAnimation(self.main_frame)
-        
-        # Contador de resultados
-        self.results_counter = tk.Label(
-            self.results_frame, 
-            text="0 resultados encontrados", 
-            font=("Segoe UI", 10),
-            fg=COLORS["text_light"],
-            bg=COLORS["light_bg"]
-        )
-        self.results_counter.pack(pady=(0, 5), anchor="w", padx=10)
-
-    def setup_styles(self):
-        self.style = ttk.Style()
-        self.style.theme_use('clam')
-        
-        # Estilo para etiquetas
-        self.style.configure(
-            "TLabel", 
-            font=("Segoe UI", 10), 
-            background=COLORS["light_bg"], 
-            foreground=COLORS["text"]
-        )
-        
-        # Estilo para entradas
-        self.style.configure(
-            "TEntry", 
-            fieldbackground=COLORS["input_bg"],
-            bordercolor=COLORS["border"],
-            lightcolor=COLORS["border"],
-            darkcolor=COLORS["border"],
-            borderwidth=1,
-            font=("Segoe UI", 10)
-        )
-        self.style.map(
-            "TEntry",
-            bordercolor=[("focus", COLORS["primary"])]
-        )
-        
-        # Estilo para botones
-        self.style.configure(
-            "TButton", 
-            font=("Segoe UI", 10, "bold"),
-            background=COLORS["primary"],
-            foreground=COLORS["white"]
-        )
-        self.style.map(
-            "TButton",
-            background=[("active", COLORS["primary_hover"])]
-        )
-        
-        # Estilo para el Treeview (tabla de resultados)
-        self.style.configure(
-            "Treeview", 
-            background=COLORS["white"],
-            fieldbackground=COLORS["white"],
-            foreground=COLORS["text"],
-            font=("Segoe UI", 9),
-            rowheight=30
-        )
-        self.style.configure(
-            "Treeview.Heading", 
-            font=("Segoe UI", 10, "bold"),
-            background=COLORS["secondary"],
-            foreground=COLORS["white"]
-        )
-        self.style.map(
-            "Treeview.Heading",
-            background=[("active", COLORS["primary"])]
-        )
-        
-        # Estilo para el Combobox
-        self.style.configure(
-            "TCombobox", 
-            fieldbackground=COLORS["input_bg"],
-            background=COLORS["white"],
-            bordercolor=COLORS["border"]
-        )
-        
-        # Estilo para el Spinbox
-        self.style.configure(
-            "TSpinbox", 
-            fieldbackground=COLORS["input_bg"],
-            bordercolor=COLORS["border"],
-            arrowcolor=COLORS["primary"]
-        )
+# --- Búsqueda de varias consultas ---
+class CrawlEngine:
+    # Lanza varias consultas seguidas con un índice de productos ya vistos: cada producto
+    # se guarda una vez y acumula en "queries" las búsquedas en las que ha aparecido
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self.results = ResultStore(scraper.parse_price)
+        self.index = {}
+        self.stats = self._empty_stats()
 
-    def create_header(self):
-        header_frame = tk.Frame(self.main_frame, bg=COLORS["secondary"], height=80)
-        header_frame.pack(fill=tk.X)
-        
-        # Logo y título
-        logo_text = tk.Label(
-            header_frame, 
-            text="NIKE", 
-            font=("Arial Black", 24, "bold"), 
-            fg=COLORS["white"],
-            bg=COLORS["secondary"]
-        )
-        logo_text.pack(side=tk.LEFT, padx=20, pady=15)
-        
-        title = tk.Label(
-            header_frame, 
-            text="Scraper :)", 
-            font=("Segoe UI", 18), 
-            fg=COLORS["white"],
-            bg=COLORS["secondary"]
-        )
-        title.pack(side=tk.LEFT, padx=0, pady=15)
-
-    def create_search_panel(self):
-        search_frame = tk.Frame(self.main_frame, bg=COLORS["light_bg"], padx=20, pady=15)
-        search_frame.pack(fill=tk.X)
-        
-        # Título de la sección
-        search_title = tk.Label(
-            search_frame, 
-            text="Uso propio con fines educativos", 
-            font=("Segoe UI", 14, "bold"),
-            fg=COLORS["text"],
-            bg=COLORS["light_bg"]
-        )
-        search_title.grid(row=0, column=0, columnspan=3, sticky="w", pady=(0, 10))
-        
-        # Primera fila: Término de búsqueda
-        tk.Label(
-            search_frame, 
-            text="¿Qué estás buscando?", 
-            font=("Segoe UI", 10),
-            fg=COLORS["text"],
-            bg=COLORS["light_bg"]
-        ).grid(row=1, column=0, sticky="w", pady=(5, 2))
-        
-        self.query_entry = CustomEntry(
-            search_frame, 
-            placeholder="Ej: Nike Air Max, Air Jordan, Nocta...",
-            width=50
-        )
-        self.query_entry.grid(row=2, column=0, sticky="ew", padx=(0, 20))
-        
-        # Segunda fila: Filtros
-        filters_frame = tk.Frame(search_frame, bg=COLORS["light_bg"])
-        filters_frame.grid(row=3, column=0, sticky="ew", pady=(15, 0))
-        filters_frame.grid_columnconfigure(0, weight=1)
-        filters_frame.grid_columnconfigure(1, weight=1)
-        filters_frame.grid_columnconfigure(2, weight=1)
-        
-        # Precio máximo
-        tk.Label(
-            filters_frame, 
-            text="Precio máximo (€)", 
-            font=("Segoe UI", 10),
-            fg=COLORS["text"],
-            bg=COLORS["light_bg"]
-        ).grid(row=0, column=0, sticky="w", pady=(0, 2))
-        
-        self.max_price_entry = CustomEntry(filters_frame, placeholder="Ej: 120", width=15)
-        self.max_price_entry.grid(row=1, column=0, sticky="w", padx=(0, 10))
-        
-        # Tallas
-        tk.Label(
-            filters_frame, 
-            text="Tallas", 
-            font=("Segoe UI", 10),
-            fg=COLORS["text"],
-            bg=COLORS["light_bg"]
-        ).grid(row=0, column=1, sticky="w", pady=(0, 2))
-        
-        self.size_entry = CustomEntry(filters_frame, placeholder="Ej: 42, 43, 44", width=15)
-        self.size_entry.grid(row=1, column=1, sticky="w", padx=(0, 10))
-        
-        # Páginas a buscar
-        tk.Label(
-            filters_frame, 
-            text="Páginas a buscar", 
-            font=("Segoe UI", 10),
-            fg=COLORS["text"],
-            bg=COLORS["light_bg"]
-        ).grid(row=0, column=2, sticky="w", pady=(0, 2))
-        
-        self.page_spinbox = ttk.Spinbox(filters_frame, from_=1, to=10, width=5)
-        self.page_spinbox.set(2)
-        self.page_spinbox.grid(row=1, column=2, sticky="w")
-        
-        # Botón de búsqueda
-        button_frame = tk.Frame(search_frame, bg=COLORS["light_bg"])
-        button_frame.grid(row=4, column=0, sticky="w", pady=(20, 10))
-        
-        self.search_btn = HoverButton(
-            button_frame,
-            text="BUSCAR ZAPATILLAS",
-            font=("Segoe UI", 11, "bold"),
-            fg=COLORS["white"],
-            bg=COLORS["primary"],
-            activeforeground=COLORS["white"],
-            activebackground=COLORS["primary_hover"],
-            relief=tk.FLAT,
-            borderwidth=0,
-            padx=15,
-            pady=8,
-            cursor="hand2",
-            command=self.run_search
-        )
-        self.search_btn.pack(side=tk.LEFT)
-        
-        # Separador
-        ttk.Separator(self.main_frame, orient='horizontal').pack(fill='x', padx=20)
-
-    def create_results_panel(self):
-        self.results_frame = tk.Frame(self.main_frame, bg=COLORS["light_bg"], padx=20, pady=15)
-        self.results_frame.pack(fill=tk.BOTH, expand=True)
-        
-        # Título de la sección
-        results_title = tk.Label(
-            self.results_frame, 
-            text="Resultados", 
-            font=("Segoe UI", 14, "bold"),
-            fg=COLORS["text"],
-            bg=COLORS["light_bg"]
-        )
-        results_title.pack(anchor="w", pady=(0, 10))
-        
-        # Tabla de resultados
-        tree_frame = tk.Frame(self.results_frame, bg=COLORS["light_bg"])
-        tree_frame.pack(fill=tk.BOTH, expand=True)
-        
-        self.tree = CustomTree(
-            tree_frame,
-            columns=("Título", "Precio", "Tallas", "Enlace"),
-            show="headings",
-            height=15
-        )
-        
-        # Configurar anchos de columnas
-        self.tree.column("Título", width=350, anchor="w")
-        self.tree.column("Precio", width=100, anchor="center")
-        self.tree.column("Tallas", width=150, anchor="center")
-        self.tree.column("Enlace", width=300, anchor="w")
-        
-        # Configurar encabezados
-        self.tree.heading("Título", text="Título")
-        self.tree.heading("Precio", text="Precio")
-        self.tree.heading("Tallas", text="Tallas Disponibles")
-        self.tree.heading("Enlace", text="URL del producto")
-        
-        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, pady=(5, 10))
-        
-        # Eventos de la tabla
-        self.tree.bind("<Double-1>", self.open_url)
-        self.tree.bind("<Button-1>", self.check_click)
-        
-        # Panel inferior con botones de acciones
-        actions_frame = tk.Frame(self.results_frame, bg=COLORS["light_bg"])
-        actions_frame.pack(fill=tk.X, pady=(5, 0))
-        
-        self.export_btn = HoverButton(
-            actions_frame,
-            text="GUARDAR EN CSV",
-            font=("Segoe UI", 10, "bold"),
-            fg=COLORS["white"],
-            bg=COLORS["secondary"],
-            activeforeground=COLORS["white"],
-            activebackground=COLORS["primary"],
-            relief=tk.FLAT,
-            borderwidth=0,
-            padx=15,
-            pady=6,
-            cursor="hand2",
-            command=self.save_csv
-        )
-        self.export_btn.pack(side=tk.LEFT, padx=(0, 10))
-        
-        self.open_url_btn = HoverButton(
-            actions_frame,
-            text="ABRIR ENLACE SELECCIONADO",
-            font=("Segoe UI", 10, "bold"),
-            fg=COLORS["white"],
-            bg=COLORS["secondary"],
-            activeforeground=COLORS["white"],
-            activebackground=COLORS["primary"],
-            relief=tk.FLAT,
-            borderwidth=0,
-            padx=15,
-            pady=6,
-            cursor="hand2",
-            command=self.open_selected_url
-        )
-        self.open_url_btn.pack(side=tk.LEFT)
-
-    def check_click(self, event):
-        region = self.tree.identify_region(event.x, event.y)
-        if region == "cell":
-            column = self.tree.identify_column(event.x)
-            if column == "#4":  # Columna del enlace
-                self.open_url(event)
-
-    def update_status(self, msg, is_error=False):
-        self.status_bar.set_message(msg, is_error)
-        self.root.update_idletasks()
-
-    def run_search(self):
-        self.tree.delete(*self.tree.get_children())
-        
-        query = self.query_entry.get_value()
-        max_price = self.max_price_entry.get_value()
-        sizes = [s.strip() for s in self.size_entry.get_value().split(',') if s.strip()]
-        pages = int(self.page_spinbox.get())
-
-        if not query:
-            messagebox.showwarning("Atención", "Introduce un término de búsqueda")
+    @staticmethod
+    def _empty_stats():
+        return {
+            "queries": 0,
+            "duplicate_queries": 0,
+            "pages_fetched": 0,
+            "pages_from_cache": 0,
+            "cards_seen": 0,
+            "cards_skipped": 0,
+            "products": 0
+        }
+
+    @staticmethod
+    def canonical_url(url):
+        # Misma ficha aunque cambien mayúsculas del dominio, parámetros de tracking o la barra final
+        parts = urlsplit(url)
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), "", ""))
+
+    @staticmethod
+    def normalize_query(query):
+        return " ".join(query.lower().split())
+
+    def _skip_seen(self, query):
+        def skip(product_url):
+            self.stats["cards_seen"] += 1
+            index = self.index.get(self.canonical_url(product_url))
+            if index is None:
+                return False
+            self.stats["cards_skipped"] += 1
+            row = self.results[index]
+            if query not in row["queries"]:
+                row["queries"] = row["queries"] + [query]
+            return True
+        return skip
+
+    def _count_page(self, page, response, card_count):
+        self.stats["pages_fetched"] += 1
+        if getattr(response, "from_cache", False):
+            self.stats["pages_from_cache"] += 1
+
+    def crawl(self, queries, max_pages=1, max_price=None, sizes=None, status_callback=None, concurrency=1,
+              cancel_event=None):
+        unique = {}
+        for query in queries:
+            self.stats["queries"] += 1
+            key = self.normalize_query(query)
+            if key in unique:
+                self.stats["duplicate_queries"] += 1
+                continue
+            unique[key] = query
+
+        for query in unique.values():
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            if status_callback:
+                status_callback(f"🔎 Consulta: {query}")
+            for product in self.scraper.iter_search(
+                query, max_pages, max_price, sizes, status_callback, concurrency, cancel_event,
+                skip=self._skip_seen(query), page_callback=self._count_page
+            ):
+                url = self.canonical_url(product["product_url"]) if product["product_url"] else None
+                if url in self.index:
+                    # Repetido en la misma página: skip se comprueba antes de guardar la página
+                    continue
+                product["queries"] = [query]
+                self.results.append(product)
+                if url is not None:
+                    self.index[url] = len(self.results) - 1
+                self.stats["products"] += 1
+
+        return self.results
+
+    def savings(self):
+        # Trabajo ahorrado: tarjetas no parseadas y descargas evitadas por el índice; las
+        # páginas servidas por la caché de respuestas se cuentan aparte
+        stats = self.stats
+        pages_per_query = stats["pages_fetched"] / max(stats["queries"] - stats["duplicate_queries"], 1)
+        return {
+            "cards_skipped": stats["cards_skipped"],
+            "cards_skipped_ratio": stats["cards_skipped"] / stats["cards_seen"] if stats["cards_seen"] else 0.0,
+            "fetches_avoided": round(stats["duplicate_queries"] * pages_per_query),
+            "pages_from_cache": stats["pages_from_cache"],
+            "products": stats["products"]
+        }
+
+
+# --- Miniaturas de producto ---
+class ThumbnailLoader:
+    # Descarga y reduce imágenes en un pool de hilos. Las miniaturas quedan en una
+    # caché LRU en memoria (limitada en bytes) respaldada por ficheros PNG en disco.
+    def __init__(self, scraper, size=(28, 28), workers=4, cache_dir="nike_thumbnails",
+                 max_memory=8 * 1024 * 1024, max_disk=64 * 1024 * 1024, rate=10.0, max_rate=30.0):
+        self.scraper = scraper
+        # Las imágenes salen de un CDN: limitador propio, con más margen que el de los
+        # listados y sin frenarlos; rate=None (o un scraper sin límite) lo desactiva
+        self.limiter = None
+        if rate is not None and scraper.rate is not None:
+            self.limiter = AdaptiveRateLimiter(rate, max_rate=max_rate, burst=workers)
+        self.size = size
+        self.cache_dir = cache_dir
+        self.max_memory = max_memory
+        self.max_disk = max_disk
+        self.memory = OrderedDict()
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+        self.pending = {}
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumbnails")
+        os.makedirs(cache_dir, exist_ok=True)
+        self._prune_disk()
+
+    def _disk_path(self, url):
+        name = hashlib.sha1(f"{url}|{self.size[0]}x{self.size[1]}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, name + ".png")
+
+    def get_cached(self, url):
+        with self._lock:
+            image = self.memory.get(url)
+            if image is not None:
+                self.memory.move_to_end(url)
+            return image
+
+    def request(self, url, callback):
+        # callback(url, imagen PIL o None) se llama desde un hilo del pool
+        if not url:
+            return
+        image = self.get_cached(url)
+        if image is not None:
+            callback(url, image)
             return
+        with self._lock:
+            if url in self.pending:
+                return
+            future = self._executor.submit(self._load, url)
+            self.pending[url] = future
+        future.add_done_callback(lambda f: self._done(url, f, callback))
 
-        try:
-            max_price = float(max_price) if max_price else None
-        except ValueError:
-            messagebox.showerror("Error", "Precio máximo inválido")
-            self.update_status("Formato de precio inválido. Usa solo números.", True)
+    def retain(self, urls):
+        # Cancela las descargas que aún no han empezado y ya no se van a ver
+        urls = set(urls)
+        with self._lock:
+            stale = [future for url, future in self.pending.items() if url not in urls]
+        # cancel() ejecuta _done en este mismo hilo, que vuelve a tomar el lock
+        for future in stale:
+            future.cancel()
+
+    def _done(self, url, future, callback):
+        with self._lock:
+            self.pending.pop(url, None)
+        if future.cancelled():
             return
+        try:
+            image = future.result()
+        except Exception:
+            image = None
+        if image is not None:
+            self._remember(url, image)
+        callback(url, image)
 
-        # Desactivar botón de búsqueda e iniciar animación
-        self.search_btn.config(state=tk.DISABLED)
-        self.loading.start()
-        self.update_status("Iniciando búsqueda...")
-        
-        # Forzar actualizaciones de la interfaz
-        self.root.update_idletasks()
-        
-        # Ejecutar búsqueda
-        results = self.scraper.search(
-            query, 
-            max_pages=pages, 
-            max_price=max_price,
-            sizes=sizes, 
-            status_callback=self.update_status
-        )
+    def _load(self, url):
+        from PIL import Image  # Pillow solo hace falta si se piden miniaturas
 
-        # Detener animación y reactivar botón
-        self.loading.stop()
-        self.search_btn.config(state=tk.NORMAL)
-        
-        if results:
-            for i, product in enumerate(results):
-                tag = 'evenrow' if i % 2 == 0 else 'oddrow'
-                self.tree.insert(
-                    '', 'end', 
-                    values=(
-                        product["title"], 
-                        product["price"],
-                        product["available_sizes"], 
-                        product["product_url"]
-                    ),
-                    tags=(tag,)
-                )
-            self.update_status(f"Búsqueda completada. Se encontraron {len(results)} productos.")
-            self.results_counter.config(text=f"{len(results)} productos encontrados")
-        else:
-            self.update_status("Búsqueda completada. No se encontraron productos.")
-            self.results_counter.config(text="0 productos encontrados")
-            messagebox.showinfo("Sin resultados", "No se encontraron productos para tu búsqueda.")
+        path = self._disk_path(url)
+        if os.path.exists(path):
+            try:
+                with Image.open(path) as cached:
+                    cached.load()
+                    image = cached.copy()
+                # La fecha de modificación marca el último uso: el borrado en disco es LRU
+                os.utime(path)
+                return image
+            except FileNotFoundError:
+                pass  # la ha borrado _prune_disk entretanto: se vuelve a descargar
 
-    def save_csv(self):
-        if not self.scraper.results:
-            messagebox.showwarning("Nada que guardar", "Realiza una búsqueda primero.")
-            return
+        response = self.scraper.fetch_asset(url, self.limiter, timeout=10)
+        if response.status_code != 200:
+            return None
+        with Image.open(io.BytesIO(response.content)) as image:
+            # draft() deja que el decodificador JPEG escale al leer; thumbnail() termina el trabajo
+            image.draft("RGB", self.size)
+            image = image.convert("RGBA")
+            image.thumbnail(self.size)
+        image.save(path, "PNG")
+        with self._disk_lock:
+            self.disk_bytes += os.path.getsize(path)
+            if self.disk_bytes > self.max_disk:
+                self._prune_disk()
+        return image
 
-        filename = datetime.now().strftime("nike_zapatillas_%Y%m%d_%H%M%S.csv")
-        file = filedialog.asksaveasfilename(
-            initialfile=filename,
-            defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv")],
-            title="Guardar resultados como..."
-        )
-        
-        if file:
-            if self.scraper.export_to_csv(file):
-                self.update_status(f"Archivo guardado en: {file}")
-                messagebox.showinfo("Éxito", f"Archivo guardado correctamente.")
-            else:
-                self.update_status("Error al guardar el archivo.", True)
-                messagebox.showerror("Error", "No se pudo guardar el archivo.")
-
-    def open_url(self, event):
-        region = self.tree.identify_region(event.x, event.y)
-        if region == "cell":
-            column = self.tree.identify_column(event.x)
-            if column == "#4":  # Columna del enlace
-                row = self.tree.identify_row(event.y)
-                if row:
-                    item = self.tree.item(row)
-                    url = item["values"][3]
-                    webbrowser.open_new_tab(url)
-                    self.update_status(f"Abriendo enlace: {url}")
-
-    def open_selected_url(self):
-        selected = self.tree.selection()
-        if selected:
-            item = self.tree.item(selected[0])
-            url = item["values"][3]
-            webbrowser.open_new_tab(url)
-            self.update_status(f"Abriendo enlace: {url}")
-        else:
-            messagebox.showinfo("Información", "Selecciona primero un producto de la lista.")
+    def _remember(self, url, image):
+        with self._lock:
+            if url in self.memory:
+                return
+            self.memory[url] = image
+            self.memory_bytes += image.width * image.height * 4
+            while self.memory_bytes > self.max_memory and len(self.memory) > 1:
+                _, old = self.memory.popitem(last=False)
+                self.memory_bytes -= old.width * old.height * 4
+
+    def _prune_disk(self):
+        # Se llama al crear el loader y cada vez que una miniatura nueva pasa de max_disk
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(".png"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self.disk_bytes = total
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
 
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = App(root)
-    root.mainloop()
+    import sys
+
+    # Sin argumentos se abre la interfaz; con argumentos, la línea de comandos
+    if len(sys.argv) > 1:
+        from cli import main
+        sys.exit(main())
+    else:
+        from gui import main
+        main()
@@ -0,0 +1,85 @@
+# Escalado del crawl repartido (distributed.py) en una sola máquina: un servidor local
+# devuelve las fixtures con una latencia fija, como una tienda real, y se mide cuántas
+# páginas por segundo sacan 1, 2, 4... procesos worker de la misma cola. Como cada worker
+# pasa casi todo el tiempo esperando a la red, el ritmo debería crecer casi linealmente
+# hasta que el parseo llene los núcleos.
+#
+#   python benchmarks/bench_distributed.py [--tasks 80] [--workers 1,2,4,8] [--latency 0.2]
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from Scraper import NIKE_CONFIG  # noqa: E402
+from distributed import SqliteTaskQueue, run_workers  # noqa: E402
+
+FIXTURES_DIR = os.path.join(ROOT, "benchmarks", "fixtures")
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    pages = []
+    latency = 0.1
+
+    def do_GET(self):
+        page = int(parse_qs(urlsplit(self.path).query).get("page", ["1"])[0])
+        body = self.pages[page % len(self.pages)]
+        time.sleep(self.latency)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(config, path, tasks, workers):
+    queue = SqliteTaskQueue(path)
+    # Trabajos de 10 páginas, todas con productos: ninguna tarea se salta
+    queue.submit([{"query": f"q{n}", "pages": 10} for n in range(tasks // 10)])
+    queue.close()
+    start = time.perf_counter()
+    stats = run_workers(path, workers, config, rate=None)
+    return time.perf_counter() - start, sum(s["tasks"] for s in stats), sum(s["products"] for s in stats)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del crawl repartido con varios workers")
+    parser.add_argument("--tasks", type=int, default=80, help="páginas en total (múltiplo de 10)")
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--latency", type=float, default=0.2, help="segundos que tarda el servidor en responder")
+    parser.add_argument("--fixtures", default="listing_medium.html,listing_small.html")
+    args = parser.parse_args(argv)
+
+    for name in args.fixtures.split(","):
+        with open(os.path.join(FIXTURES_DIR, name.strip()), "rb") as f:
+            SlowHandler.pages.append(f.read())
+    SlowHandler.latency = args.latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    config = dict(NIKE_CONFIG, search_url=f"http://127.0.0.1:{server.server_address[1]}/w", size_param=None)
+
+    print(f"{os.cpu_count()} núcleos · {args.tasks} páginas · latencia {args.latency * 1000:.0f} ms")
+    print(f"{'workers':>7} {'tareas':>7} {'productos':>9} {'segundos':>9} {'págs/s':>8} {'speedup':>8}")
+    base = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in (int(n) for n in args.workers.split(",")):
+            elapsed, tasks, products = run(config, os.path.join(tmp, f"queue{workers}.sqlite"), args.tasks, workers)
+            rate = tasks / elapsed
+            base = base or rate
+            print(f"{workers:>7} {tasks:>7} {products:>9} {elapsed:>9.2f} {rate:>8.1f} {rate / base:>8.2f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
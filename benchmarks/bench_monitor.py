@@ -0,0 +1,78 @@
+# CPU de parseo ahorrada por ChangeMonitor en un conjunto de páginas casi estático:
+# se vigilan N páginas, se cambia el precio de unas pocas tarjetas y se vuelve a pasar.
+#
+#   python benchmarks/bench_monitor.py [--pages 10] [--changed 3] [--parser bs4]
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from make_fixtures import make_page  # noqa: E402
+from monitor import ChangeMonitor  # noqa: E402
+from Scraper import NIKE_CONFIG, CachedResponse, ZapatillasScraper  # noqa: E402
+
+
+class FixtureHttp:
+    # Sirve las páginas de self.pages como si fueran nike.com/es/w?page=N
+    def __init__(self, pages):
+        self.pages = pages
+
+    def get(self, url, params=None, **kwargs):
+        html = self.pages.get(int(params["page"]), "<html><body></body></html>")
+        return CachedResponse(200, html.encode("utf-8"), url=url)
+
+
+def change_prices(html, count):
+    # Sube 1 € el precio de las primeras `count` tarjetas
+    def bump(match):
+        bump.left -= 1
+        return f'data-testid="product-price">{int(match.group(1)) + 1},{match.group(2)}' if bump.left >= 0 else match.group(0)
+    bump.left = count
+    return re.sub(r'data-testid="product-price">(\d+),(\d+)', bump, html)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del modo de vigilancia")
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--changed", type=int, default=3, help="tarjetas modificadas entre pasadas")
+    parser.add_argument("--parser", default="bs4")
+    args = parser.parse_args(argv)
+
+    pages = {n: make_page(100 + n, 24) for n in range(1, args.pages + 1)}
+    http = FixtureHttp(pages)
+    scraper = ZapatillasScraper(NIKE_CONFIG, http=http, rate=None, parser=args.parser)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        monitor = ChangeMonitor(scraper, os.path.join(tmp, "state.json"))
+        list(monitor.check("air max", max_pages=args.pages))
+
+        pages[2] = change_prices(pages[2], args.changed)
+
+        started = time.process_time()
+        for page in pages.values():
+            scraper.parse_products(page)
+        full_cpu = time.process_time() - started
+
+        monitor.stats = monitor._empty_stats()
+        started = time.process_time()
+        events = list(monitor.check("air max", max_pages=args.pages))
+        monitor_cpu = time.process_time() - started
+
+    stats = monitor.stats
+    print(f"páginas: {stats['pages']} (sin cambios: {stats['pages_unchanged']})")
+    print(f"tarjetas: {stats['cards']} (reutilizadas: {stats['cards_reused']}, parseadas: {stats['cards_parsed']})")
+    print(f"eventos: {len(events)} ({', '.join(sorted({e['type'] for e in events})) or '-'})")
+    print(f"CPU parseo completo: {full_cpu * 1000:.1f} ms")
+    print(f"CPU vigilancia:      {monitor_cpu * 1000:.1f} ms (parseo {stats['parse_seconds'] * 1000:.1f} ms)")
+    if monitor_cpu:
+        print(f"ahorro: {(1 - monitor_cpu / full_cpu) * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# Rendimiento del parseo en procesos (pipeline.ParallelSearch) frente a iter_search en un
+# solo hilo, reproduciendo páginas de benchmarks/fixtures sin red. Con N núcleos libres,
+# las páginas por segundo deberían crecer casi linealmente hasta N procesos.
+#
+#   python benchmarks/bench_parallel.py [--pages 60] [--workers 1,2,4,8] [--batch 4]
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from Scraper import NIKE_CONFIG, ZapatillasScraper  # noqa: E402
+from pipeline import ParallelSearch  # noqa: E402
+
+FIXTURES_DIR = os.path.join(ROOT, "benchmarks", "fixtures")
+
+
+class FixtureResponse:
+    def __init__(self, content):
+        self.status_code = 200
+        self.content = content
+        self.encoding = "utf-8"
+        self.headers = {}
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding)
+
+
+class FixtureHTTP:
+    # Las páginas 1..count rotan entre las fixtures; la siguiente viene vacía
+    def __init__(self, pages, count):
+        self.pages = pages
+        self.count = count
+
+    def get(self, url, params=None, headers=None, **kwargs):
+        page = params["page"]
+        if page > self.count:
+            return FixtureResponse(b"<html><body></body></html>")
+        return FixtureResponse(self.pages[page % len(self.pages)])
+
+
+def run(search, pages):
+    start = time.perf_counter()
+    count = sum(1 for _ in search.iter_search("Air Max", max_pages=pages + 1, concurrency=4))
+    return time.perf_counter() - start, count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del parseo en varios procesos")
+    parser.add_argument("--pages", type=int, default=60)
+    parser.add_argument("--fixtures", default="listing_large.html,listing_medium.html")
+    parser.add_argument("--workers", default=",".join(str(n) for n in (1, 2, 4, 8) if n <= (os.cpu_count() or 1)) or "1")
+    parser.add_argument("--batch", type=int, default=4)
+    parser.add_argument("--parser", default="bs4")
+    args = parser.parse_args(argv)
+
+    pages = []
+    for name in args.fixtures.split(","):
+        with open(os.path.join(FIXTURES_DIR, name.strip()), "rb") as f:
+            pages.append(f.read())
+    http = FixtureHTTP(pages, args.pages)
+    config = dict(NIKE_CONFIG, size_param=None)
+
+    print(f"{os.cpu_count()} núcleos · {args.pages} páginas · motor {args.parser}")
+    print(f"{'modo':<14} {'productos':>9} {'segundos':>9} {'págs/s':>8} {'speedup':>8}")
+    elapsed, count = run(ZapatillasScraper(config, http=http, rate=None, parser=args.parser), args.pages)
+    base = elapsed
+    print(f"{'un hilo':<14} {count:>9} {elapsed:>9.2f} {args.pages / elapsed:>8.1f} {1.0:>8.2f}")
+
+    for workers in (int(n) for n in args.workers.split(",")):
+        scraper = ZapatillasScraper(config, http=http, rate=None, parser=args.parser)
+        with ParallelSearch(scraper, workers=workers, batch_size=args.batch) as search:
+            elapsed, count = run(search, args.pages)
+        name = f"{workers} proceso{'s' if workers > 1 else ''}"
+        print(f"{name:<14} {count:>9} {elapsed:>9.2f} {args.pages / elapsed:>8.1f} {base / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# Compara los motores de parseo sobre las páginas guardadas en benchmarks/fixtures:
+# tiempo por página (mediana) y pico de memoria Python durante un parseo (tracemalloc;
+# la memoria interna de libxml2 no aparece aquí).
+#
+#   python benchmarks/bench_parsers.py [--repeat 20] [--engines bs4,lxml]
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from Scraper import NIKE_CONFIG, PARSER_ENGINES, ZapatillasScraper  # noqa: E402
+
+FIXTURES_DIR = os.path.join(ROOT, "benchmarks", "fixtures")
+
+
+def load_fixtures():
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "listing_*.html"))):
+        with open(path, "rb") as f:
+            pages[os.path.basename(path)] = f.read().decode("utf-8")
+    return pages
+
+
+def time_page(scraper, html, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        scraper.parse_products(html)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def measure_allocations(scraper, html):
+    tracemalloc.start()
+    scraper.parse_products(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de motores de parseo")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--engines", default=",".join(PARSER_ENGINES))
+    args = parser.parse_args(argv)
+
+    pages = load_fixtures()
+    if not pages:
+        sys.exit("No hay fixtures; ejecuta benchmarks/make_fixtures.py")
+
+    print(f"{'motor':<6} {'página':<22} {'productos':>9} {'ms/página':>10} {'pico KiB':>9}")
+    for name in args.engines.split(","):
+        try:
+            scraper = ZapatillasScraper(NIKE_CONFIG, http=object(), parser=name)
+        except RuntimeError as e:
+            print(f"{name:<6} omitido: {e}")
+            continue
+        for page_name, html in pages.items():
+            products = scraper.parse_products(html) or []
+            median = time_page(scraper, html, args.repeat)
+            peak = measure_allocations(scraper, html)
+            print(f"{name:<6} {page_name:<22} {len(products):>9} {median * 1000:>10.2f} {peak / 1024:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
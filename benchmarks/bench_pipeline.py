@@ -0,0 +1,272 @@
+# Mide por separado cada etapa de ZapatillasScraper.search sobre las páginas de
+# benchmarks/fixtures, servidas por un servidor HTTP local (nada sale a la red):
+#
+#   fetch        descarga de cada página desde el stub (Session con keep-alive)
+#   soup         construcción de BeautifulSoup
+#   select       selector de tarjeta y selectores de campo (extract_card)
+#   parse_price  parse_price sobre el texto de cada precio, con la lru_cache de los textos
+#                vaciada en cada repetición: mide el parseo, no los aciertos de la caché
+#   filter       filtros de precio máximo y tallas (ProductFilter.mask)
+#   build        armado de los productos y ResultStore.extend
+#   search       search() completo, de principio a fin
+#   export_csv   export_to_csv de todos los resultados
+#   tree         llenado de CustomTree (se omite si no hay display)
+#
+# La salida es JSON (mediana y mínimo en ms por etapa). Con --baseline se compara con
+# una ejecución guardada y el proceso termina con código 1 si alguna etapa empeora más
+# del umbral. Las líneas base dependen de la máquina: genera la tuya con --save.
+#
+#   python benchmarks/bench_pipeline.py --save benchmarks/baseline.json
+#   python benchmarks/bench_pipeline.py --baseline benchmarks/baseline.json --threshold 0.25
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from Scraper import NIKE_CONFIG, ResultStore, ZapatillasScraper, _parse_price_text  # noqa: E402
+
+FIXTURES_DIR = os.path.join(ROOT, "fixtures")
+STAGES = ("fetch", "soup", "select", "parse_price", "filter", "build", "search", "export_csv", "tree")
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    # /w?page=N devuelve la página N de la lista; después, la página vacía (fin de resultados)
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # cabeceras y cuerpo van en dos write(); sin esto, +40 ms por página
+    pages = []
+    empty = b""
+
+    def do_GET(self):
+        query = parse_qs(urlsplit(self.path).query)
+        page = int(query.get("page", ["1"])[0])
+        body = self.pages[page - 1] if 0 < page <= len(self.pages) else self.empty
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(pages):
+    def read(name):
+        with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+            return f.read()
+
+    FixtureHandler.pages = [read(name) for name in pages]
+    FixtureHandler.empty = read("listing_empty.html")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def measure(func, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return {"median_ms": statistics.median(timings) * 1000, "min_ms": min(timings) * 1000}, result
+
+
+def run_tree(rows, repeat):
+    try:
+        import tkinter as tk
+        from gui import CustomTree
+        root = tk.Tk()
+    except Exception as e:  # sin display, sin Tk o sin Pillow
+        return {"skipped": str(e).splitlines()[0] if str(e) else type(e).__name__}
+    root.geometry("950x700")
+    values = [(r["title"], r["price"], r["available_sizes"], r["product_url"]) for r in rows]
+
+    def fill():
+        frame = tk.Frame(root)
+        frame.pack(fill=tk.BOTH, expand=True)
+        tree = CustomTree(frame, virtual=True, columns=("Título", "Precio", "Tallas", "Enlace"), show="headings")
+        tree.pack(fill=tk.BOTH, expand=True)
+        tree.append_rows(values)
+        root.update()
+        frame.destroy()
+
+    try:
+        stats, _ = measure(fill, repeat)
+    finally:
+        root.destroy()
+    stats["items"] = len(values)
+    return stats
+
+
+def run(args):
+    pages = [name.strip() for name in args.pages.split(",")]
+    server = start_server(pages)
+    config = dict(NIKE_CONFIG, search_url=f"http://127.0.0.1:{server.server_address[1]}/w", size_param=None)
+    scraper = ZapatillasScraper(config, rate=None, parser="bs4")
+    engine = scraper.parser
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    results = {}
+
+    try:
+        scraper.fetch_page(args.query, 1)  # abre la conexión antes de medir
+        stats, responses = measure(
+            lambda: [scraper.fetch_page(args.query, page) for page in range(1, len(pages) + 1)], args.repeat
+        )
+        results["fetch"] = dict(stats, items=len(responses))
+        html = [response.text for response in responses]
+
+        stats, soups = measure(lambda: [BeautifulSoup(text, "html.parser") for text in html], args.repeat)
+        results["soup"] = dict(stats, items=len(soups))
+
+        cards = [card for soup in soups for card in engine.product.select(soup)]
+        stats, extracted = measure(
+            lambda: [engine.extract_card(card) for soup in soups for card in engine.product.select(soup)],
+            args.repeat
+        )
+        results["select"] = dict(stats, items=len(cards))
+
+        def parse_prices():
+            _parse_price_text.cache_clear()
+            return [scraper.parse_price(card["price"]) for card in extracted]
+
+        stats, prices = measure(parse_prices, args.repeat)
+        results["parse_price"] = dict(stats, items=len(prices))
+
+        filters = scraper.make_filter(args.max_price, sizes)
+        stats, kept = measure(
+            lambda: [card for card, keep in zip(extracted, filters.mask(extracted, prices)) if keep],
+            args.repeat
+        )
+        results["filter"] = dict(stats, items=len(kept))
+
+        def build():
+            store = ResultStore(scraper.parse_price)
+            store.extend(scraper.build_product(card) for card in kept)
+            return store
+
+        stats, store = measure(build, args.repeat)
+        results["build"] = dict(stats, items=len(store))
+
+        stats, found = measure(
+            lambda: scraper.search(args.query, max_pages=len(pages) + 1, max_price=args.max_price, sizes=sizes),
+            args.repeat
+        )
+        results["search"] = dict(stats, items=len(found))
+
+        # El CSV y el árbol se miden con un volumen fijo de filas, repitiendo los resultados
+        rows = [row for _ in range(-(-args.rows // max(len(found), 1))) for row in found][:args.rows]
+        scraper.results = ResultStore(scraper.parse_price)
+        scraper.results.extend(dict(row) for row in rows)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bench.csv")
+            stats, _ = measure(lambda: scraper.export_to_csv(path), args.repeat)
+        results["export_csv"] = dict(stats, items=len(scraper.results))
+
+        results["tree"] = run_tree(rows, args.repeat) if not args.no_tree else {"skipped": "--no-tree"}
+    finally:
+        scraper.close()
+        server.shutdown()
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pages": pages,
+            "repeat": args.repeat,
+            "rows": args.rows,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S")
+        },
+        "stages": results
+    }
+
+
+def compare(report, baseline, threshold, min_ms, metric="min_ms"):
+    # Una etapa empeora si su tiempo supera el de la línea base en más de `threshold`
+    # (o del umbral propio de la etapa en baseline["thresholds"]) y en más de min_ms.
+    # Por defecto se compara el mínimo, que es lo menos sensible al ruido de la máquina.
+    thresholds = baseline.get("thresholds", {})
+    regressions = []
+    lines = []
+    for stage in STAGES:
+        current = report["stages"].get(stage, {})
+        previous = baseline.get("stages", {}).get(stage, {})
+        if metric not in current or metric not in previous:
+            continue
+        limit = thresholds.get(stage, threshold)
+        ratio = current[metric] / previous[metric] if previous[metric] else 1.0
+        regressed = ratio > 1 + limit and current[metric] - previous[metric] > min_ms
+        lines.append(f"{'❌' if regressed else '✅'} {stage:<12} {previous[metric]:>9.2f} -> "
+                     f"{current[metric]:>9.2f} ms ({(ratio - 1) * 100:+.0f}%, límite +{limit * 100:.0f}%)")
+        if regressed:
+            regressions.append(stage)
+    return regressions, lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark por etapas del pipeline de búsqueda")
+    parser.add_argument("--pages", default="listing_small.html,listing_medium.html,listing_large.html",
+                        help="fixtures servidas como páginas 1, 2, 3...")
+    parser.add_argument("--query", default="Air Max")
+    parser.add_argument("--max-price", type=float, default=150)
+    parser.add_argument("--sizes", default="", help="tallas para el filtro local, p. ej. 42,43")
+    parser.add_argument("--rows", type=int, default=5000, help="filas para export_csv y CustomTree")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--no-tree", action="store_true", help="no medir CustomTree")
+    parser.add_argument("-o", "--output", help="guardar el informe JSON en este fichero")
+    parser.add_argument("--save", help="guardar el informe como nueva línea base")
+    parser.add_argument("--baseline", help="línea base JSON con la que comparar")
+    parser.add_argument("--threshold", type=float, default=0.25, help="empeoramiento máximo permitido (0.25 = 25%%)")
+    parser.add_argument("--metric", choices=("min_ms", "median_ms"), default="min_ms", help="tiempo que se compara")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="diferencias menores se ignoran (ruido)")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    report = run(args)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.save:
+        # Los umbrales por etapa se eligen a mano: la nueva línea base conserva los del
+        # fichero que sustituye (o los de --baseline si es un fichero nuevo)
+        saved = baseline
+        if os.path.exists(args.save):
+            with open(args.save, encoding="utf-8") as f:
+                saved = json.load(f)
+        thresholds = (saved or {}).get("thresholds")
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(dict(report, thresholds=thresholds) if thresholds else report, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+    if baseline is not None:
+        regressions, lines = compare(report, baseline, args.threshold, args.min_ms, args.metric)
+        print("\n".join(lines), file=sys.stderr)
+        if regressions:
+            print(f"Etapas más lentas que la línea base: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+# Consultas locales (ResultIndex) sobre resultados sintéticos: lo que tarda la interfaz
+# en filtrar por texto, precio y tallas y en ordenar por columna sin tocar la red.
+#
+#   python benchmarks/bench_query.py [--rows 50000] [--repeat 5]
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from Scraper import ResultIndex, ResultStore, parse_price  # noqa: E402
+
+MODELS = ("Air Max 90", "Air Max Plus", "Air Force 1", "Dunk Low", "Pegasus 41", "Vomero 18", "Cortez",
+          "Blazer Mid", "Air Jordan 1", "Invincible 3", "Zoom Fly", "Killshot 2", "Court Vision")
+EDITIONS = ("", "SE", "Premium", "Retro", "GORE-TEX", "Next Nature", "EasyOn", "Niño/a")
+SIZES = ("38.5", "39", "40", "40.5", "41", "42", "42.5", "43", "44", "44.5", "45", "46")
+
+QUERIES = {
+    "texto": dict(text="air max"),
+    "texto_prefijo": dict(text="pe"),
+    "precio": dict(min_price=80, max_price=140),
+    "tallas": dict(sizes=["42", "43"]),
+    "combinada": dict(text="air", max_price=150, sizes=["42"]),
+    "orden_precio": dict(sort="price"),
+    "orden_titulo_desc": dict(sort="title", descending=True),
+    "combinada_ordenada": dict(text="dunk", min_price=60, sort="price")
+}
+
+
+def build_store(rows, seed=1):
+    rng = random.Random(seed)
+    store = ResultStore(parse_price)
+    for index in range(rows):
+        title = f"Nike {rng.choice(MODELS)} {rng.choice(EDITIONS)}".strip()
+        sizes = ", ".join(sorted(rng.sample(SIZES, rng.randint(0, 6)), key=float)) or "No especificado"
+        store.append({
+            "title": title,
+            "price": f"{rng.randint(40, 220)},{rng.choice(('00', '99'))}\xa0€",
+            "image_url": f"https://static.nike.com/a/images/{index}.png",
+            "product_url": f"https://www.nike.com/es/t/producto-{index}",
+            "store": "nike",
+            "available_sizes": sizes,
+            "subtitle": ""
+        })
+    return store
+
+
+def measure(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de las consultas locales sobre los resultados")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    store = build_store(args.rows)
+    index = ResultIndex(store)
+    elapsed, _ = measure(lambda: (index.clear(), index.update()), 1)
+    print(f"{args.rows} filas · índice en {elapsed:.1f} ms")
+    print(f"{'consulta':<20} {'filas':>7} {'primera ms':>11} {'después ms':>11}")
+    for name, query in QUERIES.items():
+        index._orders.clear()
+        first, rows = measure(lambda: index.query(**query), 1)
+        warm, _ = measure(lambda: index.query(**query), args.repeat)
+        print(f"{name:<20} {len(rows):>7} {first:>11.1f} {warm:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
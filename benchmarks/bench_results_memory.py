@@ -0,0 +1,77 @@
+# Memoria de N productos guardados como lista de dicts (formato anterior) frente a ResultStore.
+# Cada fila usa cadenas nuevas, como las que salen del parser en una búsqueda real.
+#
+#   python benchmarks/bench_results_memory.py [--rows 100000]
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from make_fixtures import MODELS, SIZES, slugify  # noqa: E402
+from Scraper import NIKE_CONFIG, ResultStore, ZapatillasScraper  # noqa: E402
+
+
+def fresh(text):
+    # Copia real de la cadena (los literales y f-strings triviales reutilizan el objeto)
+    return (text + " ")[:-1]
+
+
+def synthetic_products(count, seed=0):
+    rng = random.Random(seed)
+    prices = ["59,99\xa0€", "89,99\xa0€", "119,99\xa0€", "149,99\xa0€", "189,99\xa0€"]
+    for i in range(count):
+        model = rng.choice(MODELS)
+        sizes = ", ".join(sorted(rng.sample(SIZES, 3), key=float)) if rng.random() < 0.4 else "No especificado"
+        yield {
+            "title": fresh(model),
+            "price": fresh(rng.choice(prices)),
+            "image_url": f"https://static.nike.com/a/images/c_limit,w_592,f_auto/t_product_v1/{rng.getrandbits(64):016x}/{slugify(model)}.png",
+            "product_url": f"https://www.nike.com/es/t/{slugify(model)}-zapatillas-{i}/DM{i:06d}-100",
+            "store": fresh("nike"),
+            "available_sizes": fresh(sizes)
+        }
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    container = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return container, current, elapsed
+
+
+def build_dicts(count):
+    return list(synthetic_products(count))
+
+
+def build_store(count):
+    store = ResultStore(ZapatillasScraper(NIKE_CONFIG, http=object()).parse_price)
+    store.extend(synthetic_products(count))
+    return store
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de memoria de resultados")
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    print(f"{'formato':<14} {'filas':>8} {'MiB':>8} {'bytes/fila':>11} {'segundos':>9}")
+    for name, build in (("lista de dicts", build_dicts), ("ResultStore", build_store)):
+        container, current, elapsed = measure(lambda: build(args.rows))
+        print(f"{name:<14} {len(container):>8} {current / 2 ** 20:>8.1f} {current / args.rows:>11.0f} {elapsed:>9.2f}")
+        del container
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# Llena CustomTree con productos sintéticos en modo clásico (un insert por fila)
+# y en modo virtual (append_rows en bloque), y mide tiempo y memoria.
+# Necesita un display (en Linux sin escritorio: xvfb-run python benchmarks/bench_tree.py).
+#
+#   python benchmarks/bench_tree.py [--rows 50000] [--batch 500]
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import tkinter as tk  # noqa: E402
+
+from gui import CustomTree  # noqa: E402
+
+COLUMNS = ("Título", "Precio", "Tallas", "Enlace")
+
+
+def synthetic_rows(count):
+    return [
+        (f"Nike Air Max {i}", f"{100 + i % 90},99 €", "40, 41, 42, 43",
+         f"https://www.nike.com/es/t/air-max-{i}/DM{i:06d}-100")
+        for i in range(count)
+    ]
+
+
+def rss_kib():
+    # Memoria residente del proceso (incluye los items de Tk, que tracemalloc no ve)
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def fill(root, virtual, rows, batch):
+    frame = tk.Frame(root)
+    frame.pack(fill=tk.BOTH, expand=True)
+    tree = CustomTree(frame, virtual=virtual, columns=COLUMNS, show="headings", height=15)
+    tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    root.update()
+
+    gc.collect()
+    rss_before = rss_kib()
+    tracemalloc.start()
+    start = time.perf_counter()
+    # Igual que la App: las filas llegan por lotes y se pinta entre lote y lote
+    for i in range(0, len(rows), batch):
+        tree.append_rows(rows[i:i + batch])
+        root.update_idletasks()
+    root.update()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = rss_kib()
+
+    items = len(tree.get_children())
+    frame.destroy()
+    root.update()
+    rss_delta = rss_after - rss_before if rss_before is not None else None
+    return elapsed, items, peak, rss_delta
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de llenado de CustomTree")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        sys.exit(f"No hay display disponible: {e}")
+    root.geometry("950x700")
+
+    rows = synthetic_rows(args.rows)
+    print(f"{'modo':<8} {'filas':>7} {'items Tk':>9} {'segundos':>9} {'pico py KiB':>12} {'Δ RSS KiB':>10}")
+    for name, virtual in (("virtual", True), ("clásico", False)):
+        elapsed, items, peak, rss_delta = fill(root, virtual, rows, args.batch)
+        rss = f"{rss_delta:>10}" if rss_delta is not None else f"{'n/d':>10}"
+        print(f"{name:<8} {args.rows:>7} {items:>9} {elapsed:>9.2f} {peak / 1024:>12.0f} {rss}")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# Genera páginas de listado con el mismo marcado que nike.com/es/w para los benchmarks.
+# Son deterministas (semilla fija), así que los resultados se pueden comparar entre ejecuciones.
+import json
+import os
+import random
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+MODELS = [
+    "Nike Air Max 90", "Nike Air Max 97", "Nike Air Max Plus", "Nike Air Force 1 '07",
+    "Nike Dunk Low Retro", "Air Jordan 1 Mid", "Air Jordan 4 Retro", "Nike Pegasus 41",
+    "Nike Vomero 5", "Nike P-6000", "Nike Cortez", "Nike Blazer Mid '77", "Nike Invincible 3",
+    "Nike Zoom Fly 6", "Nike Air Max Dn", "Nike V2K Run", "Nocta Glide", "Nike Killshot 2"
+]
+SUBTITLES = ["Zapatillas - Hombre", "Zapatillas - Mujer", "Zapatillas - Niño/a", "Zapatillas de running - Hombre",
+             "Zapatillas de running - Mujer", "Zapatillas de baloncesto"]
+SIZES = ["38", "38.5", "39", "40", "40.5", "41", "42", "42.5", "43", "44", "44.5", "45", "46"]
+
+
+def slugify(text):
+    return "".join(c if c.isalnum() else "-" for c in text.lower()).strip("-")
+
+
+def eur(value):
+    return f"{value:.2f}".replace(".", ",") + "&nbsp;€"
+
+
+def make_card(rng, position, collect=None):
+    # Con collect se añade también el producto tal y como aparece en __NEXT_DATA__
+    title = rng.choice(MODELS)
+    code = f"{rng.choice('ABCDEFHJ')}{rng.choice('DFHQVZ')}{rng.randint(1000, 9999)}-{rng.randint(1, 699):03d}"
+    url = f"https://www.nike.com/es/t/{slugify(title)}-zapatillas-{rng.randint(10000, 99999)}/{code}"
+    image = f"https://static.nike.com/a/images/c_limit,w_592,f_auto/t_product_v1/{rng.getrandbits(64):016x}/{slugify(title)}.png"
+    price = rng.choice([59.99, 79.99, 89.99, 99.99, 109.99, 119.99, 129.99, 139.99, 149.99, 169.99, 189.99, 209.99])
+    price_html = f'<div class="product-price is--current-price css-11s12ax" data-testid="product-price">{eur(price)}</div>'
+    reduced = None
+    if rng.random() < 0.3:
+        reduced = round(price * rng.choice([0.6, 0.7, 0.75, 0.8]), 2)
+        price_html = (
+            f'<div class="product-price is--current-price css-s56yt7" data-testid="product-price-reduced">{eur(reduced)}</div>'
+            + f'<div class="product-price es__styling is--striked-out css-0" data-testid="product-price">{eur(price)}</div>'
+        )
+    sizes_html = ""
+    sizes = []
+    if rng.random() < 0.4:
+        sizes = sorted(rng.sample(SIZES, rng.randint(2, 8)), key=float)
+        sizes_html = '<div class="product-card__available-sizes">' + "".join(
+            f'<span class="size">{s}</span>' for s in sizes
+        ) + "</div>"
+    colours = rng.randint(1, 6)
+    subtitle = rng.choice(SUBTITLES)
+    if collect is not None:
+        current = reduced if reduced is not None else price
+        collect.append({
+            "productCode": code,
+            "copy": {"title": title, "subTitle": subtitle},
+            "prices": {
+                "currency": "EUR",
+                "currentPrice": current,
+                "initialPrice": price,
+                "discountPercentage": round((1 - current / price) * 100)
+            },
+            "colorwayImages": {"portraitURL": image, "squarishURL": image},
+            "pdpUrl": {"url": url},
+            "displayColors": {"colorDescription": f"{colours} colores"},
+            "availableSizes": sizes
+        })
+    return f'''<div class="product-card product-grid__card css-1t0asop" data-product-position="{position}">
+  <div class="product-card__body" data-el-type="Card">
+    <figure>
+      <a class="product-card__link-overlay" href="{url}" data-testid="product-card__link-overlay">{title}</a>
+      <a class="product-card__img-link-overlay" href="{url}" aria-label="{title}" data-testid="product-card__img-link-overlay">
+        <div class="wall-image-loader css-1la3v4n"><img class="product-card__hero-image css-1fxh5tw" loading="lazy" src="{image}" alt="{title} {SUBTITLES[0]}"></div>
+      </a>
+      <div class="product-card__info disable-animations for--product">
+        <div class="product-card__titles">
+          <div class="product-card__title" id="{code}">{title}</div>
+          <div class="product-card__subtitle">{subtitle}</div>
+        </div>
+        <div class="product-card__count-wrapper"><div class="product-card__count-item"><div class="product-card__product-count"><span>{colours} {"color" if colours == 1 else "colores"}</span></div></div></div>
+        {sizes_html}
+        <div class="product-card__animation_wrapper"><div class="product-card__price-wrapper"><div class="product-price__wrapper css-9xqpgk">{price_html}</div></div></div>
+      </div>
+    </figure>
+  </div>
+</div>'''
+
+
+def make_page(seed, cards=24, next_data=False):
+    rng = random.Random(seed)
+    products = [] if next_data else None
+    grid = "\n".join(make_card(rng, i + 1, products) for i in range(cards))
+    script = ""
+    if next_data:
+        # Mismo esquema que el Wall de nike.com: productGroupings[].products[]
+        state = {"props": {"pageProps": {"initialState": {"Wall": {
+            "productGroupings": [{"products": [product]} for product in products],
+            "pageData": {"totalResources": cards}
+        }}}}, "page": "/[...slug]", "buildId": "fixture"}
+        data = json.dumps(state, ensure_ascii=False).replace("</", "<\\/")
+        script = f'\n<script id="__NEXT_DATA__" type="application/json">{data}</script>'
+    return f'''<!DOCTYPE html>
+<html lang="es"><head><meta charset="utf-8"><title>Zapatillas. Nike ES</title>
+<link rel="stylesheet" href="https://www.nike.com/static/wall.css"></head>
+<body><div id="__next"><header class="hf-header">Nike</header>
+<main class="wall-main"><section class="product-grid css-hvew4t"><div class="product-grid__items css-hvew4t" data-testid="product-grid-items">
+{grid}
+</div></section>
+<nav class="pagination"><a class="pagination__next" href="?page=2">Siguiente</a></nav></main>
+<footer class="hf-footer">© 2026 Nike, Inc.</footer></div>{script}</body></html>
+'''
+
+
+FIXTURES = {
+    "listing_small.html": (1, 24, False),
+    "listing_medium.html": (2, 60, False),
+    "listing_large.html": (3, 120, False),
+    "listing_empty.html": (4, 0, False),
+    "listing_nextdata.html": (5, 60, True)
+}
+
+
+def main():
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    for name, (seed, cards, next_data) in FIXTURES.items():
+        with open(os.path.join(FIXTURES_DIR, name), "w", encoding="utf-8") as f:
+            f.write(make_page(seed, cards, next_data))
+        print(f"{name}: {cards} tarjetas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+# Línea de comandos sin interfaz gráfica: no importa tkinter ni Pillow.
+#
+#   python cli.py "Air Max" --max-price 120 --sizes 42,43 --pages 2 -o air_max.csv
+#   python cli.py --jobs trabajos.json --timings
+#
+# Un fichero de trabajos es una lista JSON (o {"jobs": [...]}) de objetos con
+# "query" y, opcionalmente, "max_price", "min_price", "sizes", "gender", "category",
+# "pages" y "output".
+#
+# Con --stores se busca en varias tiendas a la vez (ficheros de stores/):
+#
+#   python cli.py "Air Max" --stores nike_es,nike_fr,nike_gb --max-price 150
+#
+# Con --checkpoint el progreso de cada búsqueda queda en un diario; si se corta, la misma
+# orden con --resume sigue desde la última página buena sin volver a pedir las anteriores.
+import time
+
+_START = time.perf_counter()
+
+import argparse  # noqa: E402
+from contextlib import nullcontext  # noqa: E402
+import json  # noqa: E402
+import sys  # noqa: E402
+
+from Scraper import NIKE_CONFIG, CrawlJournal, ProductFilter, ResponseCache, ZapatillasScraper  # noqa: E402
+
+# enrich, exporters, history, metrics, pipeline y stores se importan solo en las ramas que
+# los usan, para que una búsqueda sencilla no pague su arranque.
+# Los formatos son las claves de exporters.SINKS
+FORMATS = ("csv", "jsonl", "parquet", "sqlite")
+
+IMPORT_SECONDS = time.perf_counter() - _START
+
+
+def parse_sizes(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return [str(s).strip() for s in value if str(s).strip()]
+
+
+def load_jobs(path):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("jobs", [])
+    if not isinstance(data, list) or not all(isinstance(job, dict) and job.get("query") for job in data):
+        raise ValueError(f"{path}: se esperaba una lista de trabajos con 'query'")
+    return data
+
+
+def job_filters(job, args, max_price, sizes, make_filter=ProductFilter):
+    # Sin precio mínimo, género ni categoría basta con el filtro normal de max_price / sizes.
+    # make_filter: el del scraper, que deja fuera las tallas si la tienda ya las filtra
+    min_price = job.get("min_price", args.min_price)
+    gender = job.get("gender", args.gender)
+    category = job.get("category", args.category)
+    if not (min_price or gender or category):
+        return None
+    return make_filter(max_price=max_price, sizes=sizes, min_price=min_price, gender=gender, category=category)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Nike scraper sin interfaz gráfica")
+    parser.add_argument("query", nargs="*", help="términos de búsqueda (uno o varios)")
+    parser.add_argument("--jobs", help="fichero JSON con los trabajos a ejecutar")
+    parser.add_argument("--max-price", type=float, help="precio máximo en €")
+    parser.add_argument("--min-price", type=float, help="precio mínimo en €")
+    parser.add_argument("--sizes", default="", help="tallas separadas por comas, p. ej. 42,43")
+    parser.add_argument("--gender", help="hombre, mujer, niño/a o unisex (según el subtítulo del producto)")
+    parser.add_argument("--category", help="texto que debe aparecer en el subtítulo, p. ej. running")
+    parser.add_argument("--pages", type=int, default=1, help="páginas por búsqueda")
+    parser.add_argument("-o", "--output",
+                        help="fichero de salida .csv, .jsonl, .sqlite o .parquet (por defecto, CSV por la salida estándar)")
+    parser.add_argument("--format", choices=FORMATS, help="formato de salida si no se deduce de la extensión")
+    parser.add_argument("--stores",
+                        help="tiendas separadas por comas o 'all'; precios en € y tallas EU (por defecto, solo Nike ES)")
+    parser.add_argument("--stores-dir", help="carpeta con los ficheros JSON de tiendas (por defecto, stores/)")
+    parser.add_argument("--concurrency", type=int,
+                        help="páginas descargadas a la vez (por defecto 1, o 4 con --workers)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="procesos que parsean las páginas en paralelo (0 = en el mismo hilo)")
+    parser.add_argument("--parser", default="bs4", help="motor de parseo: bs4, lxml, json o auto")
+    parser.add_argument("--rate", type=float, default=1.0, help="peticiones por segundo iniciales")
+    parser.add_argument("--cache", help="fichero SQLite para la caché de respuestas")
+    parser.add_argument("--cache-ttl", type=int, default=3600, help="segundos de validez de la caché")
+    parser.add_argument("--offline", action="store_true", help="usar solo páginas de la caché")
+    parser.add_argument("--checkpoint", help="diario (JSON Lines) donde guardar el progreso de cada búsqueda")
+    parser.add_argument("--resume", action="store_true",
+                        help="con --checkpoint, seguir las búsquedas cortadas desde la última página buena")
+    parser.add_argument("--enrich", action="store_true",
+                        help="abrir la ficha de cada producto que pase los filtros (stock por talla, estilo, "
+                             "color, descuento); las tallas se filtran con ese stock")
+    parser.add_argument("--enrich-workers", type=int, default=4, help="fichas de producto pedidas a la vez")
+    parser.add_argument("--enrich-cache",
+                        help="fichero SQLite para la caché de fichas de producto (sin él, las fichas no se guardan)")
+    parser.add_argument("--enrich-ttl", type=int, default=6 * 3600,
+                        help="segundos de validez de la caché de fichas (solo con --enrich-cache)")
+    parser.add_argument("--history", help="fichero SQLite del histórico de precios donde guardar este crawl")
+    parser.add_argument("--timings", action="store_true",
+                        help="mostrar tiempos de importación y arranque y el reparto del tiempo de la búsqueda")
+    parser.add_argument("--metrics-json", help="guardar las métricas de la ejecución (por página) en JSON")
+    parser.add_argument("--metrics-prom", help="fichero .prom para el textfile collector de Prometheus")
+    parser.add_argument("--profile", help="guardar un perfil cProfile de la ejecución en PREFIJO.prof y PREFIJO.txt")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="con --profile, guardar también las reservas de memoria (tracemalloc) en PREFIJO.mem.txt")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no mostrar el progreso")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.offline and not args.cache:
+        print("--offline necesita --cache", file=sys.stderr)
+        return 2
+    if args.workers and args.stores:
+        print("--workers solo se puede usar con una tienda (sin --stores)", file=sys.stderr)
+        return 2
+    if args.enrich and args.stores:
+        print("--enrich solo se puede usar con una tienda (sin --stores)", file=sys.stderr)
+        return 2
+    if args.resume and not args.checkpoint:
+        print("--resume necesita --checkpoint", file=sys.stderr)
+        return 2
+    if args.checkpoint and args.workers:
+        print("--checkpoint no se puede usar con --workers", file=sys.stderr)
+        return 2
+
+    if args.jobs:
+        try:
+            jobs = load_jobs(args.jobs)
+        except (OSError, ValueError) as e:
+            print(f"No se pudo leer {args.jobs}: {e}", file=sys.stderr)
+            return 2
+    else:
+        jobs = [{"query": query} for query in args.query]
+    if not jobs:
+        print("Indica una búsqueda o un fichero --jobs", file=sys.stderr)
+        return 2
+
+    def log(message):
+        if not args.quiet:
+            print(message, file=sys.stderr)
+
+    cache = ResponseCache(args.cache, ttl=args.cache_ttl) if args.cache else None
+    metrics = None
+    if args.metrics_json or args.metrics_prom or args.timings:
+        from metrics import SearchMetrics
+        metrics = SearchMetrics()
+    scraper_kwargs = dict(rate=args.rate, cache=cache, offline=args.offline, parser=args.parser, metrics=metrics)
+    if args.stores:
+        from stores import STORES_DIR, MultiStoreSearch, StoreRegistry
+        try:
+            configs = StoreRegistry.default(args.stores_dir or STORES_DIR).select(args.stores)
+            scraper = MultiStoreSearch(configs, **scraper_kwargs)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 2
+    else:
+        scraper = ZapatillasScraper(NIKE_CONFIG, **scraper_kwargs)
+        if args.workers:
+            from pipeline import ParallelSearch
+            scraper = ParallelSearch(scraper, workers=args.workers)
+    # Con varias tiendas, MultiStoreSearch adapta el filtro a cada una (moneda, tallas)
+    make_filter = ProductFilter if args.stores else getattr(scraper, "scraper", scraper).make_filter
+    concurrency = args.concurrency or (4 if args.workers else 1)
+    enricher = None
+    sink_kwargs = {}
+    if args.enrich:
+        from enrich import ENRICH_FIELDS, ProductEnricher
+        from exporters import EXPORT_FIELDS
+        enrich_cache = ResponseCache(args.enrich_cache, ttl=args.enrich_ttl) if args.enrich_cache else None
+        enricher = ProductEnricher(getattr(scraper, "scraper", scraper), workers=args.enrich_workers,
+                                   cache=enrich_cache)
+        sink_kwargs["fields"] = EXPORT_FIELDS + ENRICH_FIELDS
+    journal = CrawlJournal(args.checkpoint) if args.checkpoint else None
+    resume = {"checkpoint": journal, "resume": args.resume} if journal else {}
+    startup_seconds = time.perf_counter() - _START
+
+    # Las filas se escriben según llegan; cada trabajo puede tener su propio fichero
+    from exporters import open_sink
+    shared_sink = None
+    failed = 0
+    profiler = nullcontext()
+    if args.profile:
+        from metrics import profile_run
+        profiler = profile_run(args.profile, memory=args.profile_memory)
+    history = history_writer = None
+    if args.history:
+        # Los productos se van dejando en el histórico según llegan; commit() al final
+        # guarda todo el crawl en una sola transacción
+        from history import PriceHistory
+        history = PriceHistory(args.history)
+        history_writer = history.writer()
+    with profiler:
+        for job in jobs:
+            query = job["query"]
+            started = time.perf_counter()
+            sink = None
+            count = 0
+            try:
+                # Un formato desconocido o una ruta sin permisos hace fallar solo este trabajo
+                if job.get("output"):
+                    sink = open_sink(job["output"], job.get("format"), **sink_kwargs)
+                else:
+                    if shared_sink is None:
+                        shared_sink = open_sink(args.output, args.format, **sink_kwargs)
+                    sink = shared_sink
+                max_price = job.get("max_price", args.max_price)
+                sizes = parse_sizes(job.get("sizes", args.sizes))
+                filters = job_filters(job, args, max_price, sizes, make_filter)
+                if enricher is not None:
+                    filters = enricher.listing_filter(max_price, filters)
+                products = scraper.iter_search(
+                    query,
+                    max_pages=int(job.get("pages", args.pages)),
+                    max_price=max_price,
+                    sizes=sizes,
+                    status_callback=log,
+                    concurrency=concurrency,
+                    filters=filters,
+                    **resume
+                )
+                if enricher is not None:
+                    products = enricher.iter_enrich(products, sizes)
+                for product in products:
+                    sink.write(product)
+                    count += 1
+                    if history_writer is not None:
+                        history_writer.add(product)
+            except Exception as e:
+                failed += 1
+                log(f"❌ {query}: {e}")
+            else:
+                sink.flush()
+                log(f"✅ {query}: {count} productos en {time.perf_counter() - started:.2f}s")
+            finally:
+                if sink is not None and sink is not shared_sink:
+                    sink.close()
+
+    if shared_sink is not None:
+        shared_sink.close()
+
+    if history is not None:
+        log(f"📈 Histórico: {history_writer.commit()} productos guardados en {args.history}")
+        history.close()
+
+    if enricher is not None:
+        enricher.close()
+        log(f"🔎 Fichas: {enricher.stats['enriched']} leídas, {enricher.stats['failed']} sin ficha, "
+            f"{enricher.stats['dropped']} descartadas por talla")
+    scraper.close()
+    if journal is not None:
+        journal.close()
+    if metrics is not None:
+        from metrics import JsonMetricsSink, PrometheusTextfileSink
+        sinks = []
+        if args.metrics_json:
+            sinks.append(JsonMetricsSink(args.metrics_json))
+        if args.metrics_prom:
+            sinks.append(PrometheusTextfileSink(args.metrics_prom))
+        metrics.write(*sinks)
+    if args.timings:
+        print(
+            f"⏱ importación {IMPORT_SECONDS * 1000:.0f} ms · arranque {startup_seconds * 1000:.0f} ms · "
+            f"total {(time.perf_counter() - _START):.2f} s",
+            file=sys.stderr
+        )
+        print(f"⏱ {metrics.describe()}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,392 @@
+# Crawl repartido entre procesos o máquinas. El coordinador convierte cada trabajo
+# (query, max_price, sizes, pages) en una tarea por página dentro de una cola durable;
+# los workers piden tareas con un lease (préstamo con caducidad), las scrapean y guardan
+# los productos en la misma transacción en la que cierran la tarea. Si un worker muere,
+# su lease caduca y la tarea vuelve a la cola; si falla, se reintenta con espera
+# creciente hasta max_attempts.
+#
+#   python distributed.py submit --queue crawl.sqlite --jobs trabajos.json
+#   python distributed.py worker --queue crawl.sqlite --processes 4     (en cada máquina)
+#   python distributed.py status --queue crawl.sqlite
+#   python distributed.py export --queue crawl.sqlite -o resultados.csv
+#
+# La cola por defecto es un fichero SQLite (WAL), válido para varios procesos de una
+# misma máquina o un disco compartido que respete los cerrojos; otro backend solo tiene
+# que implementar los métodos de TaskQueue y registrarse en QUEUE_BACKENDS.
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+
+from Scraper import NIKE_CONFIG, ZapatillasScraper
+from stores import STORES_DIR, StoreRegistry
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    query TEXT NOT NULL,
+    params TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    job_id INTEGER NOT NULL,
+    page INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL DEFAULT 0,
+    lease_until REAL,
+    worker TEXT,
+    token TEXT,
+    error TEXT,
+    products INTEGER,
+    finished REAL
+);
+CREATE INDEX IF NOT EXISTS tasks_ready ON tasks(status, available_at);
+CREATE INDEX IF NOT EXISTS tasks_job ON tasks(job_id, page);
+CREATE TABLE IF NOT EXISTS results (
+    task_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (task_id, position)
+) WITHOUT ROWID;
+"""
+
+STATUSES = ("pending", "leased", "done", "skipped", "failed")
+
+
+class TaskQueue(ABC):
+    # Interfaz de la cola. Una tarea es un dict con id, job_id, query, page, params,
+    # attempts y token (identifica el lease: solo quien lo tiene puede cerrarla)
+    @abstractmethod
+    def submit(self, jobs):
+        pass
+
+    @abstractmethod
+    def lease(self, worker, count=1):
+        pass
+
+    @abstractmethod
+    def complete(self, task, products, last_page=False):
+        pass
+
+    @abstractmethod
+    def fail(self, task, error):
+        pass
+
+    @abstractmethod
+    def counts(self):
+        pass
+
+    @abstractmethod
+    def iter_results(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class SqliteTaskQueue(TaskQueue):
+    def __init__(self, path="nike_queue.sqlite", lease_seconds=120, max_attempts=3, retry_backoff=5.0):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        # Cada proceso abre su propia conexión; el timeout cubre las esperas al cerrojo de escritura
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    def _transaction(self):
+        # BEGIN IMMEDIATE toma el cerrojo de escritura al empezar: dos workers no pueden
+        # leer la misma tarea libre y quedársela los dos
+        queue = self
+
+        class Transaction:
+            def __enter__(self):
+                queue._lock.acquire()
+                queue._db.execute("BEGIN IMMEDIATE")
+                return queue._db
+
+            def __exit__(self, exc_type, *exc):
+                try:
+                    queue._db.execute("ROLLBACK" if exc_type else "COMMIT")
+                finally:
+                    queue._lock.release()
+
+        return Transaction()
+
+    def submit(self, jobs):
+        # jobs: [{"query", "pages", "max_price", "sizes", ...}] -> una tarea por página
+        now = time.time()
+        created = 0
+        with self._transaction() as db:
+            for job in jobs:
+                params = {key: value for key, value in job.items() if key not in ("query", "pages")}
+                job_id = db.execute(
+                    "INSERT INTO jobs (query, params, created) VALUES (?, ?, ?)",
+                    (job["query"], json.dumps(params, ensure_ascii=False), now)
+                ).lastrowid
+                pages = int(job.get("pages", 1))
+                db.executemany("INSERT INTO tasks (job_id, page) VALUES (?, ?)",
+                               [(job_id, page) for page in range(1, pages + 1)])
+                created += pages
+        return created
+
+    def lease(self, worker, count=1):
+        now = time.time()
+        token = uuid.uuid4().hex
+        with self._transaction() as db:
+            # Leases caducados sin intentos restantes: la tarea se da por perdida
+            db.execute(
+                "UPDATE tasks SET status = 'failed', error = COALESCE(error, 'lease caducado'), finished = ? "
+                "WHERE status = 'leased' AND lease_until < ? AND attempts >= ?",
+                (now, now, self.max_attempts)
+            )
+            rows = db.execute(
+                "UPDATE tasks SET status = 'leased', worker = ?, token = ?, lease_until = ?, attempts = attempts + 1 "
+                "WHERE id IN (SELECT id FROM tasks WHERE (status = 'pending' AND available_at <= ?) "
+                "OR (status = 'leased' AND lease_until < ?) ORDER BY job_id, page LIMIT ?) "
+                "RETURNING id, job_id, page, attempts",
+                (worker, token, now + self.lease_seconds, now, now, count)
+            ).fetchall()
+            jobs = {}
+            for job_id in {row[1] for row in rows}:
+                query, params = db.execute("SELECT query, params FROM jobs WHERE id = ?", (job_id,)).fetchone()
+                jobs[job_id] = (query, json.loads(params))
+        return [
+            {"id": task_id, "job_id": job_id, "query": jobs[job_id][0], "params": jobs[job_id][1],
+             "page": page, "attempts": attempts, "token": token}
+            for task_id, job_id, page, attempts in sorted(rows, key=lambda row: (row[1], row[2]))
+        ]
+
+    def complete(self, task, products, last_page=False):
+        # Productos y cierre en la misma transacción: si el lease ya no es nuestro (caducó
+        # y otro worker la repitió) no se guarda nada, así que no hay filas duplicadas
+        now = time.time()
+        with self._transaction() as db:
+            updated = db.execute(
+                "UPDATE tasks SET status = 'done', products = ?, finished = ?, error = NULL "
+                "WHERE id = ? AND token = ? AND status = 'leased'",
+                (len(products), now, task["id"], task["token"])
+            ).rowcount
+            if updated != 1:
+                return False
+            db.executemany(
+                "INSERT OR REPLACE INTO results (task_id, position, data) VALUES (?, ?, ?)",
+                [(task["id"], position, json.dumps(dict(product), ensure_ascii=False))
+                 for position, product in enumerate(products)]
+            )
+            if last_page:
+                # Página sin productos: las siguientes de la misma búsqueda tampoco los tendrán
+                db.execute(
+                    "UPDATE tasks SET status = 'skipped', finished = ? "
+                    "WHERE job_id = ? AND page > ? AND status = 'pending'",
+                    (now, task["job_id"], task["page"])
+                )
+        return True
+
+    def fail(self, task, error):
+        now = time.time()
+        with self._transaction() as db:
+            retry = task["attempts"] < self.max_attempts
+            updated = db.execute(
+                "UPDATE tasks SET status = ?, available_at = ?, lease_until = NULL, error = ?, finished = ? "
+                "WHERE id = ? AND token = ? AND status = 'leased'",
+                ("pending" if retry else "failed", now + self.retry_backoff * 2 ** (task["attempts"] - 1),
+                 str(error), None if retry else now, task["id"], task["token"])
+            ).rowcount
+        return updated == 1
+
+    def counts(self):
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall()
+        counts = dict.fromkeys(STATUSES, 0)
+        counts.update(rows)
+        return counts
+
+    def unfinished(self):
+        counts = self.counts()
+        return counts["pending"] + counts["leased"]
+
+    def errors(self, limit=20):
+        with self._lock:
+            return self._db.execute(
+                "SELECT jobs.query, tasks.page, tasks.attempts, tasks.error FROM tasks JOIN jobs ON jobs.id = tasks.job_id "
+                "WHERE tasks.status = 'failed' ORDER BY tasks.id LIMIT ?", (limit,)
+            ).fetchall()
+
+    def iter_results(self, chunk_size=1000):
+        # En orden de trabajo y página, por bloques para no cargarlo todo en memoria
+        last = (-1, -1, -1)
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT tasks.job_id, tasks.page, results.position, results.data FROM results "
+                    "JOIN tasks ON tasks.id = results.task_id "
+                    "WHERE (tasks.job_id, tasks.page, results.position) > (?, ?, ?) "
+                    "ORDER BY tasks.job_id, tasks.page, results.position LIMIT ?",
+                    (*last, chunk_size)
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield json.loads(row[3])
+            last = rows[-1][:3]
+
+    def close(self):
+        self._db.close()
+
+
+QUEUE_BACKENDS = {"sqlite": SqliteTaskQueue}
+
+
+def open_queue(spec, **kwargs):
+    # "crawl.sqlite" o "sqlite:crawl.sqlite"; otros backends con "nombre:destino"
+    backend, sep, target = spec.partition(":")
+    if not sep or backend not in QUEUE_BACKENDS:
+        backend, target = "sqlite", spec
+    return QUEUE_BACKENDS[backend](target, **kwargs)
+
+
+class CrawlWorker:
+    def __init__(self, queue, scraper, worker_id=None, batch=1, poll=1.0):
+        self.queue = queue
+        self.scraper = scraper
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.batch = batch
+        self.poll = poll
+        self.stats = {"tasks": 0, "products": 0, "failed": 0, "lost": 0}
+
+    def run_task(self, task):
+        params = task["params"]
+        max_price = params.get("max_price")
+        sizes = params.get("sizes") or None
+        filters = None
+        if params.get("min_price") or params.get("gender") or params.get("category"):
+            filters = self.scraper.make_filter(max_price, sizes, min_price=params.get("min_price"),
+                                               gender=params.get("gender"), category=params.get("category"))
+        response = self.scraper.fetch_page(task["query"], task["page"], max_price, sizes)
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}")
+        cards = self.scraper.parser.cards(response.text)
+        products = list(self.scraper.iter_products(cards, max_price, sizes, filters=filters))
+        return products, not cards
+
+    def run(self, stop_event=None, exit_when_idle=True):
+        # Pide tareas hasta que no quede nada pendiente (o hasta stop_event)
+        while stop_event is None or not stop_event.is_set():
+            tasks = self.queue.lease(self.worker_id, self.batch)
+            if not tasks:
+                if exit_when_idle and not self.queue.unfinished():
+                    break
+                time.sleep(self.poll)
+                continue
+            for task in tasks:
+                try:
+                    products, last_page = self.run_task(task)
+                except Exception as e:
+                    self.stats["failed"] += 1
+                    self.queue.fail(task, e)
+                    continue
+                if self.queue.complete(task, products, last_page):
+                    self.stats["tasks"] += 1
+                    self.stats["products"] += len(products)
+                else:
+                    self.stats["lost"] += 1
+        return self.stats
+
+
+def _worker_process(spec, config, rate, parser, batch, queue_kwargs):
+    queue = open_queue(spec, **queue_kwargs)
+    scraper = ZapatillasScraper(config, rate=rate, parser=parser)
+    try:
+        return CrawlWorker(queue, scraper, batch=batch).run()
+    finally:
+        scraper.close()
+        queue.close()
+
+
+def run_workers(spec, processes, config=NIKE_CONFIG, rate=1.0, parser="bs4", batch=1, **queue_kwargs):
+    # N procesos worker en esta máquina; cada uno con su Session y su limitador
+    # (el ritmo total contra la tienda es processes × rate)
+    if processes <= 1:
+        return [_worker_process(spec, config, rate, parser, batch, queue_kwargs)]
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(processes) as pool:
+        return pool.starmap(_worker_process, [(spec, config, rate, parser, batch, queue_kwargs)] * processes)
+
+
+def main(argv=None):
+    from cli import load_jobs, parse_sizes
+    from exporters import SINKS, export_stream, open_sink
+
+    parser = argparse.ArgumentParser(description="Crawl repartido con una cola de tareas")
+    parser.add_argument("command", choices=("submit", "worker", "status", "export"))
+    parser.add_argument("--queue", default="nike_queue.sqlite", help="cola (fichero SQLite o backend:destino)")
+    parser.add_argument("--jobs", help="submit: fichero JSON de trabajos (mismo formato que cli.py)")
+    parser.add_argument("--processes", type=int, default=1, help="worker: procesos en esta máquina")
+    parser.add_argument("--batch", type=int, default=1, help="worker: tareas por lease")
+    parser.add_argument("--rate", type=float, default=1.0, help="worker: peticiones por segundo por proceso (0 = sin límite)")
+    parser.add_argument("--parser", default="bs4", help="worker: motor de parseo")
+    parser.add_argument("--store", default=NIKE_CONFIG["name"], help="worker: tienda a la que se piden las páginas")
+    parser.add_argument("--stores-dir", default=STORES_DIR, help="worker: carpeta con las tiendas en JSON")
+    parser.add_argument("--lease", type=float, default=120, help="segundos antes de dar una tarea por perdida")
+    parser.add_argument("--max-attempts", type=int, default=3, help="intentos por tarea")
+    parser.add_argument("-o", "--output", help="export: fichero de salida (por defecto, CSV por la salida estándar)")
+    parser.add_argument("--format", choices=sorted(SINKS), help="export: formato si no se deduce de la extensión")
+    args = parser.parse_args(argv)
+
+    queue_kwargs = {"lease_seconds": args.lease, "max_attempts": args.max_attempts}
+    if args.command == "worker":
+        try:
+            config = StoreRegistry.default(args.stores_dir).get(args.store)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 2
+        started = time.perf_counter()
+        stats = run_workers(args.queue, args.processes, config, rate=args.rate or None, parser=args.parser, batch=args.batch,
+                            **queue_kwargs)
+        tasks = sum(s["tasks"] for s in stats)
+        print(f"✅ {tasks} tareas, {sum(s['products'] for s in stats)} productos, "
+              f"{sum(s['failed'] for s in stats)} fallos en {time.perf_counter() - started:.1f}s", file=sys.stderr)
+        return 0
+
+    queue = open_queue(args.queue, **queue_kwargs)
+    try:
+        if args.command == "submit":
+            if not args.jobs:
+                print("submit necesita --jobs", file=sys.stderr)
+                return 2
+            try:
+                jobs = load_jobs(args.jobs)
+            except (OSError, ValueError) as e:
+                print(f"No se pudo leer {args.jobs}: {e}", file=sys.stderr)
+                return 2
+            for job in jobs:
+                job["sizes"] = parse_sizes(job.get("sizes", ""))
+            print(f"📥 {queue.submit(jobs)} tareas en cola ({len(jobs)} trabajos)", file=sys.stderr)
+        elif args.command == "status":
+            counts = queue.counts()
+            print(" · ".join(f"{status} {count}" for status, count in counts.items()))
+            for query, page, attempts, error in queue.errors():
+                print(f"❌ {query} p.{page} ({attempts} intentos): {error}")
+        elif args.command == "export":
+            count = export_stream(queue.iter_results(), open_sink(args.output, args.format))
+            print(f"💾 {count} productos exportados", file=sys.stderr)
+    finally:
+        queue.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
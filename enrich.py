@@ -0,0 +1,217 @@
+# Enriquecimiento con la ficha de producto (PDP): stock por talla, código de estilo,
+# color y precio completo / descuento. Las tarjetas del listado casi nunca traen las
+# tallas, así que el filtro de tallas solo es fiable después de este paso.
+#
+#   enricher = ProductEnricher(scraper, cache=ResponseCache("fichas.sqlite", ttl=6 * 3600))
+#   products = scraper.iter_search("Air Max", max_pages=5, filters=enricher.listing_filter(150))
+#   for product in enricher.iter_enrich(products, sizes=["42"]):
+#       print(product["style_code"], product["available_sizes"], product["discount"])
+#
+# Solo se piden fichas de los productos que ya han pasado los filtros baratos del listado
+# (precio, género, categoría), en un pool de hilos acotado y con su propia caché: el
+# coste crece con las coincidencias, no con los productos listados.
+import copy
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from bs4 import BeautifulSoup
+
+from Scraper import ProductFilter, get_parser_engine, normalize_size
+
+ENRICH_FIELDS = ("style_code", "colorway", "full_price", "discount", "sold_out_sizes")
+
+STYLE_CODE = re.compile(r"\b[A-Z0-9]{5,7}-\d{3}\b")
+SIZE_PREFIX = re.compile(r"^(?:EU|UK|US|M|W)\s*", re.IGNORECASE)
+PERCENT = re.compile(r"(\d+(?:[.,]\d+)?)\s*%")
+IN_STOCK = ("ACTIVE", "IN_STOCK", "LOW", "HIGH", "MEDIUM")
+
+
+def size_key(label):
+    # "EU 42" y "42" son la misma talla para comparar con las pedidas
+    return normalize_size(SIZE_PREFIX.sub("", str(label).strip()))
+
+
+class PdpParser:
+    # Primero el JSON incrustado (__NEXT_DATA__), que trae el stock de cada talla; si la
+    # página no lo tiene, los selectores pdp_* de la configuración de la tienda
+    def __init__(self, config):
+        self.config = config
+        self.next_data = get_parser_engine("json", config)
+
+    def parse(self, html):
+        data = self.next_data.payload(html)
+        product = self._find_product(data) if data is not None else None
+        if product is not None:
+            return self._from_json(product)
+        return self._from_html(html)
+
+    def _find_product(self, data):
+        if isinstance(data, dict):
+            if isinstance(data.get("styleColor"), str):
+                return data
+            values = data.values()
+        elif isinstance(data, list):
+            values = data
+        else:
+            return None
+        for value in values:
+            found = self._find_product(value)
+            if found is not None:
+                return found
+        return None
+
+    def _from_json(self, product):
+        prices = product.get("prices") or {}
+        currency = prices.get("currency")
+        current = prices.get("currentPrice")
+        initial = prices.get("initialPrice")
+        sizes = []
+        for size in product.get("sizes") or product.get("skus") or []:
+            if not isinstance(size, dict):
+                continue
+            label = size.get("localizedSize") or size.get("label") or size.get("size")
+            if label is None:
+                continue
+            available = size.get("available")
+            if not isinstance(available, bool):
+                available = str(size.get("status", "")).upper() in IN_STOCK
+            sizes.append((str(label), available))
+        discount = prices.get("discountPercentage")
+        if discount is None and current and initial and initial > current:
+            discount = round((1 - current / initial) * 100)
+        return {
+            "style_code": product["styleColor"],
+            "colorway": product.get("colorDescription"),
+            "price": self.next_data.format_price(current, currency) if current is not None else None,
+            "full_price": self.next_data.format_price(initial, currency) if initial is not None else None,
+            "discount": discount,
+            "sizes": sizes
+        }
+
+    def _select_text(self, soup, key):
+        selector = self.config.get(key)
+        node = soup.select_one(selector) if selector else None
+        return node.get_text(" ", strip=True) if node is not None else None
+
+    @staticmethod
+    def _after_label(text):
+        # "Mostrado: Blanco/Negro" -> "Blanco/Negro"
+        if text and ":" in text:
+            return text.split(":", 1)[1].strip() or None
+        return text
+
+    def _from_html(self, html):
+        soup = BeautifulSoup(html, "html.parser")
+        style = self._select_text(soup, "pdp_style_selector")
+        match = STYLE_CODE.search(style or "")
+        discount = self._select_text(soup, "pdp_discount_selector")
+        percent = PERCENT.search(discount or "")
+        sizes = []
+        selector = self.config.get("pdp_size_selector")
+        for node in soup.select(selector) if selector else []:
+            label = node.get("data-size") or node.get_text(" ", strip=True)
+            if not label:
+                continue
+            classes = " ".join(node.get("class") or ())
+            available = not (node.has_attr("disabled") or node.get("aria-disabled") == "true"
+                             or "unavailable" in classes or "disabled" in classes)
+            sizes.append((label, available))
+        return {
+            "style_code": match.group(0) if match else self._after_label(style),
+            "colorway": self._after_label(self._select_text(soup, "pdp_color_selector")),
+            "price": self._select_text(soup, "pdp_price_selector"),
+            "full_price": self._select_text(soup, "pdp_full_price_selector"),
+            "discount": round(float(percent.group(1).replace(",", "."))) if percent else None,
+            "sizes": sizes
+        }
+
+
+class ProductEnricher:
+    def __init__(self, scraper, workers=4, cache=None, timeout=15, max_pending=None):
+        self.scraper = scraper
+        self.parser = PdpParser(scraper.config)
+        # Caché propia: las fichas cambian menos que los listados y admiten otro TTL. Sin
+        # ella las fichas no se guardan (tampoco en la caché de los listados, que no llenan)
+        self.cache = cache if cache is not None else False
+        self.timeout = timeout
+        self.workers = workers
+        # Fichas pedidas y aún sin devolver: acota la memoria y lo que se pide de más
+        self.max_pending = max_pending or workers * 2
+        self.stats = {"enriched": 0, "failed": 0, "dropped": 0}
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdp")
+
+    @staticmethod
+    def listing_filter(max_price=None, filters=None):
+        # Filtro para el listado: todo menos las tallas, que se comprueban en la ficha
+        listing = copy.copy(filters) if filters is not None else ProductFilter(max_price=max_price)
+        listing.sizes = frozenset()
+        return listing
+
+    def fetch(self, url):
+        try:
+            response = self.scraper.get(url, cache=self.cache, timeout=self.timeout)
+        except requests.RequestException:
+            return None
+        if response.status_code != 200:
+            return None
+        try:
+            return self.parser.parse(response.text)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            # __NEXT_DATA__ con una forma inesperada: esta ficha cuenta como fallida, el
+            # resto del trabajo sigue
+            return None
+
+    def enrich(self, product):
+        # Devuelve (producto, detalle); sin ficha el producto sigue tal cual y detalle es None
+        url = product.get("product_url")
+        detail = self.fetch(url) if url else None
+        if detail is None:
+            return product, None
+        product["style_code"] = detail["style_code"]
+        product["colorway"] = detail["colorway"]
+        product["full_price"] = detail["full_price"] or detail["price"] or product.get("price")
+        product["discount"] = detail["discount"]
+        if detail["sizes"]:
+            product["available_sizes"] = ", ".join(label for label, ok in detail["sizes"] if ok) or "Agotado"
+            product["sold_out_sizes"] = ", ".join(label for label, ok in detail["sizes"] if not ok)
+        return product, detail
+
+    @staticmethod
+    def sizes_ok(detail, wanted):
+        # Sin tallas en la ficha no se descarta (igual que un precio que no se puede leer)
+        if not wanted or detail is None or not detail["sizes"]:
+            return True
+        return any(ok and size_key(label) in wanted for label, ok in detail["sizes"])
+
+    def iter_enrich(self, products, sizes=None):
+        # Mismo orden que la entrada; como mucho max_pending fichas pedidas por delante
+        wanted = frozenset(size_key(size) for size in sizes or ())
+        pending = deque()
+
+        def collect():
+            product, detail = pending.popleft().result()
+            self.stats["failed" if detail is None else "enriched"] += 1
+            if self.sizes_ok(detail, wanted):
+                return product
+            self.stats["dropped"] += 1
+            return None
+
+        try:
+            for product in products:
+                pending.append(self._executor.submit(self.enrich, product))
+                while len(pending) >= self.max_pending:
+                    product = collect()
+                    if product is not None:
+                        yield product
+            while pending:
+                product = collect()
+                if product is not None:
+                    yield product
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
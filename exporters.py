@@ -0,0 +1,206 @@
+# Exportación en streaming: cada sink acepta filas según se van obteniendo y las
+# escribe por bloques de chunk_size, así que la memoria no depende del tamaño del crawl.
+#
+#   with open_sink("resultados.jsonl") as sink:
+#       for product in scraper.iter_search("Air Max", max_pages=5):
+#           sink.write(product)
+import csv
+import json
+import os
+import sqlite3
+import sys
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+from Scraper import parse_price
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow es opcional, solo lo usa ParquetSink
+    pa = None
+
+EXPORT_FIELDS = ("title", "price", "available_sizes", "product_url", "image_url", "store")
+
+
+def price_value(row):
+    # ProductRow ya trae el precio numérico; un dict de iter_search hay que parsearlo
+    value = getattr(row, "price_value", None)
+    return value if value is not None else parse_price(row.get("price"))
+
+
+class ExportSink(ABC):
+    extension = ""
+
+    def __init__(self, path, fields=EXPORT_FIELDS, chunk_size=1000):
+        self.path = path
+        self.fields = tuple(fields)
+        self.chunk_size = chunk_size
+        self.rows_written = 0
+        self._buffer = []
+        self._closed = False
+
+    def write(self, row):
+        self._buffer.append(row)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def write_many(self, rows):
+        for row in rows:
+            self.write(row)
+        return self.rows_written + len(self._buffer)
+
+    def flush(self):
+        if self._buffer:
+            self._write_chunk(self._buffer)
+            self.rows_written += len(self._buffer)
+            self._buffer = []
+
+    def close(self):
+        if not self._closed:
+            self.flush()
+            self._close()
+            self._closed = True
+
+    @abstractmethod
+    def _write_chunk(self, rows):
+        pass
+
+    def _close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class CsvSink(ExportSink):
+    extension = ".csv"
+
+    def __init__(self, path, fields=EXPORT_FIELDS, chunk_size=1000):
+        super().__init__(path, fields, chunk_size)
+        # path puede ser un fichero ya abierto (p. ej. sys.stdout)
+        self._owns_file = isinstance(path, (str, os.PathLike))
+        self._file = open(path, "w", newline="", encoding="utf-8") if self._owns_file else path
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fields, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def _write_chunk(self, rows):
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def _close(self):
+        if self._owns_file:
+            self._file.close()
+
+
+class JsonLinesSink(ExportSink):
+    extension = ".jsonl"
+
+    def __init__(self, path, fields=EXPORT_FIELDS, chunk_size=1000):
+        super().__init__(path, fields, chunk_size)
+        self._owns_file = isinstance(path, (str, os.PathLike))
+        self._file = open(path, "w", encoding="utf-8") if self._owns_file else path
+
+    def _write_chunk(self, rows):
+        lines = []
+        for row in rows:
+            record = {field: row.get(field) for field in self.fields}
+            record["price_value"] = price_value(row)
+            lines.append(json.dumps(record, ensure_ascii=False))
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+
+    def _close(self):
+        if self._owns_file:
+            self._file.close()
+
+
+class SqliteSink(ExportSink):
+    extension = ".sqlite"
+
+    def __init__(self, path, fields=EXPORT_FIELDS, chunk_size=1000, table="products"):
+        super().__init__(path, fields, chunk_size)
+        self.table = table
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        columns = ", ".join(f'"{field}" TEXT' for field in self.fields)
+        self._db.execute(
+            f'CREATE TABLE IF NOT EXISTS "{table}" ({columns}, price_value REAL, exported_at TEXT)'
+        )
+        placeholders = ", ".join("?" for _ in range(len(self.fields) + 2))
+        self._insert = f'INSERT INTO "{table}" VALUES ({placeholders})'
+        self._exported_at = datetime.now().isoformat(timespec="seconds")
+
+    def _write_chunk(self, rows):
+        # Un executemany por bloque, dentro de una única transacción
+        with self._db:
+            self._db.executemany(self._insert, (
+                tuple(row.get(field) for field in self.fields) + (price_value(row), self._exported_at)
+                for row in rows
+            ))
+
+    def _close(self):
+        self._db.close()
+
+
+class ParquetSink(ExportSink):
+    extension = ".parquet"
+
+    def __init__(self, path, fields=EXPORT_FIELDS, chunk_size=10000):
+        if pa is None:
+            raise RuntimeError("La exportación a Parquet necesita el paquete pyarrow")
+        super().__init__(path, fields, chunk_size)
+        self.schema = pa.schema(
+            [pa.field(field, pa.string()) for field in self.fields] + [pa.field("price_value", pa.float64())]
+        )
+        self._writer = pq.ParquetWriter(path, self.schema)
+
+    def _write_chunk(self, rows):
+        # Cada bloque es un row group: el precio queda como columna float64
+        columns = {field: [row.get(field) for row in rows] for field in self.fields}
+        columns["price_value"] = [price_value(row) for row in rows]
+        self._writer.write_table(pa.Table.from_pydict(columns, schema=self.schema))
+
+    def _close(self):
+        self._writer.close()
+
+
+SINKS = {
+    "csv": CsvSink,
+    "jsonl": JsonLinesSink,
+    "sqlite": SqliteSink,
+    "parquet": ParquetSink
+}
+
+EXTENSIONS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".sqlite": "sqlite",
+    ".db": "sqlite",
+    ".parquet": "parquet"
+}
+
+
+def open_sink(path=None, format=None, **kwargs):
+    # Sin path se escribe CSV (o JSON Lines) en la salida estándar
+    if format is None:
+        format = EXTENSIONS.get(os.path.splitext(path)[1].lower(), "csv") if path else "csv"
+    if format not in SINKS:
+        raise ValueError(f"Formato de exportación desconocido: {format}")
+    if path is None:
+        if format not in ("csv", "jsonl"):
+            raise ValueError(f"El formato {format} necesita un fichero de salida")
+        path = sys.stdout
+    return SINKS[format](path, **kwargs)
+
+
+def export_stream(products, sink):
+    # Vuelca un iterable de productos (p. ej. scraper.iter_search(...)) en un sink
+    with sink:
+        for product in products:
+            sink.write(product)
+    return sink.rows_written
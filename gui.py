@@ -0,0 +1,973 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from datetime import datetime
+from collections import OrderedDict
+import queue
+import threading
+import time
+import webbrowser
+from PIL import ImageTk
+
+from Scraper import NIKE_CONFIG, ResultIndex, ThumbnailLoader, ZapatillasScraper
+from stores import MultiStoreSearch, StoreRegistry
+
+# Colores
+COLORS = {
+    "primary": "#f25c05",       # Naranja Nike
+    "primary_hover": "#d95204", # Naranja oscuro
+    "secondary": "#212121",     # Negro Nike
+    "light_bg": "#f7f7f7",      # Fondo claro
+    "white": "#ffffff",         # Blanco
+    "text": "#212121",          # Texto principal
+    "text_light": "#757575",    # Texto secundario
+    "success": "#43a047",       # Verde éxito
+    "error": "#e53935",         # Rojo error
+    "input_bg": "#ffffff",      # Fondo de inputs
+    "border": "#e0e0e0"         # Bordes
+}
+
+
+# --- Custom widgets ---
+class CustomEntry(ttk.Entry):
+    def __init__(self, parent, placeholder="", **kwargs):
+        super().__init__(parent, **kwargs)
+        self.placeholder = placeholder
+        self.placeholder_color = COLORS["text_light"]
+        self.default_fg_color = COLORS["text"]
+        
+        self.bind("<FocusIn>", self._focus_in)
+        self.bind("<FocusOut>", self._focus_out)
+        
+        self.put_placeholder()
+    
+    def put_placeholder(self):
+        self.insert(0, self.placeholder)
+        self['foreground'] = self.placeholder_color
+            
+    def _focus_in(self, *args):
+        if self.get() == self.placeholder:
+            self.delete(0, 'end')
+            self['foreground'] = self.default_fg_color
+            
+    def _focus_out(self, *args):
+        if not self.get():
+            self.put_placeholder()
+            
+    def get_value(self):
+        if self.get() == self.placeholder:
+            return ""
+        return self.get()
+
+
+class HoverButton(tk.Button):
+    def __init__(self, master, background=COLORS["primary"], activebackground=COLORS["primary_hover"], **kwargs):
+        tk.Button.__init__(self, master, background=background, activebackground=activebackground, **kwargs)
+        self.default_bg = background
+        self.hover_bg = activebackground
+        self.bind("<Enter>", self._on_enter)
+        self.bind("<Leave>", self._on_leave)
+
+    def _on_enter(self, e):
+        self.config(background=self.hover_bg)
+
+    def _on_leave(self, e):
+        self.config(background=self.default_bg)
+
+
+class LoadingAnimation:
+    def __init__(self, parent, text="Cargando"):
+        self.parent = parent
+        self.text = text
+        self.count = 0
+        self.running = False
+        self.label = tk.Label(parent, text=text, font=("Segoe UI", 10), fg=COLORS["primary"], bg=COLORS["light_bg"])
+        
+    def start(self):
+        self.running = True
+        self.count = 0
+        self.label.pack(pady=5)
+        self.update()
+        
+    def update(self):
+        if not self.running:
+            return
+        
+        dots = "." * (self.count % 4)
+        self.label.config(text=f"{self.text}{dots}")
+        self.count += 1
+        self.parent.after(300, self.update)
+        
+    def stop(self):
+        self.running = False
+        self.label.pack_forget()
+
+
+class StatusBar(tk.Frame):
+    def __init__(self, parent, **kwargs):
+        tk.Frame.__init__(self, parent, **kwargs)
+        self.config(bg=COLORS["light_bg"], height=30)
+        
+        self.label = tk.Label(self, text="", font=("Segoe UI", 9), 
+                              fg=COLORS["text_light"], bg=COLORS["light_bg"], anchor="w")
+        self.label.pack(side=tk.LEFT, padx=10)
+        
+    def set_message(self, message, is_error=False):
+        color = COLORS["error"] if is_error else COLORS["text_light"]
+        self.label.config(text=message, fg=color)
+
+
+class CustomTree(ttk.Treeview):
+    def __init__(self, parent, virtual=False, buffer=10, **kwargs):
+        super().__init__(parent, **kwargs)
+        # Modo virtual: las filas viven en self.rows y solo las visibles (+ buffer)
+        # existen como items de Tk; al desplazarse se reescriben sus valores
+        self.virtual = virtual
+        self.buffer = buffer
+        self.rows = []
+        # keys identifica cada fila (p. ej. su índice en los resultados); al filtrar u
+        # ordenar, un item que sigue mostrando la misma fila no se reescribe
+        self.keys = None
+        self.offset = 0
+        self.slots = []
+        self.slot_rows = []
+        self.slot_keys = []
+        self.selected_row = None
+        # render_callback(offset, count) se llama tras cada repintado con las filas visibles
+        self.render_callback = None
+
+        # Configurar la barra de desplazamiento vertical
+        self.vsb = ttk.Scrollbar(parent, orient="vertical", command=self._on_scroll if virtual else self.yview)
+        if not virtual:
+            self.configure(yscrollcommand=self.vsb.set)
+        self.vsb.pack(side='right', fill='y')
+        
+        # Configurar los colores alternos de las filas
+        self.tag_configure('oddrow', background=COLORS["light_bg"])
+        self.tag_configure('evenrow', background=COLORS["white"])
+
+        if virtual:
+            self.bind("<MouseWheel>", lambda e: self._scroll_by(-1 if e.delta > 0 else 1))
+            self.bind("<Button-4>", lambda e: self._scroll_by(-1))
+            self.bind("<Button-5>", lambda e: self._scroll_by(1))
+            self.bind("<Configure>", lambda e: self._render())
+            self.bind("<<TreeviewSelect>>", self._on_select)
+
+    def visible_rows(self):
+        height = self.winfo_height()
+        if height <= 1:
+            # Aún sin dibujar: se usa la altura pedida en filas
+            return int(self["height"])
+        rowheight = int(ttk.Style(self).lookup("Treeview", "rowheight") or 20)
+        return max(1, height // rowheight)
+
+    def clear(self):
+        if self.virtual:
+            self.set_rows([])
+        else:
+            self.delete(*self.get_children())
+
+    def row_key(self, index):
+        return index if self.keys is None else self.keys[index]
+
+    def set_rows(self, rows, keys=None):
+        # Con keys se conserva la selección si la fila sigue en la lista
+        selected_key = None
+        if self.selected_row is not None and self.selected_row < len(self.rows):
+            selected_key = self.row_key(self.selected_row)
+        self.rows = list(rows)
+        self.keys = list(keys) if keys is not None else None
+        if keys is None:
+            self.slot_keys = [None] * len(self.slots)
+        self.offset = 0
+        self.selected_row = None
+        if selected_key is not None and self.keys is not None:
+            try:
+                self.selected_row = self.keys.index(selected_key)
+            except ValueError:
+                pass
+        self._render()
+
+    def append_rows(self, rows, keys=None):
+        if not self.virtual:
+            start = len(self.get_children())
+            for i, values in enumerate(rows, start):
+                self.insert('', 'end', values=values, tags=('evenrow' if i % 2 == 0 else 'oddrow',))
+            return
+        start = len(self.rows)
+        self.rows.extend(rows)
+        if self.keys is not None:
+            self.keys.extend(keys if keys is not None else range(start, len(self.rows)))
+        self._render()
+
+    def row_index(self, item):
+        # Índice en self.rows de la fila que muestra un item
+        if not self.virtual:
+            return self.index(item)
+        slot = self.slots.index(item)
+        return self.slot_rows[slot]
+
+    def _on_select(self, event=None):
+        selected = self.selection()
+        if selected and selected[0] in self.slots:
+            self.selected_row = self.row_index(selected[0])
+
+    def _scroll_by(self, units):
+        self.scroll_to(self.offset + units)
+        return "break"
+
+    def _on_scroll(self, action, amount, what=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * len(self.rows)))
+        elif action == "scroll":
+            step = self.visible_rows() if what == "pages" else 1
+            self.scroll_to(self.offset + int(amount) * step)
+
+    def scroll_to(self, offset):
+        max_offset = max(len(self.rows) - self.visible_rows(), 0)
+        offset = min(max(offset, 0), max_offset)
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+
+    def _render(self):
+        if not self.virtual:
+            return
+        wanted = min(len(self.rows) - self.offset, self.visible_rows() + self.buffer)
+        wanted = max(wanted, 0)
+
+        while len(self.slots) < wanted:
+            self.slots.append(self.insert('', 'end'))
+            self.slot_rows.append(None)
+            self.slot_keys.append(None)
+        if len(self.slots) > wanted:
+            self.delete(*self.slots[wanted:])
+            del self.slots[wanted:]
+            del self.slot_rows[wanted:]
+            del self.slot_keys[wanted:]
+
+        # Solo se tocan los items cuya fila ha cambiado (o solo su color, si ha cambiado de posición)
+        selected = ()
+        for slot, item in enumerate(self.slots):
+            index = self.offset + slot
+            key = self.row_key(index)
+            tags = ('evenrow' if index % 2 == 0 else 'oddrow',)
+            if self.slot_keys[slot] != key:
+                self.item(item, values=self.rows[index], image="", tags=tags)
+                self.slot_keys[slot] = key
+            elif self.slot_rows[slot] is None or (self.slot_rows[slot] - index) % 2:
+                self.item(item, tags=tags)
+            self.slot_rows[slot] = index
+            if index == self.selected_row:
+                selected = (item,)
+        if tuple(self.selection()) != selected:
+            self.selection_set(selected)
+        self.yview_moveto(0)
+
+        total = len(self.rows)
+        if total:
+            self.vsb.set(self.offset / total, min(self.offset + self.visible_rows(), total) / total)
+        else:
+            self.vsb.set(0, 1)
+        if self.render_callback:
+            self.render_callback(self.offset, len(self.slots))
+
+    def set_row_image(self, index, image):
+        # Solo tiene efecto si la fila está ahora mismo en pantalla
+        slot = index - self.offset
+        if 0 <= slot < len(self.slots) and self.slot_rows[slot] == index:
+            self.item(self.slots[slot], image=image)
+
+
+# --- App GUI ---
+class App:
+    POLL_MS = 16          # ~60 fps mientras hay una búsqueda en marcha
+    FRAME_BUDGET = 0.008  # tiempo máximo por frame dedicado a insertar filas
+    MAX_PHOTOS = 300      # miniaturas ya convertidas a PhotoImage que se conservan
+    TYPING_MS = 40        # espera tras cada tecla antes de volver a filtrar
+    LIVE_REFRESH_MS = 250 # con un filtro activo, cada cuánto se muestran las filas que van llegando
+    COLUMN_FIELDS = {"Título": "title", "Precio": "price", "Tallas": "available_sizes", "Enlace": "product_url"}
+    HEADINGS = {"Título": "Título", "Precio": "Precio", "Tallas": "Tallas Disponibles", "Enlace": "URL del producto"}
+
+    def __init__(self, root):
+        self.scraper = ZapatillasScraper(NIKE_CONFIG)
+        try:
+            self.stores = StoreRegistry.default()
+        except ValueError:
+            self.stores = StoreRegistry()
+        self.search_thread = None
+        self.search_events = None
+        self.cancel_event = threading.Event()
+        # Mensaje del último fallo de la búsqueda en curso (None si no ha fallado)
+        self._search_error = None
+        self.thumbnails = ThumbnailLoader(self.scraper)
+        # Consultas locales sobre los resultados: self.view son los índices (en
+        # self.scraper.results) de las filas que muestra la tabla, en su orden
+        self.results_index = ResultIndex(self.scraper.results)
+        self.row_values = []
+        self.view = []
+        self.sort = (None, False)
+        self._refresh_job = None
+        self.thumbnail_events = queue.Queue()
+        self.photos = OrderedDict()
+        self.root = root
+        root.title("NIKE Scraper by Aran :)")
+        root.geometry("950x700")
+        root.configure(bg=COLORS["light_bg"])
+        root.resizable(True, True)
+        
+        # Configura el estilo
+        self.setup_styles()
+        
+        # Frame principal
+        self.main_frame = tk.Frame(root, bg=COLORS["light_bg"])
+        self.main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Header con logo
+        self.create_header()
+        
+        # Panel de búsqueda
+        self.create_search_panel()
+        
+        # Resultados
+        self.create_results_panel()
+        
+        # Panel de estado
+        self.status_bar = StatusBar(root)
+        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        
+        # Animación de carga
+        self.loading = LoadingAnimation(self.main_frame)
+        
+        # Contador de resultados
+        self.results_counter = tk.Label(
+            self.results_frame, 
+            text="0 resultados encontrados", 
+            font=("Segoe UI", 10),
+            fg=COLORS["text_light"],
+            bg=COLORS["light_bg"]
+        )
+        self.results_counter.pack(pady=(0, 5), anchor="w", padx=10)
+
+        self.root.after(50, self._poll_thumbnails)
+
+    def setup_styles(self):
+        self.style = ttk.Style()
+        self.style.theme_use('clam')
+        
+        # Estilo para etiquetas
+        self.style.configure(
+            "TLabel", 
+            font=("Segoe UI", 10), 
+            background=COLORS["light_bg"], 
+            foreground=COLORS["text"]
+        )
+        
+        # Estilo para entradas
+        self.style.configure(
+            "TEntry", 
+            fieldbackground=COLORS["input_bg"],
+            bordercolor=COLORS["border"],
+            lightcolor=COLORS["border"],
+            darkcolor=COLORS["border"],
+            borderwidth=1,
+            font=("Segoe UI", 10)
+        )
+        self.style.map(
+            "TEntry",
+            bordercolor=[("focus", COLORS["primary"])]
+        )
+        
+        # Estilo para botones
+        self.style.configure(
+            "TButton", 
+            font=("Segoe UI", 10, "bold"),
+            background=COLORS["primary"],
+            foreground=COLORS["white"]
+        )
+        self.style.map(
+            "TButton",
+            background=[("active", COLORS["primary_hover"])]
+        )
+        
+        # Estilo para el Treeview (tabla de resultados)
+        self.style.configure(
+            "Treeview", 
+            background=COLORS["white"],
+            fieldbackground=COLORS["white"],
+            foreground=COLORS["text"],
+            font=("Segoe UI", 9),
+            rowheight=30
+        )
+        self.style.configure(
+            "Treeview.Heading", 
+            font=("Segoe UI", 10, "bold"),
+            background=COLORS["secondary"],
+            foreground=COLORS["white"]
+        )
+        self.style.map(
+            "Treeview.Heading",
+            background=[("active", COLORS["primary"])]
+        )
+        
+        # Estilo para el Combobox
+        self.style.configure(
+            "TCombobox", 
+            fieldbackground=COLORS["input_bg"],
+            background=COLORS["white"],
+            bordercolor=COLORS["border"]
+        )
+        
+        # Estilo para el Spinbox
+        self.style.configure(
+            "TSpinbox", 
+            fieldbackground=COLORS["input_bg"],
+            bordercolor=COLORS["border"],
+            arrowcolor=COLORS["primary"]
+        )
+
+    def create_header(self):
+        header_frame = tk.Frame(self.main_frame, bg=COLORS["secondary"], height=80)
+        header_frame.pack(fill=tk.X)
+        
+        # Logo y título
+        logo_text = tk.Label(
+            header_frame, 
+            text="NIKE", 
+            font=("Arial Black", 24, "bold"), 
+            fg=COLORS["white"],
+            bg=COLORS["secondary"]
+        )
+        logo_text.pack(side=tk.LEFT, padx=20, pady=15)
+        
+        title = tk.Label(
+            header_frame, 
+            text="Scraper :)", 
+            font=("Segoe UI", 18), 
+            fg=COLORS["white"],
+            bg=COLORS["secondary"]
+        )
+        title.pack(side=tk.LEFT, padx=0, pady=15)
+
+    def create_search_panel(self):
+        search_frame = tk.Frame(self.main_frame, bg=COLORS["light_bg"], padx=20, pady=15)
+        search_frame.pack(fill=tk.X)
+        
+        # Título de la sección
+        search_title = tk.Label(
+            search_frame, 
+            text="Uso propio con fines educativos", 
+            font=("Segoe UI", 14, "bold"),
+            fg=COLORS["text"],
+            bg=COLORS["light_bg"]
+        )
+        search_title.grid(row=0, column=0, columnspan=3, sticky="w", pady=(0, 10))
+        
+        # Primera fila: Término de búsqueda
+        tk.Label(
+            search_frame, 
+            text="¿Qué estás buscando?", 
+            font=("Segoe UI", 10),
+            fg=COLORS["text"],
+            bg=COLORS["light_bg"]
+        ).grid(row=1, column=0, sticky="w", pady=(5, 2))
+        
+        self.query_entry = CustomEntry(
+            search_frame, 
+            placeholder="Ej: Nike Air Max, Air Jordan, Nocta...",
+            width=50
+        )
+        self.query_entry.grid(row=2, column=0, sticky="ew", padx=(0, 20))
+        
+        # Segunda fila: Filtros
+        filters_frame = tk.Frame(search_frame, bg=COLORS["light_bg"])
+        filters_frame.grid(row=3, column=0, sticky="ew", pady=(15, 0))
+        filters_frame.grid_columnconfigure(0, weight=1)
+        filters_frame.grid_columnconfigure(1, weight=1)
+        filters_frame.grid_columnconfigure(2, weight=1)
+        
+        # Precio máximo
+        tk.Label(
+            filters_frame, 
+            text="Precio máximo (€)", 
+            font=("Segoe UI", 10),
+            fg=COLORS["text"],
+            bg=COLORS["light_bg"]
+        ).grid(row=0, column=0, sticky="w", pady=(0, 2))
+        
+        self.max_price_entry = CustomEntry(filters_frame, placeholder="Ej: 120", width=15)
+        self.max_price_entry.grid(row=1, column=0, sticky="w", padx=(0, 10))
+        
+        # Tallas
+        tk.Label(
+            filters_frame, 
+            text="Tallas", 
+            font=("Segoe UI", 10),
+            fg=COLORS["text"],
+            bg=COLORS["light_bg"]
+        ).grid(row=0, column=1, sticky="w", pady=(0, 2))
+        
+        self.size_entry = CustomEntry(filters_frame, placeholder="Ej: 42, 43, 44", width=15)
+        self.size_entry.grid(row=1, column=1, sticky="w", padx=(0, 10))
+        
+        # Páginas a buscar
+        tk.Label(
+            filters_frame, 
+            text="Páginas a buscar", 
+            font=("Segoe UI", 10),
+            fg=COLORS["text"],
+            bg=COLORS["light_bg"]
+        ).grid(row=0, column=2, sticky="w", pady=(0, 2))
+        
+        self.page_spinbox = ttk.Spinbox(filters_frame, from_=1, to=10, width=5)
+        self.page_spinbox.set(2)
+        self.page_spinbox.grid(row=1, column=2, sticky="w", padx=(0, 10))
+
+        # Tiendas (vacío = solo Nike ES)
+        tk.Label(
+            filters_frame,
+            text="Tiendas",
+            font=("Segoe UI", 10),
+            fg=COLORS["text"],
+            bg=COLORS["light_bg"]
+        ).grid(row=0, column=3, sticky="w", pady=(0, 2))
+
+        self.stores_entry = CustomEntry(filters_frame, placeholder="Ej: nike_es, nike_gb", width=22)
+        self.stores_entry.grid(row=1, column=3, sticky="w")
+        
+        # Botón de búsqueda
+        button_frame = tk.Frame(search_frame, bg=COLORS["light_bg"])
+        button_frame.grid(row=4, column=0, sticky="w", pady=(20, 10))
+        
+        self.search_btn = HoverButton(
+            button_frame,
+            text="BUSCAR ZAPATILLAS",
+            font=("Segoe UI", 11, "bold"),
+            fg=COLORS["white"],
+            bg=COLORS["primary"],
+            activeforeground=COLORS["white"],
+            activebackground=COLORS["primary_hover"],
+            relief=tk.FLAT,
+            borderwidth=0,
+            padx=15,
+            pady=8,
+            cursor="hand2",
+            command=self.run_search
+        )
+        self.search_btn.pack(side=tk.LEFT)
+        
+        self.cancel_btn = HoverButton(
+            button_frame,
+            text="CANCELAR",
+            font=("Segoe UI", 11, "bold"),
+            fg=COLORS["white"],
+            bg=COLORS["secondary"],
+            activeforeground=COLORS["white"],
+            activebackground=COLORS["error"],
+            relief=tk.FLAT,
+            borderwidth=0,
+            padx=15,
+            pady=8,
+            cursor="hand2",
+            state=tk.DISABLED,
+            command=self.cancel_search
+        )
+        self.cancel_btn.pack(side=tk.LEFT, padx=(10, 0))
+        
+        # Separador
+        ttk.Separator(self.main_frame, orient='horizontal').pack(fill='x', padx=20)
+
+    def create_results_panel(self):
+        self.results_frame = tk.Frame(self.main_frame, bg=COLORS["light_bg"], padx=20, pady=15)
+        self.results_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Título de la sección
+        results_title = tk.Label(
+            self.results_frame, 
+            text="Resultados", 
+            font=("Segoe UI", 14, "bold"),
+            fg=COLORS["text"],
+            bg=COLORS["light_bg"]
+        )
+        results_title.pack(anchor="w", pady=(0, 10))
+
+        # Filtros sobre los resultados ya descargados (sin volver a buscar)
+        local_frame = tk.Frame(self.results_frame, bg=COLORS["light_bg"])
+        local_frame.pack(fill=tk.X, pady=(0, 5))
+        self.filter_entry = CustomEntry(local_frame, placeholder="Filtrar resultados: Ej: air max", width=40)
+        self.filter_entry.pack(side=tk.LEFT, padx=(0, 10))
+        self.filter_min_entry = CustomEntry(local_frame, placeholder="Precio mín.", width=11)
+        self.filter_min_entry.pack(side=tk.LEFT, padx=(0, 10))
+        self.filter_max_entry = CustomEntry(local_frame, placeholder="Precio máx.", width=11)
+        self.filter_max_entry.pack(side=tk.LEFT, padx=(0, 10))
+        self.filter_sizes_entry = CustomEntry(local_frame, placeholder="Tallas: 42, 43", width=15)
+        self.filter_sizes_entry.pack(side=tk.LEFT)
+        for entry in (self.filter_entry, self.filter_min_entry, self.filter_max_entry, self.filter_sizes_entry):
+            entry.bind("<KeyRelease>", lambda e: self._schedule_refresh(self.TYPING_MS, restart=True))
+        
+        # Tabla de resultados
+        tree_frame = tk.Frame(self.results_frame, bg=COLORS["light_bg"])
+        tree_frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.tree = CustomTree(
+            tree_frame,
+            virtual=True,
+            columns=("Título", "Precio", "Tallas", "Enlace"),
+            show="tree headings",
+            height=15
+        )
+        
+        # Configurar anchos de columnas
+        self.tree.column("#0", width=44, stretch=False, anchor="center")
+        self.tree.column("Título", width=350, anchor="w")
+        self.tree.column("Precio", width=100, anchor="center")
+        self.tree.column("Tallas", width=150, anchor="center")
+        self.tree.column("Enlace", width=300, anchor="w")
+        
+        # Configurar encabezados (clic para ordenar)
+        for column, text in self.HEADINGS.items():
+            self.tree.heading(column, text=text, command=lambda column=column: self.sort_by(column))
+        
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, pady=(5, 10))
+        
+        # Miniaturas solo para las filas visibles
+        self.tree.render_callback = self._load_visible_thumbnails
+        
+        # Eventos de la tabla
+        self.tree.bind("<Double-1>", self.open_url)
+        self.tree.bind("<Button-1>", self.check_click)
+        
+        # Panel inferior con botones de acciones
+        actions_frame = tk.Frame(self.results_frame, bg=COLORS["light_bg"])
+        actions_frame.pack(fill=tk.X, pady=(5, 0))
+        
+        self.export_btn = HoverButton(
+            actions_frame,
+            text="GUARDAR EN CSV",
+            font=("Segoe UI", 10, "bold"),
+            fg=COLORS["white"],
+            bg=COLORS["secondary"],
+            activeforeground=COLORS["white"],
+            activebackground=COLORS["primary"],
+            relief=tk.FLAT,
+            borderwidth=0,
+            padx=15,
+            pady=6,
+            cursor="hand2",
+            command=self.save_csv
+        )
+        self.export_btn.pack(side=tk.LEFT, padx=(0, 10))
+        
+        self.open_url_btn = HoverButton(
+            actions_frame,
+            text="ABRIR ENLACE SELECCIONADO",
+            font=("Segoe UI", 10, "bold"),
+            fg=COLORS["white"],
+            bg=COLORS["secondary"],
+            activeforeground=COLORS["white"],
+            activebackground=COLORS["primary"],
+            relief=tk.FLAT,
+            borderwidth=0,
+            padx=15,
+            pady=6,
+            cursor="hand2",
+            command=self.open_selected_url
+        )
+        self.open_url_btn.pack(side=tk.LEFT)
+
+    def check_click(self, event):
+        region = self.tree.identify_region(event.x, event.y)
+        if region == "cell":
+            column = self.tree.identify_column(event.x)
+            if column == "#4":  # Columna del enlace
+                self.open_url(event)
+
+    def update_status(self, msg, is_error=False):
+        self.status_bar.set_message(msg, is_error)
+
+    def run_search(self):
+        query = self.query_entry.get_value()
+        max_price = self.max_price_entry.get_value()
+        sizes = [s.strip() for s in self.size_entry.get_value().split(',') if s.strip()]
+        pages = int(self.page_spinbox.get())
+
+        if not query:
+            messagebox.showwarning("Atención", "Introduce un término de búsqueda")
+            return
+
+        try:
+            max_price = float(max_price) if max_price else None
+        except ValueError:
+            messagebox.showerror("Error", "Precio máximo inválido")
+            self.update_status("Formato de precio inválido. Usa solo números.", True)
+            return
+
+        stores = self.stores_entry.get_value()
+        try:
+            configs = self.stores.select(stores) if stores else None
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            self.update_status(f"Tiendas disponibles: {', '.join(self.stores.names())}", True)
+            return
+
+        self.tree.clear()
+        self.scraper.results.clear()
+        self.results_index.clear()
+        self.row_values = []
+        self.view = []
+        self.results_counter.config(text="0 productos encontrados")
+
+        # Desactivar botón de búsqueda e iniciar animación
+        self.search_btn.config(state=tk.DISABLED)
+        self.cancel_btn.config(state=tk.NORMAL)
+        self.loading.start()
+        self.update_status("Iniciando búsqueda...")
+        self._search_error = None
+
+        # El scraping va en un hilo aparte; la interfaz solo lee de la cola con after()
+        self.search_events = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.search_thread = threading.Thread(
+            target=self._search_worker,
+            args=(query, pages, max_price, sizes, configs, self.search_events, self.cancel_event),
+            daemon=True
+        )
+        self.search_thread.start()
+        self.root.after(self.POLL_MS, self._poll_search)
+
+    def _search_worker(self, query, pages, max_price, sizes, configs, events, cancel_event):
+        # Con varias tiendas cada una tiene su propio scraper; la caché es compartida
+        search = MultiStoreSearch(configs, cache=self.scraper.cache) if configs else self.scraper
+        try:
+            for product in search.iter_search(
+                query,
+                max_pages=pages,
+                max_price=max_price,
+                sizes=sizes,
+                status_callback=lambda msg: events.put(("status", msg)),
+                cancel_event=cancel_event
+            ):
+                events.put(("product", product))
+        except Exception as e:
+            events.put(("error", str(e)))
+        finally:
+            if search is not self.scraper:
+                search.close()
+        events.put(("done", None))
+
+    def _poll_search(self):
+        # Se vacía la cola en lotes, sin pasar de ~un frame por llamada
+        deadline = time.perf_counter() + self.FRAME_BUDGET
+        batch = []
+        finished = False
+        while time.perf_counter() < deadline:
+            try:
+                kind, payload = self.search_events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "product":
+                batch.append(payload)
+            elif kind == "status":
+                self.update_status(payload)
+            elif kind == "error":
+                self._search_error = payload
+                self.update_status(f"Error durante la búsqueda: {payload}", True)
+            elif kind == "done":
+                finished = True
+                break
+
+        if batch:
+            self._insert_rows(batch)
+        if finished:
+            self._finish_search()
+        else:
+            self.root.after(self.POLL_MS, self._poll_search)
+
+    def _insert_rows(self, products):
+        start = len(self.scraper.results)
+        self.scraper.results.extend(products)
+        rows = [
+            (product["title"], product["price"], product["available_sizes"], product["product_url"])
+            for product in products
+        ]
+        self.row_values.extend(rows)
+        if self._local_query() is None:
+            keys = range(start, start + len(rows))
+            self.view.extend(keys)
+            self.tree.append_rows(rows, keys)
+            self._update_counter()
+        else:
+            # Con filtros u orden activos las filas nuevas entran en la siguiente consulta
+            self._schedule_refresh(self.LIVE_REFRESH_MS)
+
+    def _update_counter(self):
+        total = len(self.scraper.results)
+        if len(self.view) == total:
+            self.results_counter.config(text=f"{total} productos encontrados")
+        else:
+            self.results_counter.config(text=f"{len(self.view)} de {total} productos")
+
+    def _local_query(self):
+        # Filtros y orden de la vista como argumentos de ResultIndex.query; None si no hay ninguno
+        def number(entry):
+            try:
+                return float(entry.get_value().replace(",", ".")) if entry.get_value().strip() else None
+            except ValueError:
+                return None
+
+        field, descending = self.sort
+        query = {
+            "text": self.filter_entry.get_value().strip(),
+            "min_price": number(self.filter_min_entry),
+            "max_price": number(self.filter_max_entry),
+            "sizes": [s.strip() for s in self.filter_sizes_entry.get_value().split(",") if s.strip()],
+            "sort": field,
+            "descending": descending
+        }
+        if not (query["text"] or query["sizes"] or field
+                or query["min_price"] is not None or query["max_price"] is not None):
+            return None
+        return query
+
+    def _schedule_refresh(self, delay, restart=False):
+        # restart: al teclear se espera a la última tecla; con filas llegando basta una cada delay
+        if self._refresh_job is not None:
+            if not restart:
+                return
+            self.root.after_cancel(self._refresh_job)
+        self._refresh_job = self.root.after(delay, self.refresh_view)
+
+    def refresh_view(self):
+        self._refresh_job = None
+        query = self._local_query()
+        if query is None:
+            self.view = list(range(len(self.row_values)))
+        else:
+            self.view = self.results_index.query(**query)
+        self.tree.set_rows([self.row_values[index] for index in self.view], keys=self.view)
+        self._update_counter()
+
+    def sort_by(self, column):
+        # Primer clic: ascendente; el siguiente en la misma columna invierte el orden
+        field = self.COLUMN_FIELDS[column]
+        current, descending = self.sort
+        self.sort = (field, not descending if current == field else False)
+        for name, text in self.HEADINGS.items():
+            arrow = (" ▼" if self.sort[1] else " ▲") if name == column else ""
+            self.tree.heading(name, text=text + arrow)
+        self.refresh_view()
+
+    def _finish_search(self):
+        # Detener animación y reactivar botón
+        self.loading.stop()
+        self.search_btn.config(state=tk.NORMAL)
+        self.cancel_btn.config(state=tk.DISABLED)
+
+        total = len(self.scraper.results)
+        if self._search_error is not None:
+            # Un fallo de red o de parseo no es una búsqueda sin resultados
+            self.update_status(f"Error durante la búsqueda: {self._search_error}. "
+                               f"Se encontraron {total} productos.", True)
+            messagebox.showerror("Error", f"La búsqueda se ha interrumpido:\n{self._search_error}")
+        elif self.cancel_event.is_set():
+            self.update_status(f"Búsqueda cancelada. Se encontraron {total} productos.")
+        elif total:
+            self.update_status(f"Búsqueda completada. Se encontraron {total} productos.")
+        else:
+            self.update_status("Búsqueda completada. No se encontraron productos.")
+            messagebox.showinfo("Sin resultados", "No se encontraron productos para tu búsqueda.")
+
+    def _load_visible_thumbnails(self, offset, count):
+        results = self.scraper.results
+        visible = []
+        for index in range(offset, min(offset + count, len(self.view))):
+            url = results[self.view[index]]["image_url"]
+            visible.append(url)
+            photo = self.photos.get(url)
+            if photo is not None:
+                self.photos.move_to_end(url)
+                self.tree.set_row_image(index, photo)
+            else:
+                self.thumbnails.request(url, lambda url, image: self.thumbnail_events.put((url, image)))
+        self.thumbnails.retain(visible)
+
+    def _poll_thumbnails(self):
+        # Las PhotoImage solo se pueden crear en el hilo de Tk
+        updated = False
+        while True:
+            try:
+                url, image = self.thumbnail_events.get_nowait()
+            except queue.Empty:
+                break
+            if image is None or url in self.photos:
+                continue
+            self.photos[url] = ImageTk.PhotoImage(image)
+            updated = True
+            while len(self.photos) > self.MAX_PHOTOS:
+                self.photos.popitem(last=False)
+        if updated:
+            results = self.scraper.results
+            for index in self.tree.slot_rows:
+                if index is not None and index < len(self.view):
+                    photo = self.photos.get(results[self.view[index]]["image_url"])
+                    if photo is not None:
+                        self.tree.set_row_image(index, photo)
+        self.root.after(50, self._poll_thumbnails)
+
+    def cancel_search(self):
+        if self.search_thread is not None and self.search_thread.is_alive():
+            self.cancel_event.set()
+            self.cancel_btn.config(state=tk.DISABLED)
+            self.update_status("Cancelando búsqueda...")
+
+    def save_csv(self):
+        if not self.scraper.results:
+            messagebox.showwarning("Nada que guardar", "Realiza una búsqueda primero.")
+            return
+
+        filename = datetime.now().strftime("nike_zapatillas_%Y%m%d_%H%M%S.csv")
+        file = filedialog.asksaveasfilename(
+            initialfile=filename,
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv")],
+            title="Guardar resultados como..."
+        )
+        
+        if file:
+            if self.scraper.export_to_csv(file):
+                self.update_status(f"Archivo guardado en: {file}")
+                messagebox.showinfo("Éxito", f"Archivo guardado correctamente.")
+            else:
+                self.update_status("Error al guardar el archivo.", True)
+                messagebox.showerror("Error", "No se pudo guardar el archivo.")
+
+    def open_url(self, event):
+        region = self.tree.identify_region(event.x, event.y)
+        if region == "cell":
+            column = self.tree.identify_column(event.x)
+            if column == "#4":  # Columna del enlace
+                row = self.tree.identify_row(event.y)
+                if row:
+                    item = self.tree.item(row)
+                    url = item["values"][3]
+                    webbrowser.open_new_tab(url)
+                    self.update_status(f"Abriendo enlace: {url}")
+
+    def open_selected_url(self):
+        selected = self.tree.selection()
+        if selected:
+            item = self.tree.item(selected[0])
+            url = item["values"][3]
+            webbrowser.open_new_tab(url)
+            self.update_status(f"Abriendo enlace: {url}")
+        else:
+            messagebox.showinfo("Información", "Selecciona primero un producto de la lista.")
+
+
+def main():
+    root = tk.Tk()
+    app = App(root)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
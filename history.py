@@ -0,0 +1,245 @@
+# Histórico de precios: una observación (fecha, precio, tallas) por producto y crawl,
+# más una tabla "latest" con el último precio de cada producto que se mantiene al
+# ingerir, para que las consultas habituales no tengan que recorrer el histórico.
+#
+#   history = PriceHistory("precios.sqlite")
+#   history.ingest(scraper.search("Air Max", max_pages=5))
+#   history.price_drops()
+#
+# Para un crawl largo, writer() guarda las filas según llegan sin tenerlas en memoria:
+#
+#   writer = history.writer()
+#   for product in scraper.iter_search("Air Max", max_pages=50):
+#       writer.add(product)
+#   writer.commit()
+import sqlite3
+import time
+
+from exporters import price_value
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY,
+    product_url TEXT NOT NULL UNIQUE,
+    title TEXT,
+    store TEXT
+);
+CREATE TABLE IF NOT EXISTS crawls (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    products INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS observations (
+    product_id INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    crawl_id INTEGER NOT NULL,
+    price REAL,
+    sizes TEXT,
+    PRIMARY KEY (product_id, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS latest (
+    product_id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    price REAL,
+    sizes TEXT,
+    prev_ts REAL,
+    prev_price REAL
+);
+CREATE INDEX IF NOT EXISTS latest_ts ON latest(ts);
+CREATE INDEX IF NOT EXISTS latest_price ON latest(price);
+CREATE TABLE IF NOT EXISTS latest_sizes (
+    size TEXT NOT NULL,
+    price REAL,
+    product_id INTEGER NOT NULL,
+    PRIMARY KEY (size, price, product_id)
+) WITHOUT ROWID;
+"""
+
+NO_SIZES = "No especificado"
+
+
+def split_sizes(sizes):
+    if not sizes or sizes == NO_SIZES:
+        return []
+    return [size.strip() for size in sizes.split(",") if size.strip()]
+
+
+class PriceHistory:
+    def __init__(self, path="nike_history.sqlite", chunk_size=5000):
+        self.path = path
+        self.chunk_size = chunk_size
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    def ingest(self, rows, ts=None):
+        # Todo el crawl en una transacción; las filas pasan por tablas temporales por
+        # bloques y el resto se hace con SQL por conjuntos
+        writer = self.writer(ts)
+        try:
+            writer.extend(rows)
+        except BaseException:
+            writer.discard()
+            raise
+        return writer.commit()
+
+    def writer(self, ts=None):
+        # Para ir guardando las filas según llegan (ver HistoryWriter)
+        return HistoryWriter(self, ts)
+
+    def _merge(self, ts):
+        # Pasa lo que hay en las tablas temporales al histórico, en una sola transacción
+        db = self._db
+        with db:
+            crawl_id = db.execute("INSERT INTO crawls (ts) VALUES (?)", (ts,)).lastrowid
+            db.execute("""
+                INSERT INTO products (product_url, title, store)
+                SELECT url, title, store FROM batch WHERE true
+                ON CONFLICT(product_url) DO UPDATE SET title = excluded.title, store = excluded.store
+            """)
+            db.execute("""
+                INSERT OR REPLACE INTO observations (product_id, ts, crawl_id, price, sizes)
+                SELECT p.id, ?, ?, b.price, b.sizes FROM batch b JOIN products p ON p.product_url = b.url
+            """, (ts, crawl_id))
+            db.execute("""
+                INSERT INTO latest (product_id, ts, price, sizes)
+                SELECT p.id, ?, b.price, b.sizes FROM batch b JOIN products p ON p.product_url = b.url WHERE true
+                ON CONFLICT(product_id) DO UPDATE SET
+                    prev_ts = CASE WHEN latest.ts < excluded.ts THEN latest.ts ELSE latest.prev_ts END,
+                    prev_price = CASE WHEN latest.ts < excluded.ts THEN latest.price ELSE latest.prev_price END,
+                    ts = excluded.ts, price = excluded.price, sizes = excluded.sizes
+                WHERE excluded.ts >= latest.ts
+            """, (ts,))
+            db.execute("""
+                DELETE FROM latest_sizes WHERE product_id IN (
+                    SELECT p.id FROM batch b JOIN products p ON p.product_url = b.url
+                )
+            """)
+            db.execute("""
+                INSERT OR IGNORE INTO latest_sizes (size, price, product_id)
+                SELECT s.size, l.price, l.product_id
+                FROM batch_sizes s
+                JOIN products p ON p.product_url = s.url
+                JOIN latest l ON l.product_id = p.id
+            """)
+            count = db.execute("SELECT COUNT(*) FROM batch").fetchone()[0]
+            db.execute("UPDATE crawls SET products = ? WHERE id = ?", (count, crawl_id))
+            db.execute("DELETE FROM batch")
+            db.execute("DELETE FROM batch_sizes")
+        return count
+
+    def _stage(self, chunk, sizes_chunk):
+        if chunk:
+            self._db.executemany("INSERT OR REPLACE INTO batch VALUES (?, ?, ?, ?, ?)", chunk)
+        if sizes_chunk:
+            self._db.executemany("INSERT INTO batch_sizes VALUES (?, ?)", sizes_chunk)
+
+    def _rows(self, sql, params=()):
+        cursor = self._db.execute(sql, params)
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def latest_prices(self, limit=None):
+        sql = """
+            SELECT p.product_url, p.title, p.store, l.price, l.sizes, l.ts
+            FROM latest l JOIN products p ON p.id = l.product_id
+            ORDER BY l.price
+        """
+        if limit is not None:
+            return self._rows(sql + " LIMIT ?", (limit,))
+        return self._rows(sql)
+
+    def latest_price(self, product_url):
+        rows = self._rows("""
+            SELECT p.product_url, p.title, l.price, l.sizes, l.ts, l.prev_price, l.prev_ts
+            FROM products p JOIN latest l ON l.product_id = p.id
+            WHERE p.product_url = ?
+        """, (product_url,))
+        return rows[0] if rows else None
+
+    def price_drops(self, since_ts=None):
+        # Productos del último crawl (o desde since_ts) cuyo precio ha bajado respecto al anterior
+        if since_ts is None:
+            last = self._db.execute("SELECT MAX(ts) FROM crawls").fetchone()[0]
+            if last is None:
+                return []
+            since_ts = last
+        return self._rows("""
+            SELECT p.product_url, p.title, l.prev_price, l.price, l.prev_price - l.price AS drop_amount, l.ts
+            FROM latest l JOIN products p ON p.id = l.product_id
+            WHERE l.ts >= ? AND l.price < l.prev_price
+            ORDER BY drop_amount DESC
+        """, (since_ts,))
+
+    def under(self, max_price, size=None):
+        # "Productos por debajo de X€ en la talla Y", usando el índice (talla, precio)
+        if size is None:
+            return self._rows("""
+                SELECT p.product_url, p.title, l.price, l.sizes
+                FROM latest l JOIN products p ON p.id = l.product_id
+                WHERE l.price <= ? ORDER BY l.price
+            """, (max_price,))
+        return self._rows("""
+            SELECT p.product_url, p.title, s.price, l.sizes
+            FROM latest_sizes s
+            JOIN products p ON p.id = s.product_id
+            JOIN latest l ON l.product_id = s.product_id
+            WHERE s.size = ? AND s.price <= ? ORDER BY s.price
+        """, (str(size), max_price))
+
+    def history(self, product_url):
+        return self._rows("""
+            SELECT o.ts, o.price, o.sizes
+            FROM observations o JOIN products p ON p.id = o.product_id
+            WHERE p.product_url = ? ORDER BY o.ts
+        """, (product_url,))
+
+    def close(self):
+        self._db.close()
+
+
+class HistoryWriter:
+    # Ingesta de un crawl por partes: add() deja las filas en tablas temporales por bloques
+    # de chunk_size (la memoria no crece con el crawl) y commit() las pasa al histórico
+    # en una sola transacción. Hasta entonces el fichero del histórico no se bloquea.
+    def __init__(self, history, ts=None):
+        self.history = history
+        self.ts = time.time() if ts is None else ts
+        self._chunk = []
+        self._sizes_chunk = []
+        db = history._db
+        db.execute("CREATE TEMP TABLE IF NOT EXISTS batch (url TEXT PRIMARY KEY, title TEXT, store TEXT, price REAL, sizes TEXT)")
+        db.execute("CREATE TEMP TABLE IF NOT EXISTS batch_sizes (url TEXT, size TEXT)")
+        db.execute("DELETE FROM batch")
+        db.execute("DELETE FROM batch_sizes")
+
+    def add(self, row):
+        url = row.get("product_url")
+        if not url:
+            return
+        sizes = row.get("available_sizes")
+        self._chunk.append((url, row.get("title"), row.get("store"), price_value(row), sizes))
+        self._sizes_chunk.extend((url, size) for size in split_sizes(sizes))
+        if len(self._chunk) >= self.history.chunk_size:
+            self._flush()
+
+    def extend(self, rows):
+        for row in rows:
+            self.add(row)
+
+    def _flush(self):
+        self.history._stage(self._chunk, self._sizes_chunk)
+        self._chunk, self._sizes_chunk = [], []
+
+    def commit(self):
+        # Devuelve los productos guardados
+        self._flush()
+        return self.history._merge(self.ts)
+
+    def discard(self):
+        self._chunk, self._sizes_chunk = [], []
+        self.history._db.rollback()
+        self.history._db.execute("DELETE FROM batch")
+        self.history._db.execute("DELETE FROM batch_sizes")
+        self.history._db.commit()
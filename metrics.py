@@ -0,0 +1,192 @@
+# Métricas de las búsquedas: tiempos de red por petición (DNS, connect, TLS, TTFB,
+# descarga), espera del limitador, bytes, aciertos de caché y, por página, tiempo de
+# parseo y tarjetas encontradas / convertidas / filtradas / descartadas por error.
+#
+#   metrics = SearchMetrics()
+#   scraper = ZapatillasScraper(NIKE_CONFIG, metrics=metrics)
+#   scraper.search("Air Max", max_pages=3)
+#   metrics.write(JsonMetricsSink("metricas.json"), PrometheusTextfileSink("nike.prom"))
+#
+# Con profile_run() se guarda además un perfil cProfile y/o un resumen de tracemalloc
+# de todo lo que se ejecute dentro del bloque.
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+TIMING_KEYS = ("dns", "connect", "tls", "ttfb", "download", "sleep")
+PAGE_COUNTERS = ("cards", "products", "skipped", "incomplete", "filtered", "dropped")
+
+
+class SearchMetrics:
+    def __init__(self, keep_pages=10000):
+        self.keep_pages = keep_pages
+        self.pages = []
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self.stores = {}
+
+    def _totals(self, store):
+        totals = self.stores.get(store)
+        if totals is None:
+            totals = self.stores[store] = {
+                "requests": 0, "bytes": 0, "retries": 0, "errors": 0,
+                "cache_hits": 0, "cache_misses": 0, "cache_revalidated": 0,
+                "pages": 0, "parse": 0.0,
+                **dict.fromkeys(TIMING_KEYS, 0.0),
+                **dict.fromkeys(PAGE_COUNTERS, 0)
+            }
+        return totals
+
+    def record_request(self, store, url, timings):
+        # Todas las peticiones (páginas, miniaturas...) suman a los totales de red
+        with self._lock:
+            totals = self._totals(store)
+            totals["requests"] += 1
+            totals["bytes"] += timings.get("bytes", 0)
+            totals["retries"] += timings.get("retries", 0)
+            if timings.get("status", 200) >= 400:
+                totals["errors"] += 1
+            cache = timings.get("cache")
+            if cache == "hit":
+                totals["cache_hits"] += 1
+            elif cache == "revalidated":
+                totals["cache_revalidated"] += 1
+            elif cache is not None:
+                totals["cache_misses"] += 1
+            for key in TIMING_KEYS:
+                totals[key] += timings.get(key, 0.0)
+
+    def record_page(self, record):
+        with self._lock:
+            totals = self._totals(record.get("store", ""))
+            totals["pages"] += 1
+            totals["parse"] += record.get("parse", 0.0)
+            for key in PAGE_COUNTERS:
+                totals[key] += record.get(key, 0)
+            self.pages.append(dict(record))
+            if len(self.pages) > self.keep_pages:
+                del self.pages[:len(self.pages) - self.keep_pages]
+
+    def totals(self):
+        # Suma de todas las tiendas
+        with self._lock:
+            combined = {}
+            for totals in self.stores.values():
+                for key, value in totals.items():
+                    combined[key] = combined.get(key, 0) + value
+            return combined
+
+    def summary(self):
+        with self._lock:
+            return {
+                "started": self.started,
+                "duration": time.time() - self.started,
+                "stores": {store: dict(totals) for store, totals in self.stores.items()},
+                "pages": [dict(page) for page in self.pages]
+            }
+
+    def describe(self):
+        # Una línea legible: en qué se fue el tiempo
+        totals = self.totals()
+        if not totals:
+            return "sin peticiones"
+        network = sum(totals[key] for key in ("dns", "connect", "tls", "ttfb", "download"))
+        return (
+            f"{totals['requests']} peticiones · {totals['bytes'] / 1024:.0f} KiB · "
+            f"red {network:.2f}s (TTFB {totals['ttfb']:.2f}s) · espera {totals['sleep']:.2f}s · "
+            f"parseo {totals['parse']:.2f}s · caché {totals['cache_hits']} aciertos · "
+            f"{totals['cards']} tarjetas, {totals['products']} productos, {totals['dropped']} con error"
+        )
+
+    def write(self, *sinks):
+        summary = self.summary()
+        for sink in sinks:
+            sink.write(summary)
+
+
+def _write_atomic(path, text):
+    # Quien lee el fichero (node_exporter, un dashboard) nunca ve uno a medias
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+class JsonMetricsSink:
+    def __init__(self, path):
+        self.path = path
+
+    def write(self, summary):
+        _write_atomic(self.path, json.dumps(summary, indent=2, ensure_ascii=False) + "\n")
+
+
+class PrometheusTextfileSink:
+    # Formato de texto de Prometheus, para el textfile collector de node_exporter
+    COUNTERS = {
+        "requests": "Peticiones HTTP",
+        "bytes": "Bytes recibidos",
+        "retries": "Reintentos por 429/5xx",
+        "errors": "Respuestas con estado >= 400",
+        "cache_hits": "Respuestas servidas desde la caché",
+        "cache_misses": "Respuestas que no estaban en la caché",
+        "cache_revalidated": "Respuestas revalidadas con 304",
+        "pages": "Páginas de resultados procesadas",
+        "cards": "Tarjetas de producto encontradas",
+        "products": "Productos devueltos",
+        "skipped": "Tarjetas saltadas por estar ya vistas",
+        "incomplete": "Tarjetas sin título o sin precio",
+        "filtered": "Tarjetas descartadas por los filtros",
+        "dropped": "Tarjetas descartadas por un error al extraerlas"
+    }
+    SECONDS = {key: f"Segundos de {key}" for key in TIMING_KEYS + ("parse",)}
+
+    def __init__(self, path, prefix="nike_scraper"):
+        self.path = path
+        self.prefix = prefix
+
+    def write(self, summary):
+        lines = []
+        stores = summary["stores"]
+        for key, help_text in self.COUNTERS.items():
+            name = f"{self.prefix}_{key}_total"
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            lines += [f'{name}{{store="{store}"}} {totals[key]}' for store, totals in stores.items()]
+        for key, help_text in self.SECONDS.items():
+            name = f"{self.prefix}_{key}_seconds_total"
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            lines += [f'{name}{{store="{store}"}} {totals[key]:.6f}' for store, totals in stores.items()]
+        name = f"{self.prefix}_last_run_timestamp_seconds"
+        lines += [f"# HELP {name} Fin de la última ejecución", f"# TYPE {name} gauge", f"{name} {time.time():.0f}"]
+        _write_atomic(self.path, "\n".join(lines) + "\n")
+
+
+@contextmanager
+def profile_run(prefix, cpu=True, memory=False, top=30):
+    # prefix.prof (cProfile, para snakeviz / pstats), prefix.txt (funciones más costosas)
+    # y prefix.mem.txt (líneas que más memoria reservan, según tracemalloc)
+    profiler = cProfile.Profile() if cpu else None
+    if memory:
+        tracemalloc.start(25)
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(f"{prefix}.prof")
+            with open(f"{prefix}.txt", "w", encoding="utf-8") as f:
+                pstats.Stats(profiler, stream=f).sort_stats("cumulative").print_stats(top)
+        if memory:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            with open(f"{prefix}.mem.txt", "w", encoding="utf-8") as f:
+                f.write(f"Pico: {peak / 1024:.0f} KiB\n")
+                for stat in snapshot.statistics("lineno")[:top]:
+                    f.write(f"{stat}\n")
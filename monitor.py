@@ -0,0 +1,197 @@
+# Modo de vigilancia incremental: cada tarjeta de producto se identifica por un hash
+# de su HTML en bruto, sin construir el árbol. Si una página tiene exactamente las
+# mismas tarjetas que en la ejecución anterior no se parsea nada, y si cambia solo se
+# parsean las tarjetas nuevas. El resultado es un flujo de eventos added/removed/changed.
+#
+#   monitor = ChangeMonitor(scraper, "vigilancia.json")
+#   for event in monitor.check("Air Max", max_pages=5):
+#       print(event["type"], event["product"]["title"])
+#
+# Si falla alguna página el crawl queda incompleto: se emiten los added/changed de las
+# páginas que sí llegaron, pero no los removed ni se guarda el estado, así que la
+# siguiente ejecución puede repetirlos (al menos una vez). Esos eventos llevan
+# "incomplete": True para que quien los consuma pueda deduplicarlos.
+import hashlib
+import json
+import os
+import re
+import time
+
+from Scraper import RESULT_FIELDS
+
+
+def fingerprint(data):
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class CardSplitter:
+    # Localiza las tarjetas en el HTML en bruto a partir de un selector de clase simple
+    # (".product-card") y devuelve el trozo exacto de cada una, etiquetas anidadas incluidas
+    def __init__(self, product_selector):
+        match = re.fullmatch(r"\.([\w-]+)", product_selector.strip())
+        self.enabled = match is not None
+        if self.enabled:
+            name = re.escape(match.group(1))
+            self.start = re.compile(
+                r'<([a-zA-Z][\w-]*)\b[^>]*\bclass\s*=\s*["\'](?:[^"\']*\s)?' + name + r'(?:\s[^"\']*)?["\']'
+            )
+        self._tags = {}
+
+    def _tag_pattern(self, tag):
+        pattern = self._tags.get(tag)
+        if pattern is None:
+            pattern = self._tags[tag] = re.compile(r"<(/?)" + re.escape(tag) + r"\b[^>]*?(/?)>", re.IGNORECASE)
+        return pattern
+
+    def split(self, html):
+        cards = []
+        pos = 0
+        while True:
+            match = self.start.search(html, pos)
+            if match is None:
+                return cards
+            tag_pattern = self._tag_pattern(match.group(1))
+            depth = 0
+            end = len(html)
+            for tag in tag_pattern.finditer(html, match.start()):
+                if tag.group(2):
+                    continue
+                depth += -1 if tag.group(1) else 1
+                if depth == 0:
+                    end = tag.end()
+                    break
+            cards.append(html[match.start():end])
+            pos = end
+
+
+class ChangeMonitor:
+    def __init__(self, scraper, state_path="nike_monitor.json"):
+        self.scraper = scraper
+        self.state_path = state_path
+        self.splitter = CardSplitter(scraper.config["product_selector"])
+        self.state = {}
+        if os.path.exists(state_path):
+            with open(state_path, encoding="utf-8") as f:
+                self.state = json.load(f)
+        self.stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats():
+        return {
+            "pages": 0,
+            "pages_unchanged": 0,
+            "cards": 0,
+            "cards_reused": 0,
+            "cards_parsed": 0,
+            "parse_seconds": 0.0
+        }
+
+    @staticmethod
+    def state_key(query, max_price=None, sizes=None):
+        return json.dumps([query, max_price, sorted(sizes or [])], ensure_ascii=False)
+
+    def _parse_cards(self, html, max_price, sizes):
+        started = time.process_time()
+        cards = self.scraper.parser.cards(html)
+        products = list(self.scraper.iter_products(cards, max_price, sizes))
+        self.stats["parse_seconds"] += time.process_time() - started
+        return cards, products
+
+    def scan_page(self, html, previous, max_price=None, sizes=None):
+        # Devuelve (estado de la página, productos). previous es el estado guardado de la misma página.
+        previous = previous or {}
+        self.stats["pages"] += 1
+
+        if not self.splitter.enabled:
+            # Selector complejo: solo se puede comparar la página entera
+            page_print = fingerprint(html)
+            if page_print == previous.get("fingerprint"):
+                self.stats["pages_unchanged"] += 1
+                return previous, previous.get("products", [])
+            _, products = self._parse_cards(html, max_price, sizes)
+            self.stats["cards_parsed"] += len(products)
+            return {"fingerprint": page_print, "products": products}, products
+
+        chunks = self.splitter.split(html)
+        prints = [fingerprint(chunk) for chunk in chunks]
+        page_print = fingerprint("".join(prints))
+        self.stats["cards"] += len(chunks)
+        if page_print == previous.get("fingerprint"):
+            self.stats["pages_unchanged"] += 1
+            self.stats["cards_reused"] += len(chunks)
+            return previous, [p for p in previous["cards"].values() if p is not None]
+
+        known = previous.get("cards", {})
+        cards = {}
+        products = []
+        for chunk, card_print in zip(chunks, prints):
+            if card_print in known:
+                product = known[card_print]
+                self.stats["cards_reused"] += 1
+            else:
+                _, parsed = self._parse_cards(chunk, max_price, sizes)
+                # None: tarjeta descartada por filtros o sin título/precio
+                product = parsed[0] if parsed else None
+                self.stats["cards_parsed"] += 1
+            cards[card_print] = product
+            if product is not None:
+                products.append(product)
+        return {"fingerprint": page_print, "cards": cards}, products
+
+    def check(self, query, max_pages=1, max_price=None, sizes=None, status_callback=None, concurrency=1):
+        key = self.state_key(query, max_price, sizes)
+        old_pages = self.state.get(key, {})
+        new_pages = {}
+        current = {}
+
+        pages = self.scraper.iter_pages(query, max_pages, max_price, sizes, status_callback, concurrency)
+        complete = True
+        try:
+            for page, response in pages:
+                if response.status_code != 200:
+                    if status_callback:
+                        status_callback(f"⚠️ Error {response.status_code} en página {page}")
+                    complete = False
+                    break
+                page_state, products = self.scan_page(response.text, old_pages.get(str(page)), max_price, sizes)
+                if not products and not page_state.get("cards") and not page_state.get("products"):
+                    break
+                new_pages[str(page)] = page_state
+                for product in products:
+                    current.setdefault(product["product_url"] or product["title"], product)
+        finally:
+            pages.close()
+
+        previous = {}
+        for page_state in old_pages.values():
+            products = page_state["cards"].values() if "cards" in page_state else page_state.get("products", [])
+            for product in products:
+                if product is not None:
+                    previous.setdefault(product["product_url"] or product["title"], product)
+
+        incomplete = not complete
+        for key_url, product in current.items():
+            old = previous.get(key_url)
+            if old is None:
+                yield {"type": "added", "product": product, "incomplete": incomplete}
+            # Solo se comparan los campos que ya estaban guardados: un campo nuevo no es un cambio
+            elif any(field in old and old[field] != product.get(field) for field in RESULT_FIELDS):
+                yield {"type": "changed", "product": product, "previous": old, "incomplete": incomplete}
+        if incomplete:
+            # Sin todas las páginas no se puede saber qué ha desaparecido, y el estado
+            # se queda como estaba para comparar entero en la siguiente pasada
+            return
+        for key_url, product in previous.items():
+            if key_url not in current:
+                yield {"type": "removed", "product": product, "incomplete": False}
+
+        self.state[key] = new_pages
+        self.save()
+
+    def save(self):
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False)
+        os.replace(tmp, self.state_path)
@@ -0,0 +1,141 @@
+# Modo en paralelo para crawls grandes: las descargas siguen en hilos (iter_pages con
+# concurrency) y el parseo, que con el GIL se queda en un solo núcleo, pasa a un pool de
+# procesos. Cada proceso crea al arrancar su propio scraper sin red, con los selectores
+# ya compilados, y recibe las páginas en bruto por lotes para pagar poco en pickling.
+#
+#   with ParallelSearch(ZapatillasScraper(NIKE_CONFIG), workers=8) as search:
+#       for product in search.iter_search("Air Max", max_pages=50, max_price=150):
+#           ...
+#
+# Los productos salen en el mismo orden que con iter_search, y la búsqueda termina en la
+# primera página sin tarjetas o con error, igual que allí.
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from Scraper import ResultStore, ZapatillasScraper
+
+_worker_scraper = None
+
+
+def _init_worker(config, parser):
+    global _worker_scraper
+    _worker_scraper = ZapatillasScraper(config, http=object(), rate=None, parser=parser)
+
+
+def _ping():
+    return os.getpid()
+
+
+def _parse_batch(batch, max_price, sizes, filters):
+    # batch: [(página, bytes, encoding)] -> [(página, nº de tarjetas, productos, contadores)]
+    scraper = _worker_scraper
+    parsed = []
+    for page, content, encoding in batch:
+        started = time.perf_counter()
+        cards = scraper.parser.cards(content.decode(encoding or "utf-8", errors="replace"))
+        counters = {"parse": time.perf_counter() - started}
+        products = list(scraper.iter_products(cards, max_price, sizes, counters=counters, filters=filters))
+        counters["parse"] += counters.pop("extract_s", 0.0)
+        parsed.append((page, len(cards), products, counters))
+    return parsed
+
+
+class ParallelSearch:
+    def __init__(self, scraper, workers=None, fetchers=4, batch_size=4, max_batches=None):
+        self.scraper = scraper
+        self.workers = workers or os.cpu_count() or 1
+        self.fetchers = fetchers
+        self.batch_size = batch_size
+        # Lotes enviados y aún sin recoger: acota la memoria y lo que se descarga de más
+        self.max_batches = max_batches or self.workers * 2
+        self.results = ResultStore(scraper.parse_price)
+        # spawn: el proceso padre tiene hilos (descargas, pool de conexiones) y fork con
+        # hilos puede dejar cerrojos bloqueados en el hijo
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(scraper.config, scraper.parser.name)
+        )
+        self.warm()
+
+    def warm(self):
+        # Arranca todos los procesos ahora y no con la primera página
+        futures = [self.executor.submit(_ping) for _ in range(self.workers * 2)]
+        return {future.result() for future in futures}
+
+    def _submit(self, batch, max_price, sizes, filters):
+        return self.executor.submit(_parse_batch, batch, max_price, sizes, filters)
+
+    def iter_search(self, query, max_pages=1, max_price=None, sizes=None, status_callback=None, concurrency=None,
+                    cancel_event=None, filters=None):
+        scraper = self.scraper
+        pages = scraper.iter_pages(query, max_pages, max_price, sizes, status_callback, concurrency or self.fetchers)
+        pending = deque()
+        responses = {}
+        batch = []
+        finished = False
+
+        def collect(future):
+            # Devuelve los productos del lote en orden; marca el final si hay una página vacía
+            nonlocal finished
+            for page, card_count, products, counters in future.result():
+                if finished:
+                    return
+                response = responses.pop(page)
+                if scraper.metrics is not None:
+                    record = scraper._page_record(query, page, response)
+                    record.update(counters, cards=card_count)
+                    scraper.metrics.record_page(record)
+                if not card_count:
+                    finished = True
+                    return
+                yield from products
+
+        try:
+            for page, response in pages:
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                if response.status_code != 200:
+                    if status_callback:
+                        status_callback(f"⚠️ Error {response.status_code} en página {page}")
+                    break
+                responses[page] = response
+                batch.append((page, response.content, response.encoding))
+                if len(batch) >= self.batch_size:
+                    pending.append(self._submit(batch, max_price, sizes, filters))
+                    batch = []
+                while len(pending) >= self.max_batches and not finished:
+                    yield from collect(pending.popleft())
+                if finished:
+                    return
+            if batch:
+                pending.append(self._submit(batch, max_price, sizes, filters))
+            while pending and not finished:
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                yield from collect(pending.popleft())
+        finally:
+            pages.close()
+            for future in pending:
+                future.cancel()
+
+    def search(self, query, max_pages=1, max_price=None, sizes=None, status_callback=None, concurrency=None,
+               cancel_event=None, filters=None):
+        self.results = ResultStore(self.scraper.parse_price)
+        self.results.extend(self.iter_search(query, max_pages, max_price, sizes, status_callback, concurrency,
+                                             cancel_event, filters))
+        return self.results
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.scraper.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
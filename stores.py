@@ -0,0 +1,270 @@
+# Registro de tiendas: cada tienda es un fichero JSON en stores/ con las mismas claves
+# que NIKE_CONFIG. Un fichero puede heredar de otra tienda con "extends" y solo cambiar
+# lo que difiere (URLs, idioma, moneda, sistema de tallas).
+#
+#   registry = StoreRegistry.default()
+#   search = MultiStoreSearch(registry.select(["nike_es", "nike_fr", "nike_gb"]))
+#   for product in search.iter_search("Air Max", max_price=150, sizes=["42"]):
+#       print(product["store"], product["price"], product["local_price"])
+#
+# Los resultados de todas las tiendas llegan mezclados en un único flujo, con el precio
+# en euros y las tallas en numeración europea; el precio y las tallas originales se
+# conservan en "local_price" y "local_sizes".
+import glob
+import json
+import os
+import queue
+import re
+import threading
+
+from Scraper import NIKE_CONFIG, ZapatillasScraper
+
+STORES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stores")
+
+REQUIRED_KEYS = ("name", "base_url", "search_url", "query_param", "page_param", "product_selector")
+
+# Cambios de referencia para comparar precios; cada tienda puede fijar el suyo con "rate_to_eur"
+RATES_TO_EUR = {"EUR": 1.0, "GBP": 1.17, "USD": 0.92, "CHF": 1.05}
+
+# Tabla de tallas de hombre de Nike: US -> EU. En hombre, UK = US - 1
+US_TO_EU = {
+    "6": "38.5", "6.5": "39", "7": "40", "7.5": "40.5", "8": "41", "8.5": "42", "9": "42.5",
+    "9.5": "43", "10": "44", "10.5": "44.5", "11": "45", "11.5": "45.5", "12": "46",
+    "12.5": "47", "13": "47.5", "14": "48.5", "15": "49.5"
+}
+SIZE_TABLES = {
+    "US": US_TO_EU,
+    "UK": {f"{float(us) - 1:g}": eu for us, eu in US_TO_EU.items()}
+}
+SIZE_LABEL = re.compile(r"^(?:(EU|UK|US|M|W)\s*)?(\d+(?:[.,]\d)?)$", re.IGNORECASE)
+EU_IN_LABEL = re.compile(r"\bEU\s*(\d+(?:[.,]\d)?)", re.IGNORECASE)
+
+
+def size_to_eu(size, system="EU"):
+    # "UK 8", "8" (en una tienda UK) o "UK 8 (EU 42.5)" -> "42.5"; lo desconocido se deja igual
+    size = str(size).strip()
+    explicit = EU_IN_LABEL.search(size)
+    if explicit:
+        return explicit.group(1).replace(",", ".")
+    match = SIZE_LABEL.match(size)
+    if not match:
+        return size
+    prefix, number = match.groups()
+    number = number.replace(",", ".")
+    prefix = (prefix or system or "EU").upper()
+    if prefix in ("M", "W"):
+        prefix = system.upper()
+    if prefix == "EU":
+        return number
+    return SIZE_TABLES.get(prefix, {}).get(f"{float(number):g}", size)
+
+
+def size_from_eu(size, system="EU"):
+    # Inverso de size_to_eu, para pedir a cada tienda las tallas en su numeración
+    size = str(size).strip().replace(",", ".")
+    system = (system or "EU").upper()
+    if system == "EU":
+        return size
+    for local, eu in SIZE_TABLES.get(system, {}).items():
+        if eu == size:
+            return local
+    return size
+
+
+def format_eur(value):
+    return f"{value:.2f}".replace(".", ",") + "\xa0€"
+
+
+class StoreRegistry:
+    def __init__(self):
+        self._raw = {}
+        self.register(NIKE_CONFIG)
+
+    @classmethod
+    def default(cls, directory=STORES_DIR):
+        registry = cls()
+        if os.path.isdir(directory):
+            registry.load_dir(directory)
+        return registry
+
+    def register(self, config):
+        if not isinstance(config, dict) or not config.get("name"):
+            raise ValueError("Una tienda necesita al menos 'name'")
+        self._raw[config["name"]] = dict(config)
+        return config["name"]
+
+    def load_file(self, path):
+        # Un fichero puede traer una tienda o una lista de tiendas
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        configs = data if isinstance(data, list) else [data]
+        names = [self.register(config) for config in configs]
+        for name in names:
+            self.get(name)  # valida ahora, no en mitad de una búsqueda
+        return names
+
+    def load_dir(self, directory):
+        names = []
+        for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+            try:
+                names.extend(self.load_file(path))
+            except (OSError, ValueError) as e:
+                raise ValueError(f"{path}: {e}") from e
+        return names
+
+    def get(self, name, _chain=()):
+        raw = self._raw.get(name)
+        if raw is None:
+            raise ValueError(f"Tienda desconocida: {name}")
+        if name in _chain:
+            raise ValueError(f"Herencia circular entre tiendas: {' -> '.join(_chain + (name,))}")
+        config = {}
+        if raw.get("extends"):
+            config.update(self.get(raw["extends"], _chain + (name,)))
+        config.update(raw)
+        config.pop("extends", None)
+        if not _chain:
+            missing = [key for key in REQUIRED_KEYS if not config.get(key)]
+            if missing:
+                raise ValueError(f"Faltan claves en la tienda {name}: {', '.join(missing)}")
+        return config
+
+    def names(self):
+        return sorted(self._raw)
+
+    def select(self, names=None):
+        # None o "all" -> todas las tiendas de los ficheros (o la de serie si no hay ficheros)
+        if not names or names == "all" or list(names) == ["all"]:
+            names = [name for name in self.names() if name != NIKE_CONFIG["name"]] or [NIKE_CONFIG["name"]]
+        elif isinstance(names, str):
+            names = [n.strip() for n in names.split(",") if n.strip()]
+        return [self.get(name) for name in names]
+
+    def __contains__(self, name):
+        return name in self._raw
+
+
+class MultiStoreSearch:
+    # Un ZapatillasScraper por tienda: cada uno con su Session (pool de conexiones) y su
+    # limitador de velocidad, así que una tienda lenta o que devuelve 429 no frena al resto
+    QUEUE_SIZE = 256
+
+    def __init__(self, configs, rates=None, **scraper_kwargs):
+        self.rates = dict(RATES_TO_EUR, **(rates or {}))
+        self.scrapers = {}
+        for config in configs:
+            kwargs = dict(scraper_kwargs)
+            for key in ("rate", "max_rate", "pool_size"):
+                if config.get(key) is not None:
+                    kwargs[key] = config[key]
+            self.scrapers[config["name"]] = ZapatillasScraper(config, **kwargs)
+
+    def rate_to_eur(self, config):
+        if config.get("rate_to_eur"):
+            return float(config["rate_to_eur"])
+        currency = config.get("currency", "EUR").upper()
+        if currency not in self.rates:
+            raise ValueError(f"Sin cambio a EUR para {currency} (tienda {config['name']})")
+        return self.rates[currency]
+
+    def local_filters(self, scraper, max_price, sizes, filters=None):
+        # Los filtros llegan en € y tallas EU; cada tienda los recibe en su moneda y numeración
+        config = scraper.config
+        rate = self.rate_to_eur(config)
+        system = config.get("size_system", "EU")
+        if max_price is not None:
+            max_price = round(max_price / rate, 2)
+        if sizes:
+            sizes = [size_from_eu(size, system) for size in sizes]
+        if filters is not None:
+            filters = filters.localized(rate, lambda size: size_from_eu(size, system))
+            if config.get("size_param"):
+                # La tienda ya filtra las tallas en el servidor (igual que make_filter)
+                filters.sizes = frozenset()
+        return max_price, sizes, filters
+
+    def normalize(self, scraper, product):
+        config = scraper.config
+        currency = config.get("currency", "EUR").upper()
+        system = config.get("size_system", "EU")
+        product["currency"] = currency
+        product["local_price"] = product["price"]
+        product["local_sizes"] = product["available_sizes"]
+        if currency != "EUR":
+            value = scraper.parse_price(product["price"])
+            if value is not None:
+                product["price"] = format_eur(value * self.rate_to_eur(config))
+        if system.upper() != "EU" and product["available_sizes"] != "No especificado":
+            product["available_sizes"] = ", ".join(
+                size_to_eu(size, system) for size in product["available_sizes"].split(", ")
+            )
+        return product
+
+    def _worker(self, scraper, query, max_pages, max_price, sizes, filters, status_callback, concurrency, stop, out,
+                checkpoint=None, resume=False):
+        name = scraper.config["name"]
+
+        def status(message):
+            if status_callback:
+                status_callback(f"[{name}] {message}")
+
+        def put(item):
+            # Cola acotada: si el consumidor va lento, las tiendas esperan en lugar de acumular
+            while not stop.is_set():
+                try:
+                    out.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        try:
+            local_price, local_sizes, local_filters = self.local_filters(scraper, max_price, sizes, filters)
+            for product in scraper.iter_search(query, max_pages, local_price, local_sizes, status, concurrency,
+                                               stop, filters=local_filters, checkpoint=checkpoint, resume=resume):
+                if not put(("product", self.normalize(scraper, product))):
+                    break
+        except Exception as e:
+            put(("error", f"{name}: {e}"))
+        put(("done", name))
+
+    def iter_search(self, query, max_pages=1, max_price=None, sizes=None, status_callback=None, concurrency=1,
+                    cancel_event=None, filters=None, checkpoint=None, resume=False):
+        # Todas las tiendas a la vez; los productos salen en el orden en que llegan.
+        # Con checkpoint, cada tienda guarda y retoma su progreso por separado
+        stop = threading.Event()
+        out = queue.Queue(maxsize=self.QUEUE_SIZE)
+        threads = [
+            threading.Thread(
+                target=self._worker,
+                args=(scraper, query, max_pages, max_price, sizes, filters, status_callback, concurrency, stop, out,
+                      checkpoint, resume),
+                daemon=True
+            )
+            for scraper in self.scrapers.values()
+        ]
+        for thread in threads:
+            thread.start()
+
+        pending = len(threads)
+        try:
+            while pending:
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                try:
+                    kind, payload = out.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if kind == "product":
+                    yield payload
+                elif kind == "error":
+                    if status_callback:
+                        status_callback(f"❌ {payload}")
+                else:
+                    pending -= 1
+        finally:
+            stop.set()
+
+    def close(self):
+        for scraper in self.scrapers.values():
+            scraper.close()
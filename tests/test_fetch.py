@@ -0,0 +1,80 @@
+# Capa de descarga con un transporte falso (el parámetro http de ZapatillasScraper):
+# reintentos ante 429, caché de respuestas y fin de la paginación, sin tocar la red.
+import pytest
+
+from Scraper import NIKE_CONFIG, CachedResponse, ResponseCache, ZapatillasScraper
+
+
+def card(n):
+    return (f'<div class="product-card"><a class="product-card__link-overlay" href="/t/producto-{n}"></a>'
+            f'<div class="product-card__title">Air Max {n}</div>'
+            f'<div class="product-price">{100 + n},99&nbsp;€</div></div>')
+
+
+def listing(page, per_page=3, last_page=2):
+    if page > last_page:
+        return "<html><body>Sin resultados</body></html>"
+    return "<html><body>" + "".join(card(page * 10 + i) for i in range(per_page)) + "</body></html>"
+
+
+class StubHTTP:
+    # Responde con listing(page); responses permite fijar antes las primeras respuestas
+    def __init__(self, last_page=2, responses=()):
+        self.last_page = last_page
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, params=None, headers=None, **kwargs):
+        self.calls.append(dict(params or {}))
+        if self.responses:
+            return self.responses.pop(0)
+        page = (params or {}).get(NIKE_CONFIG["page_param"], 1)
+        return CachedResponse(200, listing(page, last_page=self.last_page).encode("utf-8"), url=url)
+
+
+class NoNetwork:
+    def get(self, url, **kwargs):
+        raise AssertionError(f"petición inesperada a {url}")
+
+
+@pytest.fixture
+def config():
+    return dict(NIKE_CONFIG, search_url="http://tienda.test/w", base_url="http://tienda.test")
+
+
+def test_retry_on_429_with_retry_after(config):
+    http = StubHTTP(responses=[CachedResponse(429, b"", headers={"Retry-After": "0"})])
+    scraper = ZapatillasScraper(config, http=http, rate=100.0, max_rate=100.0, retries=2)
+    response = scraper.get(config["search_url"], params={"page": 1})
+    assert response.status_code == 200
+    assert len(http.calls) == 2
+    assert response.timings["retries"] == 1
+    # El 429 baja el ritmo del limitador de ese host
+    assert scraper.limiter_for(config["search_url"]).rate < 100.0
+
+
+def test_retries_give_up_after_limit(config):
+    http = StubHTTP(responses=[CachedResponse(429, b"", headers={"Retry-After": "0"}) for _ in range(5)])
+    scraper = ZapatillasScraper(config, http=http, rate=100.0, max_rate=100.0, retries=1)
+    assert scraper.get(config["search_url"], params={"page": 1}).status_code == 429
+    assert len(http.calls) == 2
+
+
+def test_cache_replay(config, tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), ttl=3600)
+    http = StubHTTP()
+    first = ZapatillasScraper(config, http=http, rate=None, cache=cache).search("air max", max_pages=5)
+    requests_made = len(http.calls)
+
+    # Sin red: todo sale de la caché
+    offline = ZapatillasScraper(config, http=NoNetwork(), rate=None, cache=cache, offline=True)
+    replayed = offline.search("air max", max_pages=5)
+    assert [p["product_url"] for p in replayed] == [p["product_url"] for p in first]
+    assert cache.hits == requests_made
+
+
+def test_pagination_stops_on_empty_page(config):
+    http = StubHTTP(last_page=2)
+    products = ZapatillasScraper(config, http=http, rate=None).search("air max", max_pages=10)
+    assert len(products) == 6
+    assert [call[config["page_param"]] for call in http.calls] == [1, 2, 3]